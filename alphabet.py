@@ -0,0 +1,113 @@
+"""
+Alphabet Module
+
+This module describes the letters of each supported language and
+precomputes how typed characters and answer characters map onto them,
+so normalizing a dictionary entry happens once when it is loaded and
+checking a guess is a single table lookup.
+
+Entries are stored in NFC, in upper case, and keep their accents for
+display. Matching goes through the alphabet's fold table: in French,
+guessing E reveals E, É, È, Ê and Ë, while Spanish keeps Ñ a letter of
+its own.
+"""
+
+import unicodedata
+
+_ASCII_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+class Alphabet:
+    """Letters of one language and the characters that match them"""
+
+    def __init__(self, name, letters, folds=None):
+        """
+        Args:
+            name: language name
+            letters: the guessable letters, in upper case
+            folds: optional mapping of other characters (e.g. accented
+                letters) to the letter that guesses them
+        """
+        self.name = name
+        self.letters = tuple(letters)
+        # letter -> mask bit; the letter order fixes the bits
+        self.bits = {letter: 1 << i for i, letter in enumerate(self.letters)}
+        # typed or answer character -> (letter, bit)
+        self.table = {}
+        for source, letter in [(letter, letter) for letter in self.letters] \
+                + list((folds or {}).items()):
+            match = (letter, self.bits[letter])
+            for form in (source, source.lower(), source.upper(),
+                         source.casefold()):
+                if len(form) == 1:
+                    self.table.setdefault(form, match)
+
+    def __repr__(self):
+        return f"Alphabet({self.name!r})"
+
+    def normalize_guess(self, text):
+        """
+        The letter a typed guess stands for, or None if it is not one
+        A guess outside the alphabet that is still a single letter
+        (e.g. a Greek letter in an English game) is returned upper-cased.
+        """
+        match = self.table.get(text)
+        if match is not None:
+            return match[0]
+        text = unicodedata.normalize("NFC", text)
+        match = self.table.get(text)
+        if match is not None:
+            return match[0]
+        if len(text) == 1 and text.isalpha():
+            upper = text.upper()
+            return upper if len(upper) == 1 else text
+        return None
+
+
+def normalize_entry(entry):
+    """NFC, upper-case form of a dictionary entry"""
+    if entry.isascii():
+        return entry.upper()
+    entry = unicodedata.normalize("NFC", entry)
+    upper = entry.upper()
+    if len(upper) == len(entry):
+        return upper
+    # Keep characters such as ß whose upper case is longer
+    return "".join(char if len(char.upper()) != 1 else char.upper()
+                   for char in entry)
+
+
+def normalize_entries(entries):
+    """Normalize many entries; ASCII entries take a fast path"""
+    return (entry.upper() if entry.isascii() else normalize_entry(entry)
+            for entry in entries)
+
+
+def _folds(groups):
+    """Fold mapping from 'LETTER: variants' groups"""
+    return {variant: letter for letter, variants in groups.items()
+            for variant in variants}
+
+
+ALPHABETS = {
+    "english": Alphabet("english", _ASCII_LETTERS),
+    "french": Alphabet("french", _ASCII_LETTERS, _folds({
+        "A": "ÀÂÆ", "C": "Ç", "E": "ÉÈÊË", "I": "ÎÏ", "O": "ÔŒ",
+        "U": "ÙÛÜ", "Y": "Ÿ"})),
+    "spanish": Alphabet("spanish", _ASCII_LETTERS[:14] + "Ñ"
+                        + _ASCII_LETTERS[14:], _folds({
+                            "A": "Á", "E": "É", "I": "Í", "O": "Ó",
+                            "U": "ÚÜ"})),
+    "german": Alphabet("german", _ASCII_LETTERS + "ÄÖÜß"),
+}
+
+DEFAULT_LANGUAGE = "english"
+
+
+def get_alphabet(language=None):
+    """Alphabet of a language (English by default)"""
+    try:
+        return ALPHABETS[language or DEFAULT_LANGUAGE]
+    except KeyError:
+        raise ValueError(f"Unknown language: {language}. "
+                         f"Use one of: {', '.join(ALPHABETS)}") from None
@@ -0,0 +1,388 @@
+"""
+Compiled Dictionary Module
+
+This module compiles word lists into a compact binary file and reads
+them back lazily through mmap, so opening a dictionary costs the same
+no matter how many entries it holds.
+
+File layout (little-endian):
+    header          magic, level count, size record count, entry count
+    level records   name (and "\0" language, unless English), first size
+                    record, size record count, first entry, entry count
+    size records    length, word count, first entry, entry count
+    offsets         entry count + 1 uint64 offsets into the blob
+    blob            concatenated UTF-8 entries
+    difficulty      (optional, 8-byte aligned) marker and entry count,
+                    float32 score per entry, then per level the uint32
+                    entry positions from easiest to hardest
+
+Entries of a level are sorted by (length, word count, text), so every
+size bucket is one contiguous run of entries and membership is a
+binary search inside that run. Readers that do not know the difficulty
+section ignore it, since entries are located through the offsets.
+
+The same image can be published into a shared memory block, which
+worker processes attach to by name: they read the one copy of the
+entries and indexes instead of building or mapping their own.
+"""
+
+import bisect
+import io
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from alphabet import normalize_entries
+from difficulty import DifficultyIndex
+
+MAGIC = b"HANGDIC1"
+_HEADER = struct.Struct("<8sIII4x")
+_LEVEL = struct.Struct("<32sIIQQ")
+_SIZE = struct.Struct("<IIQQ")
+_OFFSET = struct.Struct("<Q")
+_DIFFICULTY = struct.Struct("<8sQ")
+DIFFICULTY_MAGIC = b"HANGDIFF"
+
+
+def entry_size(entry):
+    """(length, word count) bucket key of an entry"""
+    return len(entry), entry.count(" ") + 1
+
+
+def compile_dictionary(path, levels, languages=None):
+    """
+    Write levels to a compiled dictionary file
+    Args:
+        path: output file path
+        levels: mapping of level name -> iterable of entries
+        languages: optional mapping of level name -> language
+    Returns:
+        Total number of entries written
+    """
+    with open(path, "wb") as output:
+        return _write_dictionary(output, levels, languages)
+
+
+def publish_dictionary(levels, languages=None, name=None):
+    """
+    Compile levels into a new shared memory block
+    Args:
+        levels, languages: as for compile_dictionary
+        name: block name (a unique one is chosen by default)
+    Returns:
+        The SharedMemory block; its creator closes and unlinks it once
+        no process needs the dictionary any more
+    """
+    image = io.BytesIO()
+    _write_dictionary(image, levels, languages)
+    return publish_image(image.getbuffer(), name)
+
+
+def publish_image(image, name=None):
+    """Copy a compiled dictionary image into a new shared memory block"""
+    block = SharedMemory(name=name, create=True, size=len(image))
+    block.buf[:len(image)] = image
+    return block
+
+
+def _encode_level_name(name, languages):
+    """Level name as stored, with "\0" and its language unless English"""
+    encoded_name = name.encode("utf-8")
+    if languages.get(name, "english") != "english":
+        encoded_name += b"\0" + languages[name].encode("utf-8")
+    if len(encoded_name) > 32:
+        raise ValueError(f"Level name too long: {name}")
+    return encoded_name
+
+
+def _sorted_buckets(level_entries):
+    """(size, sorted entries) of every size bucket of a level, in order"""
+    buckets = {}
+    for entry in set(normalize_entries(level_entries)):
+        buckets.setdefault(entry_size(entry), []).append(entry)
+    return [(size, sorted(buckets[size])) for size in sorted(buckets)]
+
+
+def _layout(levels, languages):
+    """
+    Lay levels out in file order
+    Returns:
+        (level records, size records, entries, DifficultyIndex per level)
+    """
+    level_records = []
+    size_records = []
+    entries = []
+    difficulty = []
+    for name, level_entries in levels.items():
+        first_size = len(size_records)
+        first_entry = len(entries)
+        for (length, word_count), bucket in _sorted_buckets(level_entries):
+            size_records.append((length, word_count, len(entries),
+                                 len(bucket)))
+            entries.extend(bucket)
+        level_records.append((_encode_level_name(name, languages),
+                              first_size, len(size_records) - first_size,
+                              first_entry, len(entries) - first_entry))
+        difficulty.append(DifficultyIndex.build(entries[first_entry:]))
+    return level_records, size_records, entries, difficulty
+
+
+def _write_dictionary(output, levels, languages=None):
+    """Write levels in the compiled format to a binary file object"""
+    level_records, size_records, entries, difficulty = _layout(
+        levels, languages or {})
+    output.write(_HEADER.pack(MAGIC, len(level_records),
+                              len(size_records), len(entries)))
+    for record in level_records:
+        output.write(_LEVEL.pack(*record))
+    for record in size_records:
+        output.write(_SIZE.pack(*record))
+
+    encoded = [entry.encode("utf-8") for entry in entries]
+    offsets = array("Q", accumulate(map(len, encoded), initial=0))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    output.write(offsets.tobytes())
+    output.write(b"".join(encoded))
+
+    output.write(b"\0" * (-output.tell() % 8))
+    output.write(_DIFFICULTY.pack(DIFFICULTY_MAGIC, len(entries)))
+    for index in difficulty:
+        output.write(index.scores.astype("<f4").tobytes())
+    for index in difficulty:
+        output.write(index.order.astype("<u4").tobytes())
+    return len(entries)
+
+
+def _check_length(buffer, level_count, size_count, entry_count):
+    """Raise ValueError if the buffer ends before the entries do"""
+    offsets_end = (_HEADER.size + level_count * _LEVEL.size
+                   + size_count * _SIZE.size
+                   + (entry_count + 1) * _OFFSET.size)
+    if len(buffer) < offsets_end or len(buffer) < offsets_end + \
+            _OFFSET.unpack_from(buffer, offsets_end - _OFFSET.size)[0]:
+        raise ValueError("Truncated compiled Hangman dictionary")
+
+
+class CompiledDictionary:
+    """Read-only view of a compiled dictionary held in a buffer"""
+
+    def __init__(self, buffer):
+        if len(buffer) < _HEADER.size or buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a compiled Hangman dictionary")
+        _, level_count, size_count, entry_count = \
+            _HEADER.unpack_from(buffer, 0)
+        _check_length(buffer, level_count, size_count, entry_count)
+        self._buffer = memoryview(buffer)
+        self.entry_count = entry_count
+
+        position = _HEADER.size + level_count * _LEVEL.size
+        level_records = _LEVEL.iter_unpack(
+            self._buffer[_HEADER.size:position])
+        size_records = list(_SIZE.iter_unpack(
+            self._buffer[position:position + size_count * _SIZE.size]))
+        position += size_count * _SIZE.size
+
+        offsets_size = (entry_count + 1) * _OFFSET.size
+        offsets = self._buffer[position:position + offsets_size]
+        if sys.byteorder == "little":
+            self._offsets = offsets.cast("Q")
+        else:
+            self._offsets = array("Q", offsets)
+            self._offsets.byteswap()
+        self._blob = self._buffer[position + offsets_size:]
+
+        self.levels = {}
+        # level name -> language, for levels that are not English
+        self.languages = {}
+        self._add_levels(level_records, size_records, self._read_difficulty(
+            position + offsets_size + self._offsets[entry_count]))
+        # mmap or SharedMemory block closed along with the dictionary
+        self._source = None
+
+    def _add_levels(self, level_records, size_records, difficulty):
+        """Create the CompiledLevel of every level record"""
+        scores, order = difficulty
+        for name, first_size, sizes, first_entry, count in level_records:
+            name, *language = name.rstrip(b"\0").decode("utf-8").split("\0")
+            if language:
+                self.languages[name] = language[0]
+            level = self.levels[name] = CompiledLevel(
+                self, first_entry, count,
+                size_records[first_size:first_size + sizes])
+            if scores is not None:
+                level.difficulty = DifficultyIndex(
+                    scores[first_entry:first_entry + count],
+                    order[first_entry:first_entry + count])
+
+    def _read_difficulty(self, position):
+        """(scores, order) arrays of the difficulty section, if whole"""
+        position += -position % 8
+        if len(self._buffer) < position + _DIFFICULTY.size:
+            return None, None
+        marker, count = _DIFFICULTY.unpack_from(self._buffer, position)
+        if (marker != DIFFICULTY_MAGIC or count != self.entry_count
+                or len(self._buffer) < position + _DIFFICULTY.size
+                + 8 * count):
+            return None, None
+        position += _DIFFICULTY.size
+        scores = np.frombuffer(self._buffer, dtype="<f4", count=count,
+                               offset=position)
+        order = np.frombuffer(self._buffer, dtype="<u4", count=count,
+                              offset=position + 4 * count)
+        return scores, order
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map a compiled dictionary file"""
+        with open(path, "rb") as source:
+            mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            dictionary = cls(mapped)
+        except ValueError:
+            mapped.close()
+            raise
+        dictionary._source = mapped
+        return dictionary
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Attach to a dictionary published in shared memory by name
+        Before Python 3.13, attach only from processes started by the
+        publisher (e.g. multiprocessing workers), which share its
+        resource tracker; an unrelated process would unlink the block
+        when it exits.
+        """
+        if sys.version_info >= (3, 13):
+            # Attaching must not unlink the block at exit; track is new
+            # in 3.13, so pylint on older versions does not know it
+            # pylint: disable-next=unexpected-keyword-arg
+            block = SharedMemory(name=name, track=False)
+        else:
+            block = SharedMemory(name=name)
+        try:
+            dictionary = cls(block.buf)
+        except ValueError:
+            block.close()
+            raise
+        dictionary._source = block
+        return dictionary
+
+    @property
+    def image(self):
+        """The whole compiled image, e.g. for publish_image"""
+        return self._buffer
+
+    def entry(self, index):
+        """Decode one entry by its global index"""
+        start = self._offsets[index]
+        end = self._offsets[index + 1]
+        return str(self._blob[start:end], "utf-8")
+
+    def close(self):
+        """Release the buffer and the mapping or shared block, if any"""
+        for level in self.levels.values():
+            level.dictionary = None
+            level.difficulty = None
+            level.patterns = None
+        self._offsets = None
+        self._blob.release()
+        self._buffer.release()
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+
+class EntryRuns(Sequence):
+    """Lazy sequence over one or more runs of compiled entries"""
+
+    def __init__(self, dictionary, runs):
+        self.dictionary = dictionary
+        self._starts = [start for start, _ in runs]
+        self._ends = []
+        total = 0
+        for _, count in runs:
+            total += count
+            self._ends.append(total)
+        self._length = total
+
+    def __len__(self):
+        return self._length
+
+    def _global_index(self, index):
+        """Map a position in this sequence to a global entry index"""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("entry index out of range")
+        run = bisect.bisect_right(self._ends, index)
+        run_start = self._ends[run - 1] if run else 0
+        return self._starts[run] + index - run_start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        return self.dictionary.entry(self._global_index(index))
+
+    def __iter__(self):
+        entry = self.dictionary.entry
+        for start, end, previous in zip(self._starts, self._ends,
+                                        [0] + self._ends[:-1]):
+            for index in range(start, start + end - previous):
+                yield entry(index)
+
+
+class CompiledLevel:
+    """Level index backed by a compiled dictionary"""
+
+    def __init__(self, dictionary, first_entry, count, size_records):
+        self.dictionary = dictionary
+        self.first_entry = first_entry
+        self.entries = EntryRuns(dictionary, [(first_entry, count)])
+        # DifficultyIndex read from the file; scored on demand if absent
+        self.difficulty = None
+        # PatternIndex, built on the first match query
+        self.patterns = None
+        # (length, word count) -> (start, count) runs of the bucket, with
+        # None for either one matching any size
+        self.runs = {}
+        for length, word_count, start, size_count in size_records:
+            for size in ((length, word_count), (length, None),
+                         (None, word_count)):
+                self.runs.setdefault(size, []).append((start, size_count))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, entry):
+        return self.index_of(entry) is not None
+
+    def get_difficulty(self):
+        """DifficultyIndex read from the file, or scored on demand"""
+        if self.difficulty is None:
+            self.difficulty = DifficultyIndex.build(self.entries)
+        return self.difficulty
+
+    def index_of(self, entry):
+        """Position of an entry in entries, or None"""
+        runs = self.runs.get(entry_size(entry))
+        if runs is None:
+            return None
+        run = runs[0]
+        bucket = EntryRuns(self.dictionary, runs)
+        index = bisect.bisect_left(bucket, entry)
+        if index < len(bucket) and bucket[index] == entry:
+            return run[0] - self.first_entry + index
+        return None
+
+    def bucket(self, length=None, word_count=None):
+        """Entries with the given length and/or word count"""
+        if length is None and word_count is None:
+            return self.entries
+        return EntryRuns(self.dictionary,
+                         self.runs.get((length, word_count), []))
@@ -0,0 +1,343 @@
+"""
+Decision Tree Module
+
+This module precomputes, for one dictionary level, the letter to guess
+in every game state a guesser can reach by following its own advice,
+and stores the answers in a file that is memory-mapped at runtime, so
+a bot move or a hint is a single hash table lookup.
+
+The tree is built offline. Entries of different shapes (length and
+layout of spaces and punctuation) never share a game, so every shape
+is searched in its own worker process. At each state the search tries
+the letters with the highest expected information gain and keeps the
+one that minimizes the worst-case number of wrong guesses; the result
+of every candidate set is memoized, so subtrees reached through
+different guess orders are searched once.
+
+File layout (little-endian):
+    header      magic, language, slot count, state count, entry count,
+                worst-case wrong guesses, entries lost
+    keys        slot count uint64 state hashes (0 marks an empty slot)
+    letters     slot count uint32 code points of the letter to guess
+
+A state is keyed by its display word with revealed characters folded
+to their alphabet letter and the sorted wrong guesses, hashed to 64
+bits. States off the tree (e.g. after a human's own guesses) are not
+stored, and lookups for them return None.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import struct
+import numpy as np
+from alphabet import get_alphabet
+from hangman_game import STARTING_LIVES
+from solver import word_shape
+
+MAGIC = b"HANGTRE1"
+_HEADER = struct.Struct("<8s16sQQQII")
+
+
+def state_key(folded_display, wrong_letters):
+    """64-bit key of a state (never 0, which marks an empty slot)"""
+    text = folded_display + "\0" + "".join(sorted(wrong_letters))
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+class _ShapeSearch:
+    """Minimax search over the entries of one shape"""
+
+    def __init__(self, entries, alphabet, width):
+        table = alphabet.table
+        # Entries as alphabet letters; folded duplicates play the same
+        folded = {}
+        for entry in entries:
+            letters = tuple(table[char][0] if char in table
+                            else char if char.isalpha() else None
+                            for char in entry)
+            folded.setdefault(letters, entry)
+        self.entries = list(folded)
+        # Per entry: letter -> bit mask of its positions
+        self.masks = []
+        for letters in self.entries:
+            masks = {}
+            for position, letter in enumerate(letters):
+                if letter is not None:
+                    masks[letter] = masks.get(letter, 0) | 1 << position
+            self.masks.append(masks)
+        self.width = width
+        # frozenset of entry ids -> (worst-case wrong guesses, letter)
+        self._memo = {}
+
+    def _ranked_letters(self, candidates):
+        """Letters that split the candidates, best information gain first"""
+        total = len(candidates)
+        counts = Counter()
+        for candidate in candidates:
+            counts.update(self.masks[candidate].items())
+        outcomes = defaultdict(list)
+        for (letter, _), count in counts.items():
+            outcomes[letter].append(count)
+        ranks = []
+        for letter, sizes in outcomes.items():
+            present = sum(sizes)
+            if present < total:
+                sizes.append(total - present)
+            if len(sizes) < 2:
+                continue
+            gain = -sum(size / total * math.log2(size / total)
+                        for size in sizes)
+            ranks.append((-gain, -present, letter))
+        ranks.sort()
+        return [letter for _, _, letter in ranks]
+
+    def _split(self, candidates, letter):
+        """Candidates grouped by the positions letter would reveal"""
+        groups = defaultdict(list)
+        for candidate in candidates:
+            groups[self.masks[candidate].get(letter, 0)].append(candidate)
+        return groups
+
+    def search(self, candidates):
+        """(worst-case wrong guesses, best letter) for a candidate set"""
+        if len(candidates) == 1:
+            return 0, None
+        key = frozenset(candidates)
+        result = self._memo.get(key)
+        if result is not None:
+            return result
+        best = (0, None)
+        for letter in self._ranked_letters(candidates)[:self.width]:
+            worst = 0
+            groups = sorted(self._split(candidates, letter).items(),
+                            key=lambda group: -len(group[1]))
+            for mask, group in groups:
+                worst = max(worst, self.search(group)[0] + (not mask))
+                if best[1] is not None and worst >= best[0]:
+                    break
+            if best[1] is None or worst < best[0]:
+                best = (worst, letter)
+        self._memo[key] = best
+        return best
+
+    def emit(self, candidates, display, wrong, states):
+        """
+        Add (key, letter) for every state of the game below this one
+        Returns:
+            Number of entries whose game this subtree loses
+        """
+        if len(wrong) >= STARTING_LIVES:
+            return len(candidates)
+        letter = self.search(candidates)[1]
+        if letter is None:
+            # One answer is left: reveal its remaining letters in order
+            for letter in self.entries[candidates[0]]:
+                if letter is not None and letter not in display:
+                    states.append((state_key("".join(display), wrong),
+                                   letter))
+                    display = [letter if char == letter else shown
+                               for char, shown in
+                               zip(self.entries[candidates[0]], display)]
+            return 0
+
+        states.append((state_key("".join(display), wrong), letter))
+        lost = 0
+        for mask, group in self._split(candidates, letter).items():
+            if mask:
+                revealed = [letter if mask >> position & 1 else shown
+                            for position, shown in enumerate(display)]
+                lost += self.emit(group, revealed, wrong, states)
+            else:
+                lost += self.emit(group, display,
+                                  tuple(sorted(wrong + (letter,))), states)
+        return lost
+
+
+def build_shape(entries, language, width):
+    """
+    Search and emit the tree of one shape (run in a worker process)
+    Returns:
+        (keys, letter code points, worst-case wrong guesses,
+        entries lost, distinct entries)
+    """
+    search = _ShapeSearch(entries, get_alphabet(language), width)
+    candidates = list(range(len(search.entries)))
+    worst = search.search(candidates)[0]
+    states = []
+    display = list(word_shape(entries[0]))
+    lost = search.emit(candidates, display, (), states)
+    keys = np.fromiter((key for key, _ in states), dtype=np.uint64,
+                       count=len(states))
+    letters = np.fromiter((ord(letter) for _, letter in states),
+                          dtype=np.uint32, count=len(states))
+    return keys, letters, worst, lost, len(candidates)
+
+
+class TreeReport:
+    """Summary of a built decision tree"""
+
+    def __init__(self, entries=0, states=0, worst_case_wrong_guesses=0,
+                 lost=0, elapsed=0.0):
+        self.entries = entries
+        self.states = states
+        self.worst_case_wrong_guesses = worst_case_wrong_guesses
+        self.lost = lost
+        self.elapsed = elapsed
+
+    def add_shape(self, part):
+        """Merge the result of build_shape for one shape"""
+        keys, _, worst, lost, entries = part
+        self.entries += entries
+        self.states += len(keys)
+        self.worst_case_wrong_guesses = max(self.worst_case_wrong_guesses,
+                                            worst)
+        self.lost += lost
+
+    def format_report(self):
+        """Format the report as short text"""
+        return (f"Entries:                   {self.entries}\n"
+                f"Game states:               {self.states}\n"
+                f"Worst-case wrong guesses:  "
+                f"{self.worst_case_wrong_guesses}\n"
+                f"Entries lost ({STARTING_LIVES} lives):    {self.lost}\n"
+                f"Build seconds:             {self.elapsed:.2f}")
+
+
+def _write_tree(path, language, parts, report):
+    """Insert the states into an open-addressing table and write it"""
+    slots = 1 << max(3, (2 * report.states - 1).bit_length())
+    keys = np.zeros(slots, dtype="<u8")
+    letters = np.zeros(slots, dtype="<u4")
+    mask = slots - 1
+    for part_keys, part_letters, *_ in parts:
+        for key, letter in zip(part_keys.tolist(), part_letters.tolist()):
+            slot = key & mask
+            while keys[slot]:
+                slot = (slot + 1) & mask
+            keys[slot] = key
+            letters[slot] = letter
+    with open(path, "wb") as output:
+        output.write(_HEADER.pack(MAGIC, language.encode("utf-8"), slots,
+                                  report.states, report.entries,
+                                  report.worst_case_wrong_guesses,
+                                  report.lost))
+        output.write(keys.tobytes())
+        output.write(letters.tobytes())
+
+
+def build_decision_tree(dictionary, level, path, workers=None, width=2):
+    """
+    Build the decision tree of a level and write it to a file
+    Args:
+        dictionary: DictionaryManager holding the level
+        level: level to build the tree for
+        path: output file path
+        workers: number of processes (one per CPU by default; 1 builds
+            in this process)
+        width: letters tried per state, by information gain; 1 is the
+            greedy Solver choice, larger values search more
+    Returns:
+        TreeReport
+    """
+    if width < 1:
+        raise ValueError("width must be positive")
+    language = dictionary.get_alphabet(level).name
+    shapes = defaultdict(list)
+    for entry in dictionary.get_entries(level):
+        shapes[word_shape(entry)].append(entry)
+    # Largest shapes first, so they do not finish last
+    jobs = sorted(shapes.values(), key=len, reverse=True)
+
+    start_time = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    arguments = (jobs, [language] * len(jobs), [width] * len(jobs))
+    if workers == 1:
+        parts = list(map(build_shape, *arguments))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(build_shape, *arguments))
+
+    report = TreeReport()
+    for part in parts:
+        report.add_shape(part)
+    _write_tree(path, language, parts, report)
+    report.elapsed = time.perf_counter() - start_time
+    return report
+
+
+class DecisionTree:
+    """Read-only view of a decision tree file held in a buffer"""
+
+    def __init__(self, buffer):
+        if len(buffer) < _HEADER.size or buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a Hangman decision tree")
+        _, language, slots, states, entries, worst, lost = \
+            _HEADER.unpack_from(buffer, 0)
+        if slots & (slots - 1) or len(buffer) < _HEADER.size + 12 * slots:
+            raise ValueError("Truncated or corrupt decision tree")
+        # Summary stored when the tree was built (elapsed is not kept)
+        self.report = TreeReport(entries, states, worst, lost)
+        self.alphabet = get_alphabet(
+            language.rstrip(b"\0").decode("utf-8"))
+        self._keys = np.frombuffer(buffer, dtype="<u8", count=slots,
+                                   offset=_HEADER.size)
+        self._letters = np.frombuffer(buffer, dtype="<u4", count=slots,
+                                      offset=_HEADER.size + 8 * slots)
+        self._mmap = None
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map a decision tree file"""
+        with open(path, "rb") as source:
+            mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            tree = cls(mapped)
+        except ValueError:
+            mapped.close()
+            raise
+        tree._mmap = mapped
+        return tree
+
+    def lookup(self, display_word, guessed_letters):
+        """
+        Letter to guess next in a game state
+        Args:
+            display_word: HangmanGame display word
+            guessed_letters: letters guessed so far
+        Returns:
+            The letter, or None for a state that is not on the tree
+        """
+        table = self.alphabet.table
+        folded = "".join(table[char][0] if char in table else char
+                         for char in display_word)
+        wrong = [letter for letter in guessed_letters
+                 if letter not in folded]
+        key = state_key(folded, wrong)
+        keys = self._keys
+        mask = len(keys) - 1
+        slot = key & mask
+        while True:
+            stored = int(keys[slot])
+            if stored == key:
+                return chr(self._letters[slot])
+            if not stored:
+                return None
+            slot = (slot + 1) & mask
+
+    def best_letter(self, game_state):
+        """Letter to guess next, from HangmanGame.get_game_state()"""
+        return self.lookup(game_state['display_word'],
+                           game_state['guessed_letters'])
+
+    def close(self):
+        """Release the arrays and the mapping"""
+        self._keys = self._letters = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
@@ -6,73 +6,366 @@ providing random selection functionality for different difficulty levels.
 """
 
 import random
+from alphabet import get_alphabet, normalize_entry, normalize_entries
+from compiled_dictionary import (CompiledDictionary, compile_dictionary,
+                                 publish_dictionary, publish_image)
+from difficulty import DifficultyFeatures
+from pattern_index import PatternIndex
+from word_selection import WordSelection
+
+# Basic level words
+BASIC_WORDS = [
+    "PYTHON", "COMPUTER", "PROGRAMMING", "ALGORITHM", "FUNCTION",
+    "VARIABLE", "LOOP", "CONDITION", "ARRAY", "STRING", "INTEGER",
+    "BOOLEAN", "CLASS", "OBJECT", "METHOD", "LIBRARY", "FRAMEWORK",
+    "DATABASE", "NETWORK", "SECURITY", "ENCRYPTION", "DEBUGGING",
+    "TESTING", "DEVELOPMENT", "SOFTWARE", "HARDWARE", "INTERNET",
+    "WEBSITE", "APPLICATION", "INTERFACE", "SYSTEM", "PROTOCOL",
+    "SERVER", "CLIENT", "BROWSER", "OPERATING", "MEMORY", "PROCESSOR",
+    "KEYBOARD", "MONITOR", "MOUSE", "PRINTER", "SCANNER", "ROUTER",
+    "WIRELESS", "BLUETOOTH", "ETHERNET", "FIREWALL", "ANTIVIRUS"
+]
+
+# Intermediate level phrases
+INTERMEDIATE_PHRASES = [
+    "HELLO WORLD", "MACHINE LEARNING", "ARTIFICIAL INTELLIGENCE",
+    "DATA STRUCTURE", "SOFTWARE ENGINEERING", "WEB DEVELOPMENT",
+    "MOBILE APPLICATION", "CLOUD COMPUTING", "CYBER SECURITY",
+    "GAME DEVELOPMENT", "USER INTERFACE", "DATABASE MANAGEMENT",
+    "NETWORK ADMINISTRATION", "SYSTEM ANALYSIS", "PROJECT MANAGEMENT",
+    "QUALITY ASSURANCE", "VERSION CONTROL", "AGILE METHODOLOGY",
+    "OBJECT ORIENTED PROGRAMMING", "FUNCTIONAL PROGRAMMING",
+    "RESPONSIVE WEB DESIGN", "FULL STACK DEVELOPMENT",
+    "FRONT END DEVELOPMENT", "BACK END DEVELOPMENT",
+    "DISTRIBUTED SYSTEMS", "MICROSERVICES ARCHITECTURE",
+    "CONTINUOUS INTEGRATION", "CONTINUOUS DEPLOYMENT",
+    "AUTOMATED TESTING", "CODE REVIEW PROCESS",
+    "TECHNICAL DOCUMENTATION", "SOFTWARE ARCHITECTURE",
+    "DESIGN PATTERNS", "ALGORITHM OPTIMIZATION",
+    "DATA VISUALIZATION", "BUSINESS INTELLIGENCE"
+]
+
+
+class _LevelIndex:
+    """Entries of one level with a membership index and size buckets"""
+
+    def __init__(self):
+        self.entries = []
+        # entry -> position in entries
+        self.members = {}
+        # (length, word count) -> entries, with None for either one
+        # matching any size; built on the first sized query
+        self.buckets = None
+        # DifficultyIndex, scored on the first difficulty query
+        self.difficulty = None
+        # DifficultyFeatures, kept up to date once difficulty is used
+        self.features = None
+        # PatternIndex, built on the first match query
+        self.patterns = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, entry):
+        return entry in self.members
+
+    def index_of(self, entry):
+        """Position of an entry in entries, or None"""
+        return self.members.get(entry)
+
+    def add_many(self, entries):
+        """Add normalized entries; returns how many were not present"""
+        members = self.members
+        added = [entry for entry in dict.fromkeys(entries)
+                 if entry not in members]
+        start = len(self.entries)
+        members.update(zip(added, range(start, start + len(added))))
+        self.entries.extend(added)
+        if added:
+            self.difficulty = None
+            self.patterns = None
+            if self.features is not None:
+                self.features.extend(added)
+        if self.buckets is not None:
+            self._bucket_entries(added)
+        return len(added)
+
+    def _bucket_entries(self, entries):
+        """Append entries to the size buckets"""
+        buckets = self.buckets
+        for entry in entries:
+            length = len(entry)
+            word_count = entry.count(" ") + 1
+            for size in ((length, word_count), (length, None),
+                         (None, word_count)):
+                bucket = buckets.get(size)
+                if bucket is None:
+                    bucket = buckets[size] = []
+                bucket.append(entry)
+
+    def get_difficulty(self):
+        """DifficultyIndex of the entries, featurizing each entry once"""
+        if self.difficulty is None:
+            if self.features is None:
+                self.features = DifficultyFeatures(self.entries)
+            self.difficulty = self.features.index()
+        return self.difficulty
+
+    def bucket(self, length=None, word_count=None):
+        """Entries with the given length and/or word count"""
+        if length is None and word_count is None:
+            return self.entries
+        if self.buckets is None:
+            self.buckets = {}
+            self._bucket_entries(self.entries)
+        return self.buckets.get((length, word_count), ())
 
 
 class DictionaryManager:
     """Manages word and phrase dictionaries for the game"""
 
-    def __init__(self):
-        # Basic level words
-        self.words = [
-            "PYTHON", "COMPUTER", "PROGRAMMING", "ALGORITHM", "FUNCTION",
-            "VARIABLE", "LOOP", "CONDITION", "ARRAY", "STRING", "INTEGER",
-            "BOOLEAN", "CLASS", "OBJECT", "METHOD", "LIBRARY", "FRAMEWORK",
-            "DATABASE", "NETWORK", "SECURITY", "ENCRYPTION", "DEBUGGING",
-            "TESTING", "DEVELOPMENT", "SOFTWARE", "HARDWARE", "INTERNET",
-            "WEBSITE", "APPLICATION", "INTERFACE", "SYSTEM", "PROTOCOL",
-            "SERVER", "CLIENT", "BROWSER", "OPERATING", "MEMORY", "PROCESSOR",
-            "KEYBOARD", "MONITOR", "MOUSE", "PRINTER", "SCANNER", "ROUTER",
-            "WIRELESS", "BLUETOOTH", "ETHERNET", "FIREWALL", "ANTIVIRUS"
-        ]
-
-        # Intermediate level phrases
-        self.phrases = [
-            "HELLO WORLD", "MACHINE LEARNING", "ARTIFICIAL INTELLIGENCE",
-            "DATA STRUCTURE", "SOFTWARE ENGINEERING", "WEB DEVELOPMENT",
-            "MOBILE APPLICATION", "CLOUD COMPUTING", "CYBER SECURITY",
-            "GAME DEVELOPMENT", "USER INTERFACE", "DATABASE MANAGEMENT",
-            "NETWORK ADMINISTRATION", "SYSTEM ANALYSIS", "PROJECT MANAGEMENT",
-            "QUALITY ASSURANCE", "VERSION CONTROL", "AGILE METHODOLOGY",
-            "OBJECT ORIENTED PROGRAMMING", "FUNCTIONAL PROGRAMMING",
-            "RESPONSIVE WEB DESIGN", "FULL STACK DEVELOPMENT",
-            "FRONT END DEVELOPMENT", "BACK END DEVELOPMENT",
-            "DISTRIBUTED SYSTEMS", "MICROSERVICES ARCHITECTURE",
-            "CONTINUOUS INTEGRATION", "CONTINUOUS DEPLOYMENT",
-            "AUTOMATED TESTING", "CODE REVIEW PROCESS",
-            "TECHNICAL DOCUMENTATION", "SOFTWARE ARCHITECTURE",
-            "DESIGN PATTERNS", "ALGORITHM OPTIMIZATION",
-            "DATA VISUALIZATION", "BUSINESS INTELLIGENCE"
-        ]
-
-    def get_random_word(self, level):
+    def __init__(self, path=None, shared=None):
+        """
+        Args:
+            path: optional compiled dictionary file to memory-map
+                instead of the built-in word and phrase lists
+            shared: optional name of a dictionary published with
+                publish_shared() to attach to instead
+        """
+        self._levels = {}
+        # level -> language, for levels that are not English
+        self._languages = {}
+        self._compiled = None
+        # Compiled image the levels still match, e.g. for publish_shared
+        self.image = None
+        # Order of next_word; its state can be saved and restored
+        self.selection = WordSelection()
+        if path is not None and shared is not None:
+            raise ValueError("Give either path or shared, not both")
+        if shared is not None:
+            self._compiled = CompiledDictionary.attach(shared)
+        elif path is not None:
+            self._compiled = CompiledDictionary.open(path)
+        else:
+            self.add_words(BASIC_WORDS, "basic")
+            self.add_words(INTERMEDIATE_PHRASES, "intermediate")
+        if self._compiled is not None:
+            self._levels.update(self._compiled.levels)
+            self._languages.update(self._compiled.languages)
+            self.image = self._compiled.image
+
+    @property
+    def words(self):
+        """Basic level words"""
+        return self._levels["basic"].entries
+
+    @property
+    def phrases(self):
+        """Intermediate level phrases"""
+        return self._levels["intermediate"].entries
+
+    def get_levels(self):
+        """Get the names of all levels"""
+        return list(self._levels)
+
+    def get_alphabet(self, level):
+        """Alphabet of a level's language, e.g. for HangmanGame.set_word"""
+        self._get_level(level)
+        return get_alphabet(self._languages.get(level))
+
+    def _get_level(self, level):
+        """Get the index of a level, raising ValueError if unknown"""
+        try:
+            return self._levels[level]
+        except KeyError:
+            raise ValueError(f"Invalid level: {level}. "
+                             f"Use one of: {', '.join(self._levels)}"
+                             ) from None
+
+    def _get_difficulty(self, level):
+        """DifficultyIndex of a level, scoring the level if needed"""
+        return self._get_level(level).get_difficulty()
+
+    def get_random_word(self, level, length=None, word_count=None,
+                        difficulty=None):
         """
         Get a random word or phrase based on level
         Args:
-            level: "basic" for words, "intermediate" for phrases
+            level: "basic" for words, "intermediate" for phrases,
+                or any level added with add_words
+            length: optional exact length (including spaces)
+            word_count: optional number of words in a phrase
+            difficulty: optional band, "easy", "medium", "hard" or a
+                (low, high) score range; not combined with the size
+                filters
         Returns:
             Random word or phrase as uppercase string
         """
-        if level == "basic":
-            return random.choice(self.words)
-        if level == "intermediate":
-            return random.choice(self.phrases)
-        raise ValueError(f"Invalid level: {level}."
-                         f"Use 'basic' or 'intermediate'")
+        if difficulty is not None:
+            if length is not None or word_count is not None:
+                raise ValueError("difficulty cannot be combined with "
+                                 "length or word_count")
+            index = self._get_difficulty(level)
+            band = index.band(difficulty)
+            if not band:
+                raise ValueError(f"No entries in level '{level}' with "
+                                 f"difficulty {difficulty}")
+            position = index.order[random.choice(band)]
+            return self._levels[level].entries[int(position)]
+
+        bucket = self._get_level(level).bucket(length, word_count)
+        if not bucket:
+            raise ValueError(f"No entries in level '{level}' with "
+                             f"length={length}, word_count={word_count}")
+        return random.choice(bucket)
+
+    def seed_selection(self, seed=None):
+        """
+        Restart non-repeating selection (next_word) from a seed
+        Args:
+            seed: integer seed; None picks a fresh random seed
+        """
+        self.selection.reseed(seed)
+
+    def next_word(self, level, length=None, word_count=None):
+        """
+        Draw the next word or phrase without replacement
+        Every entry of the level (or size bucket) is drawn once before
+        any repeats, in an order fixed by the selection seed. The
+        position is kept in the selection attribute, whose get_state()
+        and set_state() save and restore it.
+        """
+        bucket = self._get_level(level).bucket(length, word_count)
+        if not bucket:
+            raise ValueError(f"No entries in level '{level}' with "
+                             f"length={length}, word_count={word_count}")
+        return self.selection.draw((level, length, word_count), bucket)
+
+    def get_entry_id(self, word, level):
+        """
+        Stable integer id of an entry, e.g. for HangmanGame.set_word
+        Raises ValueError if the word is not in the level.
+        """
+        index = self._get_level(level).index_of(normalize_entry(word))
+        if index is None:
+            raise ValueError(f"'{word}' is not in level '{level}'")
+        return list(self._levels).index(level) << 32 | index
+
+    def get_entry_by_id(self, entry_id):
+        """(entry, level) for an id from get_entry_id"""
+        level = list(self._levels)[entry_id >> 32]
+        return self._levels[level].entries[entry_id & 0xFFFFFFFF], level
+
+    def match(self, pattern, excluded="", level=None):
+        """
+        Find every entry consistent with a masked pattern
+        Args:
+            pattern: display word with "_" for hidden letters, e.g.
+                "P_TH_N" or "H____ W____"; spaces and punctuation must
+                be where the entry has them
+            excluded: letters known not to be in the entry
+            level: level to search (all levels by default)
+        Returns:
+            Matching entries. As in a game, hidden positions never hold
+            a revealed or excluded letter.
+        """
+        matches = []
+        for name in [level] if level is not None else list(self._levels):
+            index = self._get_level(name)
+            if index.patterns is None:
+                index.patterns = PatternIndex(index.entries,
+                                              self.get_alphabet(name))
+            matches.extend(index.patterns.match(pattern, excluded))
+        return matches
+
+    def get_difficulty(self, word, level):
+        """
+        Difficulty score of an entry, from 0 (easiest) to 1 (hardest)
+        Raises ValueError if the word is not in the level.
+        """
+        index = self._get_level(level).index_of(normalize_entry(word))
+        if index is None:
+            raise ValueError(f"'{word}' is not in level '{level}'")
+        return float(self._get_difficulty(level).scores[index])
+
+    def get_entries(self, level, length=None, word_count=None):
+        """Get all words or phrases of a level, optionally by size"""
+        return self._get_level(level).bucket(length, word_count)
+
+    def contains(self, word, level=None):
+        """Check whether a word is in one level (or any level)"""
+        word = normalize_entry(word)
+        if level is not None:
+            index = self._levels.get(level)
+            return index is not None and word in index
+        return any(word in index for index in self._levels.values())
 
     def add_word(self, word, level="basic"):
         """Add a custom word to the dictionary"""
-        word = word.upper()
-        if level == "basic":
-            if word not in self.words:
-                self.words.append(word)
-        elif level == "intermediate":
-            if word not in self.phrases:
-                self.phrases.append(word)
-
-    def get_word_count(self, level):
+        self.add_words((word,), level)
+
+    def add_words(self, words, level="basic", language=None):
+        """
+        Add many words or phrases to a level, creating it if needed
+        Entries are normalized once here (NFC, upper case).
+        Args:
+            language: language of the level (see alphabet.ALPHABETS);
+                levels are English unless a language is given
+        Returns:
+            Number of entries that were not already present
+        """
+        self.image = None
+        if language is not None:
+            get_alphabet(language)  # ValueError for unknown languages
+            if language == "english":
+                self._languages.pop(level, None)
+            else:
+                self._languages[level] = language
+        index = self._levels.get(level)
+        if not isinstance(index, _LevelIndex):
+            # Compiled levels are read-only: copy them into memory first
+            existing = index.entries if index is not None else ()
+            index = self._levels[level] = _LevelIndex()
+            index.add_many(existing)
+        return index.add_many(normalize_entries(words))
+
+    def get_word_count(self, level, length=None, word_count=None):
         """Get count of words in specified level"""
-        if level == "basic":
-            return len(self.words)
-        if level == "intermediate":
-            return len(self.phrases)
-        return 0
+        index = self._levels.get(level)
+        if index is None:
+            return 0
+        return len(index.bucket(length, word_count))
+
+    def save_compiled(self, path):
+        """Compile all levels into a file that DictionaryManager can map"""
+        return compile_dictionary(
+            path, {level: index.entries
+                   for level, index in self._levels.items()},
+            self._languages)
+
+    def close(self):
+        """Release the memory-mapped or shared dictionary, if any"""
+        if self._compiled is not None:
+            self._levels = {}
+            self.image = None
+            self._compiled.close()
+            self._compiled = None
+
+
+def publish_shared(dictionary, name=None):
+    """
+    Publish all levels of a DictionaryManager into shared memory
+    Workers pass the block's name to DictionaryManager(shared=...)
+    and read the entries and indexes in place, read-only.
+    Returns:
+        The SharedMemory block; close() and unlink() it when the
+        workers are done
+    """
+    if dictionary.image is not None:
+        # Unchanged compiled dictionary: copy its image as it is
+        return publish_image(dictionary.image, name)
+    levels = dictionary.get_levels()
+    return publish_dictionary(
+        {level: dictionary.get_entries(level) for level in levels},
+        {level: dictionary.get_alphabet(level).name for level in levels},
+        name)
@@ -0,0 +1,213 @@
+"""
+Word Difficulty Module
+
+This module scores every entry of a level in one vectorized NumPy pass
+and keeps the entries ordered from easiest to hardest, so a difficulty
+band is a contiguous slice of that order and picking a random entry
+from a band is O(1). Features that depend on one entry alone are kept,
+so entries added to a level are featurized on their own and the level
+is rescored without featurizing the others again.
+
+An entry is harder when it has fewer distinct letters, rarer letters,
+fewer letters, and more other entries sharing its letter pattern (the
+positions of repeated letters and spaces, e.g. LOOP and BEEF).
+"""
+
+import numpy as np
+
+# Named bands as (low, high) fractions of the easiest-to-hardest order
+DIFFICULTY_BANDS = {
+    "easy": (0.0, 1 / 3),
+    "medium": (1 / 3, 2 / 3),
+    "hard": (2 / 3, 1.0),
+}
+
+
+def code_matrix(entries):
+    """Entries as a zero padded matrix of code points, one row each"""
+    matrix = np.array(entries, dtype=str)
+    if not matrix.size or not matrix.dtype.itemsize:
+        return np.zeros((len(entries), 0), dtype=np.uint32)
+    width = matrix.dtype.itemsize // 4
+    return matrix.view(np.uint32).reshape(len(entries), width)
+
+
+def letter_mask(codes):
+    """Which code points of a code matrix are letters (str.isalpha)"""
+    # Look letters up in a table over the code points that occur
+    present = np.bincount(codes.ravel(), minlength=1)
+    letter_table = np.zeros(len(present), dtype=bool)
+    for code in np.flatnonzero(present):
+        letter_table[code] = chr(code).isalpha()
+    return letter_table[codes]
+
+
+def _standardize(values):
+    """Shift and scale values to mean 0 and standard deviation 1"""
+    values = values.astype(np.float64)
+    spread = values.std()
+    return (values - values.mean()) / spread if spread else values * 0
+
+
+def _entry_features(codes):
+    """
+    Features of every row that do not depend on the other rows
+    Returns:
+        (letter count, row of each distinct letter, code of each
+        distinct letter, pattern hash)
+    """
+    is_letter = letter_mask(codes)
+    letters = np.where(is_letter, codes, 0)
+
+    # Sorting each row groups repeated letters together
+    positions = np.argsort(letters, axis=1, kind="stable")
+    ordered = np.take_along_axis(letters, positions, axis=1)
+    first = np.ones_like(ordered, dtype=bool)
+    first[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    row_of, column_of = np.nonzero(first & (ordered != 0))
+    return (is_letter.sum(axis=1), row_of, ordered[row_of, column_of],
+            _pattern_hash(codes, is_letter, positions, first))
+
+
+def _pattern_hash(codes, is_letter, positions, first):
+    """
+    Hash of the letter pattern of every row
+    Args:
+        positions: each row's columns in stable sorted letter order
+        first: which sorted cells start a run of equal letters
+    """
+    # Pattern: each letter becomes the position of its first occurrence
+    # (the stable sort keeps the first occurrence at the group start)
+    columns = np.broadcast_to(np.arange(codes.shape[1]), codes.shape)
+    group_start = np.maximum.accumulate(np.where(first, columns, 0), axis=1)
+    first_position = np.take_along_axis(positions, group_start, axis=1)
+    pattern = np.empty_like(positions)
+    np.put_along_axis(pattern, positions, first_position, axis=1)
+    pattern = np.where(is_letter, pattern,
+                       codes.astype(np.int64) + (1 << 32))
+    # Hash each pattern row to one integer (wrapping multiply-add),
+    # stopping at the row's end so padding does not change the hash
+    lengths = (codes != 0).sum(axis=1)
+    pattern_hash = np.zeros(len(codes), dtype=np.uint64)
+    for column, values in enumerate(pattern.T.astype(np.uint64)):
+        pattern_hash = np.where(
+            column < lengths,
+            pattern_hash * np.uint64(0x100000001B3) + values, pattern_hash)
+    return pattern_hash
+
+
+def _ids(known, values):
+    """Map values to dense ids, giving new values the next free ids"""
+    unique, inverse = np.unique(values, return_inverse=True)
+    ids = np.fromiter((known.setdefault(value, len(known))
+                       for value in unique.tolist()),
+                      dtype=np.int64, count=len(unique))
+    return ids[inverse]
+
+
+class DifficultyFeatures:
+    """
+    Per-entry difficulty features of a growing list of entries
+    Entries are featurized once, when they are added; index() combines
+    those features with the letter and pattern counts of the whole
+    list, which takes a few linear passes and one sort.
+    """
+
+    def __init__(self, entries=()):
+        self.count = 0
+        # Per entry: letters, pattern id
+        self._letters = np.zeros(0, dtype=np.int64)
+        self._pattern_of = np.zeros(0, dtype=np.int64)
+        # Per distinct letter of every entry: entry position, letter id
+        self._row_of = np.zeros(0, dtype=np.int64)
+        self._letter_of = np.zeros(0, dtype=np.int64)
+        # letter code point or pattern hash -> id
+        self._letter_ids = {}
+        self._pattern_ids = {}
+        self.extend(entries)
+
+    def __len__(self):
+        return self.count
+
+    def extend(self, entries):
+        """Featurize entries (a list of strings) added after the others"""
+        entries = list(entries)
+        if not entries:
+            return
+        letters, row_of, codes, pattern_hash = _entry_features(
+            code_matrix(entries))
+        self._letters = np.concatenate((self._letters, letters))
+        self._pattern_of = np.concatenate(
+            (self._pattern_of, _ids(self._pattern_ids, pattern_hash)))
+        self._row_of = np.concatenate((self._row_of, row_of + self.count))
+        self._letter_of = np.concatenate(
+            (self._letter_of, _ids(self._letter_ids, codes)))
+        self.count += len(entries)
+
+    def index(self):
+        """Score every entry against the whole list"""
+        count = self.count
+        if not count:
+            return DifficultyIndex(np.zeros(0, dtype=np.float32),
+                                   np.zeros(0, dtype=np.uint32))
+        distinct = np.bincount(self._row_of, minlength=count)
+        # Rarity: mean -log(share of entries containing the letter)
+        containing = np.bincount(self._letter_of,
+                                 minlength=len(self._letter_ids))
+        weights = -np.log(containing / count)[self._letter_of]
+        rarity = np.bincount(self._row_of, weights, minlength=count) / \
+            np.maximum(distinct, 1)
+        # Ambiguity: other entries sharing the letter pattern
+        ambiguity = np.bincount(self._pattern_of)[self._pattern_of] - 1
+
+        raw = (_standardize(rarity) + _standardize(np.log1p(ambiguity))
+               - _standardize(distinct)
+               - 0.5 * _standardize(self._letters))
+        order = np.argsort(raw, kind="stable").astype(np.uint32)
+        # Scores are ranks scaled to [0, 1], so bands split evenly
+        scores = np.empty(count, dtype=np.float32)
+        scores[order] = np.arange(count) / max(count - 1, 1)
+        return DifficultyIndex(scores, order)
+
+
+class DifficultyIndex:
+    """Difficulty scores of a level's entries and their sorted order"""
+
+    def __init__(self, scores, order):
+        """
+        Args:
+            scores: per-entry score in [0, 1], by entry position
+            order: entry positions from easiest to hardest
+        """
+        self.scores = scores
+        self.order = order
+
+    @classmethod
+    def build(cls, entries):
+        """Score entries (a list of strings) in one vectorized pass"""
+        return DifficultyFeatures(entries).index()
+
+    def __len__(self):
+        return len(self.order)
+
+    def band(self, difficulty):
+        """
+        Range of positions in order that holds a difficulty band
+        Args:
+            difficulty: band name from DIFFICULTY_BANDS or a
+                (low, high) pair of fractions between 0 and 1
+        """
+        if isinstance(difficulty, str):
+            try:
+                low, high = DIFFICULTY_BANDS[difficulty]
+            except KeyError:
+                raise ValueError(
+                    f"Unknown difficulty: {difficulty}. "
+                    f"Use one of: {', '.join(DIFFICULTY_BANDS)}") from None
+        else:
+            low, high = difficulty
+            if not 0 <= low < high <= 1:
+                raise ValueError("Difficulty range must satisfy "
+                                 "0 <= low < high <= 1")
+        count = len(self.order)
+        return range(int(low * count), int(high * count))
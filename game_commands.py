@@ -0,0 +1,80 @@
+"""
+Game Commands Module
+
+This module funnels every change to a HangmanGame through a command
+queue with a single writer. Any thread (a timer callback, an input
+thread) may submit guesses and timeouts; only the thread that owns the
+game applies them, in the order they were submitted, when it drains
+the queue.
+
+Each command carries the turn it was issued for: the game's version at
+the time. A command whose turn has passed, or that arrives after the
+game is over, is dropped, so a timeout and a late guess for the same
+turn are never both applied, duplicate timeouts count once, and a
+timeout cannot land on a game that was already won. Submitting is a
+deque append, which is atomic and needs no lock.
+"""
+
+from collections import deque
+
+GUESS = "guess"
+TIMEOUT = "timeout"
+
+
+class GameCommandQueue:
+    """Guesses and timeouts waiting to be applied to one game"""
+
+    def __init__(self, game):
+        self.game = game
+        self._commands = deque()
+        # Commands dropped because their turn had passed
+        self.dropped = 0
+
+    @property
+    def turn(self):
+        """Current turn, to pass along with commands issued now"""
+        return self.game.version
+
+    def __len__(self):
+        return len(self._commands)
+
+    def submit_guess(self, letter, turn=None):
+        """
+        Queue a guess (safe from any thread)
+        Args:
+            turn: turn the guess answers; None applies it on any turn
+        """
+        self._commands.append((GUESS, letter, turn))
+
+    def submit_timeout(self, turn=None):
+        """Queue a timeout for a turn (safe from any thread)"""
+        self._commands.append((TIMEOUT, None, turn))
+
+    def drain(self, limit=None):
+        """
+        Apply pending commands in order; call from the owning thread only
+        Args:
+            limit: most commands to apply in this batch (all by default)
+        Returns:
+            List of (GUESS or TIMEOUT, letter, result) for the commands
+            applied, where result is what guess_letter returned (False
+            for a timeout)
+        """
+        game = self.game
+        commands = self._commands
+        applied = []
+        while commands and (limit is None or len(applied) < limit):
+            kind, letter, turn = commands.popleft()
+            if game.game_over or (turn is not None and turn != game.version):
+                self.dropped += 1
+                continue
+            if kind == GUESS:
+                applied.append((kind, letter, game.guess_letter(letter)))
+            else:
+                game.handle_timeout()
+                applied.append((kind, letter, False))
+        return applied
+
+    def clear(self):
+        """Drop every pending command, e.g. when a new game starts"""
+        self._commands.clear()
@@ -5,22 +5,32 @@ This module handles the user interface and input/output for the Hangman game,
 providing console-based interaction functionality.
 """
 
-import os
-import sys
+import math
 import threading
 import time
+from alphabet import get_alphabet
+from input_reader import InputReader
+from renderer import create_renderer
 
 
 class GameInterface:
     """Handles user interface and input/output for the Hangman game"""
 
-    def __init__(self):
+    def __init__(self, input_reader=None, renderer=None):
         self.timer_display_active = False
         self.timer_thread = None
+        self.input_reader = input_reader
+        self.renderer = renderer or create_renderer()
+
+    def read_input(self, prompt=""):
+        """Read a line through the input reader, or input() without one"""
+        if self.input_reader is not None:
+            return self.input_reader.input(prompt)
+        return input(prompt)
 
     def clear_screen(self):
         """Clear the console screen"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self.renderer.clear_screen()
 
     def display_welcome(self):
         """Display welcome message and game rules"""
@@ -47,7 +57,7 @@ class GameInterface:
             print("2. Intermediate (Phrases)")
             print("3. Quit game")
 
-            choice = input("\nEnter your choice (1-3): ").strip()
+            choice = self.read_input("\nEnter your choice (1-3): ").strip()
 
             if choice == "1":
                 return "basic"
@@ -59,32 +69,46 @@ class GameInterface:
 
     def display_game_state(self, game_state, timer_time=None):
         """Display current game state"""
-        print("\n" + "=" * 50)
-        print(f"Word/Phrase: {game_state['display_word']}")
-        print(f"Lives remaining: {'❤️ ' * game_state['lives']}"
-              f"({game_state['lives']})")
+        self.renderer.draw_state(game_state, timer_time)
 
-        if game_state['guessed_letters']:
-            guessed = ', '.join(game_state['guessed_letters'])
-            print(f"Guessed letters: {guessed}")
+    def display_new_game(self, level, letter_count):
+        """Announce a new game and start its frame"""
+        self.renderer.start_frame()
+        self.renderer.show_message(
+            f"Starting new {level} level game! "
+            f"Your word/phrase has {letter_count} letters.")
 
-        if timer_time is not None:
-            print(f"Time remaining: {timer_time:.1f} seconds")
+    def display_message(self, text):
+        """Display a one-line message in the game frame"""
+        self.renderer.show_message(text)
 
-        print("=" * 50)
+    def show_letter_prompt(self, seconds):
+        """Prompt for a timed letter guess"""
+        self.renderer.show_prompt(
+            f"Enter a letter ({seconds}s to answer): ")
 
-    def get_letter_input(self):
-        """Get letter input from user with validation"""
+    def display_timer(self, seconds):
+        """Update the countdown (only redrawn when it changes)"""
+        self.renderer.update_timer(seconds)
+
+    def get_letter_input(self, alphabet=None):
+        """
+        Get letter input from user with validation
+        Args:
+            alphabet: Alphabet of the game (English by default)
+        """
+        alphabet = alphabet or get_alphabet()
         while True:
             try:
-                letter = input("\nEnter a letter: ").strip().upper()
+                text = self.read_input("\nEnter a letter: ").strip()
+                letter = alphabet.normalize_guess(text)
 
-                if len(letter) != 1:
+                if letter is None and len(text) != 1:
                     print("Please enter exactly one letter!")
                     continue
 
-                if not letter.isalpha():
-                    print("Please enter a valid letter (A-Z)!")
+                if letter is None:
+                    print("Please enter a valid letter!")
                     continue
 
                 return letter
@@ -96,19 +120,22 @@ class GameInterface:
     def display_guess_result(self, result, letter):
         """Display result of a guess"""
         if result is True:
-            print(f"✅ Great! '{letter}' is in the word!")
+            self.renderer.show_message(f"✅ Great! '{letter}' is in the word!")
         elif result is False:
-            print(f"❌ Sorry! '{letter}' is not in the word.")
+            self.renderer.show_message(
+                f"❌ Sorry! '{letter}' is not in the word.")
         elif result is None:
-            print(f"⚠️  You already guessed '{letter}'. "
-                  f"Try a different letter!")
+            self.renderer.show_message(
+                f"⚠️  You already guessed '{letter}'. "
+                f"Try a different letter!")
 
     def display_timeout_message(self):
         """Display timeout message"""
-        print("\n⏰ Time's up! You lose a life.")
+        self.renderer.show_message("⏰ Time's up! You lose a life.")
 
     def display_game_over(self, game_state):
         """Display game over message"""
+        self.renderer.end_frame()
         print("\n" + "=" * 50)
         if game_state['won']:
             print("🎉 CONGRATULATIONS! YOU WON! 🎉")
@@ -122,7 +149,7 @@ class GameInterface:
         """Ask if user wants to play again"""
         while True:
             prompt = "\nDo you want to play again? (y/n): "
-            choice = input(prompt).strip().lower()
+            choice = self.read_input(prompt).strip().lower()
             if choice in ['y', 'yes']:
                 return True
             if choice in ['n', 'no']:
@@ -142,12 +169,8 @@ class GameInterface:
 
         def update_timer_display():
             while self.timer_display_active and timer.is_running:
-                # Move cursor up and clear line to update timer
-                if hasattr(sys.stdout, 'write'):
-                    sys.stdout.write(
-                        f"\rTime remaining: {timer.get_formatted_time()}"
-                    )
-                    sys.stdout.flush()
+                # The renderer only writes when the shown value changes
+                self.display_timer(math.ceil(timer.get_time_remaining()))
                 time.sleep(0.1)
 
         self.timer_thread = threading.Thread(target=update_timer_display)
@@ -166,25 +189,17 @@ class GameInterface:
         Get input from user with timeout
         Returns tuple: (input_string, timed_out)
         """
-        result = [None, False]  # [input, timed_out]
-
-        def get_input():
-            try:
-                result[0] = input(prompt).strip().upper()
-            except (EOFError, KeyboardInterrupt):
-                result[0] = None
-
-        input_thread = threading.Thread(target=get_input)
-        input_thread.daemon = True
-        input_thread.start()
+        if self.input_reader is None:
+            self.input_reader = InputReader()
 
-        # Wait for input or timeout
-        input_thread.join(timeout=timeout_seconds)
+        print(prompt, end="", flush=True)
+        try:
+            line = self.input_reader.read_line(timeout=timeout_seconds)
+        except (EOFError, KeyboardInterrupt):
+            return None, False
 
-        if input_thread.is_alive():
-            # Timeout occurred
-            result[1] = True
+        if line is None:
             print("\n⏰ Time's up!")
             return None, True
 
-        return result[0], False
+        return line.strip().upper(), False
@@ -0,0 +1,178 @@
+"""
+Hangman Batch Engine Module
+
+This module runs many Hangman games in lockstep using NumPy arrays,
+applying the same rules as HangmanGame to every game with vectorized
+operations.
+"""
+
+import numpy as np
+
+# Result codes returned by HangmanBatch.guess
+CORRECT = 1
+INCORRECT = 0
+ALREADY_GUESSED = -1
+INACTIVE = -2
+
+_A = ord("A")
+_Z = ord("Z")
+
+
+class HangmanBatch:
+    """Holds N Hangman games as arrays and advances them together"""
+
+    def __init__(self, answers, level="", lives=6):
+        answers = [answer.upper() for answer in answers]
+        size = len(answers)
+        self.lengths = np.array([len(answer) for answer in answers],
+                                dtype=np.int32)
+        self.level = level
+        width = max((len(answer) for answer in answers), default=0)
+
+        try:
+            encoded = b"".join(answer.encode("ascii").ljust(width, b"\0")
+                               for answer in answers)
+        except UnicodeEncodeError as exc:
+            raise ValueError("HangmanBatch answers must be ASCII") from exc
+
+        # Answers as a zero padded uint8 matrix, one row per game
+        self.answers = np.frombuffer(encoded, dtype=np.uint8).reshape(
+            size, width).copy()
+
+        is_letter = (self.answers >= _A) & (self.answers <= _Z)
+        letter_bits = np.where(
+            is_letter,
+            np.left_shift(np.uint32(1),
+                          (self.answers.astype(np.uint32) - _A) & 31),
+            np.uint32(0),
+        ).astype(np.uint32)
+
+        # Letters present in each answer, as 26-bit masks
+        self.letter_masks = np.bitwise_or.reduce(
+            letter_bits, axis=1) if width else np.zeros(size, dtype=np.uint32)
+        self.guessed = np.zeros(size, dtype=np.uint32)
+
+        # Revealed positions, packed eight positions per byte
+        self.revealed = np.packbits(~is_letter, axis=1)
+
+        self.lives = np.full(size, lives, dtype=np.int16)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def size(self):
+        """Number of games"""
+        return len(self.lengths)
+
+    @property
+    def width(self):
+        """Length of the longest answer"""
+        return self.answers.shape[1]
+
+    @property
+    def hidden(self):
+        """Letters each answer still hides, as 26-bit masks"""
+        return self.letter_masks & ~self.guessed
+
+    @property
+    def won(self):
+        """Whether each game revealed every letter of its answer"""
+        return (self.hidden == 0) & (self.letter_masks != 0)
+
+    @property
+    def game_over(self):
+        """Whether each game is won or out of lives"""
+        return self.won | (self.lives <= 0)
+
+    @staticmethod
+    def _letter_codes(letters):
+        """Convert letters (strings or character codes) to uppercase codes"""
+        letters = np.asarray(letters)
+        if letters.dtype.kind in ("U", "S"):
+            # Only arrays wider than one character can hold "AB"
+            if letters.dtype.itemsize > letters.dtype.alignment and \
+                    letters.size and np.char.str_len(letters).max() > 1:
+                raise ValueError("Guesses must be single letters")
+            letters = letters.astype("U1").view(np.uint32)
+        codes = letters.astype(np.int64)
+        lower = (codes >= ord("a")) & (codes <= ord("z"))
+        codes = np.where(lower, codes - 32, codes)
+        valid = (codes == 0) | ((codes >= _A) & (codes <= _Z))
+        if not valid.all():
+            raise ValueError("Guesses must be letters A-Z (or 0 to skip)")
+        return codes.astype(np.uint8)
+
+    def guess(self, letters):
+        """
+        Apply one guess to every game
+        Args:
+            letters: N letters as strings or character codes; an empty
+                string or 0 skips that game for this step
+        Returns:
+            int8 array of CORRECT, INCORRECT, ALREADY_GUESSED, or
+            INACTIVE for skipped and finished games
+        """
+        codes = self._letter_codes(letters)
+        if codes.shape != (self.size,):
+            raise ValueError(f"Expected {self.size} guesses, "
+                             f"got {codes.shape}")
+
+        active = ~self.game_over & (codes != 0)
+        bits = np.where(
+            active,
+            np.left_shift(np.uint32(1),
+                          (codes.astype(np.uint32) - _A) & 31),
+            np.uint32(0),
+        ).astype(np.uint32)
+
+        already = active & ((self.guessed & bits) != 0)
+        fresh = active & ~already
+        self.guessed |= np.where(fresh, bits, np.uint32(0)).astype(np.uint32)
+
+        correct = fresh & ((self.letter_masks & bits) != 0)
+        wrong = fresh & ~correct
+
+        if correct.any():
+            rows = np.flatnonzero(correct)
+            hits = self.answers[rows] == codes[rows, None]
+            self.revealed[rows] |= np.packbits(hits, axis=1)
+
+        self.lives -= wrong
+
+        results = np.full(self.size, INACTIVE, dtype=np.int8)
+        results[correct] = CORRECT
+        results[wrong] = INCORRECT
+        results[already] = ALREADY_GUESSED
+        return results
+
+    def handle_timeout(self, mask=None):
+        """Deduct a life from every game (or those selected by mask)"""
+        active = ~self.game_over
+        if mask is not None:
+            active &= np.asarray(mask, dtype=bool)
+        self.lives -= active
+
+    def get_display_word(self, index):
+        """Get display word for one game"""
+        length = self.lengths[index]
+        row = self.answers[index, :length]
+        shown = np.unpackbits(self.revealed[index])[:length].astype(bool)
+        chars = np.where(shown, row, np.uint8(ord("_")))
+        return chars.tobytes().decode("ascii")
+
+    def get_game_state(self, index):
+        """Get state of one game in HangmanGame.get_game_state form"""
+        guessed = int(self.guessed[index])
+        game_over = bool(self.game_over[index])
+        length = self.lengths[index]
+        answer = self.answers[index, :length].tobytes().decode("ascii")
+        return {
+            'display_word': self.get_display_word(index),
+            'lives': int(self.lives[index]),
+            'guessed_letters': [chr(_A + i) for i in range(26)
+                                if guessed >> i & 1],
+            'game_over': game_over,
+            'won': bool(self.won[index]),
+            'answer': answer if game_over else None
+        }
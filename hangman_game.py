@@ -5,106 +5,290 @@ This module contains the main game logic for the Hangman game,
 including word management, guess processing, and game state tracking.
 """
 
+import collections
+import functools
+import itertools
+import json
+import struct
+from alphabet import get_alphabet, normalize_entry
+
+STARTING_LIVES = 6
+
+# answer id, guessed letter mask, lives, flags
+SNAPSHOT = struct.Struct("<QQbB")
+_GAME_OVER = 1
+_WON = 2
+
+# Versions are unique across the games of a process, so a version a
+# client already holds never names the state of another or restored game
+_VERSIONS = itertools.count(1)
+
+
+@functools.lru_cache(maxsize=65536)
+def _index_answer(answer, alphabet):
+    """
+    Build the letter -> (bit, positions) index and the mask of all
+    letters of an answer; shared by every game with the same answer
+    Letters are the alphabet's, so accented characters that fold to a
+    letter share its entry. Letters outside the alphabet get bits above
+    the alphabet's own.
+    """
+    positions = {}
+    bits = {}
+    extra_bit = 1 << len(alphabet.letters)
+    for i, char in enumerate(answer):
+        match = alphabet.table.get(char)
+        if match is None:
+            if not char.isalpha():
+                continue
+            if char not in bits:
+                bits[char] = extra_bit
+                extra_bit <<= 1
+            match = (char, bits[char])
+        letter, bit = match
+        bits[letter] = bit
+        positions.setdefault(letter, []).append(i)
+
+    index = {}
+    mask = 0
+    for letter, indexes in positions.items():
+        index[letter] = (bits[letter], tuple(indexes))
+        mask |= bits[letter]
+    return index, mask
+
+
+# What a game is guessing; positions maps letter -> (bit, positions)
+_Answer = collections.namedtuple("_Answer",
+                                 ("text", "answer_id", "level", "positions"))
+_NO_ANSWER = _Answer("", None, "", {})
+
+
+@functools.lru_cache(maxsize=65536)
+def _display_word(answer, alphabet, hidden_mask):
+    """Display word with the letters of hidden_mask as underscores"""
+    # Spaces and punctuation are shown as they are
+    display = list(answer)
+    for bit, positions in _index_answer(answer, alphabet)[0].values():
+        if hidden_mask & bit:
+            for i in positions:
+                display[i] = "_"
+    return "".join(display)
+
 
 class HangmanGame:
     """Core Hangman game logic"""
 
+    __slots__ = ("alphabet", "lives", "_answer", "_guessed_mask",
+                 "_other_guesses", "_hidden_mask", "_state")
+
     def __init__(self):
-        self.lives = 6
-        self.guessed_letters = set()
-        self.answer = ""
-        self.display_word = ""
-        self.level = ""
-        self.game_over = False
-        self.won = False
-
-    def set_word(self, word, level):
-        """Set the word/phrase to guess and initialize display"""
-        self.answer = word.upper()
-        self.level = level
-        self.display_word = self._create_display_word()
-        self.game_over = False
-        self.won = False
-
-    def _create_display_word(self):
-        """Create display word with underscores for letters and spaces"""
-        display = ""
-        for char in self.answer:
-            if char == " ":
-                display += " "
-            elif char.isalpha():
-                display += "_"
-            else:
-                display += char  # For punctuation
-        return display
+        self.alphabet = get_alphabet()
+        self.lives = STARTING_LIVES
+        self._answer = _NO_ANSWER
+        self._guessed_mask = 0
+        # Guesses outside the alphabet, rare enough to keep out of the mask
+        self._other_guesses = ()
+        self._hidden_mask = 0
+        # (version, cached JSON state of that version or None); the
+        # version is renewed on every change
+        self._state = (0, None)
+
+    @property
+    def answer(self):
+        """The word or phrase to guess"""
+        return self._answer.text
+
+    @property
+    def answer_id(self):
+        """Id of the answer passed to set_word, or None"""
+        return self._answer.answer_id
+
+    @property
+    def level(self):
+        """Level of the answer"""
+        return self._answer.level
+
+    @property
+    def version(self):
+        """Number of the current state, unique within the process"""
+        return self._state[0]
+
+    @property
+    def won(self):
+        """Whether every letter is revealed with lives left"""
+        return (not self._hidden_mask and self.lives > 0
+                and bool(self._answer.positions))
+
+    @property
+    def game_over(self):
+        """Whether the game is won or out of lives"""
+        return self.lives <= 0 or (not self._hidden_mask
+                                   and bool(self._answer.positions))
+
+    @property
+    def timeouts(self):
+        """Lives lost to the timer rather than to wrong letters"""
+        return STARTING_LIVES - self.lives - len(self.wrong_letters)
+
+    @property
+    def guessed_letters(self):
+        """Letters guessed so far"""
+        return frozenset(self._sorted_guesses())
+
+    @property
+    def wrong_letters(self):
+        """Guessed letters that are not in the answer, in sorted order"""
+        positions = self._answer.positions
+        return [letter for letter in self._sorted_guesses()
+                if letter not in positions]
+
+    def _sorted_guesses(self):
+        """Guesses in alphabet order, then guesses outside the alphabet"""
+        mask = self._guessed_mask
+        bits = self.alphabet.bits
+        guesses = [letter for letter in self.alphabet.letters
+                   if mask & bits[letter]]
+        if self._other_guesses:
+            guesses += sorted(self._other_guesses)
+        return guesses
+
+    def _changed(self):
+        """Start a new version and drop the cached JSON state"""
+        self._state = (next(_VERSIONS), None)
+
+    @property
+    def display_word(self):
+        """Current display word with unrevealed letters as underscores"""
+        return _display_word(self._answer.text, self.alphabet,
+                             self._hidden_mask)
+
+    def set_word(self, word, level, answer_id=None, alphabet=None):
+        """
+        Set the word/phrase to guess and initialize display
+        Args:
+            alphabet: Alphabet of the word's language (English by
+                default), e.g. DictionaryManager.get_alphabet(level)
+        """
+        if alphabet is not None:
+            self.alphabet = alphabet
+        answer = normalize_entry(word)
+        positions, self._hidden_mask = _index_answer(answer, self.alphabet)
+        self._answer = _Answer(answer, answer_id, level, positions)
+        self._changed()
 
     def guess_letter(self, letter):
         """
         Process a letter guess
         Returns: True if correct, False if incorrect, None if already guessed
+        Raises ValueError if the guess is not a single letter.
         """
-        letter = letter.upper()
-
         # Check if already guessed
-        if letter in self.guessed_letters:
-            return None
-
-        self.guessed_letters.add(letter)
+        table = self.alphabet.table
+        match = table.get(letter)
+        if match is None:
+            letter = self.alphabet.normalize_guess(letter)
+            if letter is None:
+                raise ValueError("Guess must be a single letter")
+            match = table.get(letter)
+        if match is not None:
+            letter, bit = match
+            if self._guessed_mask & bit:
+                return None
+            self._guessed_mask |= bit
+        else:
+            if letter in self._other_guesses:
+                return None
+            self._other_guesses += (letter,)
+        self._changed()
 
         # Check if letter is in answer
-        if letter in self.answer:
-            self._update_display_word(letter)
-            self._check_win_condition()
+        entry = self._answer.positions.get(letter)
+        if entry is not None:
+            self._hidden_mask &= ~entry[0]
             return True
 
         self.lives -= 1
-        self._check_lose_condition()
         return False
 
-    def _update_display_word(self, letter):
-        """Update display word to reveal guessed letter"""
-        new_display = ""
-        for i, char in enumerate(self.answer):
-            if char == letter:
-                new_display += char
-            else:
-                new_display += self.display_word[i]
-        self.display_word = new_display
-
-    def _check_win_condition(self):
-        """Check if player has won"""
-        if "_" not in self.display_word:
-            self.won = True
-            self.game_over = True
-
-    def _check_lose_condition(self):
-        """Check if player has lost"""
-        if self.lives <= 0:
-            self.game_over = True
-            self.won = False
-
     def handle_timeout(self):
         """Handle when timer runs out"""
         self.lives -= 1
-        self._check_lose_condition()
+        self._changed()
 
     def get_game_state(self):
         """Get current game state as dictionary"""
         return {
             'display_word': self.display_word,
             'lives': self.lives,
-            'guessed_letters': sorted(list(self.guessed_letters)),
+            'guessed_letters': self._sorted_guesses(),
             'game_over': self.game_over,
             'won': self.won,
             'answer': self.answer if self.game_over else None
         }
 
+    def get_state_json(self, known_version=None):
+        """
+        Game state plus its version as UTF-8 encoded JSON bytes
+        Args:
+            known_version: version the client already has
+        Returns:
+            The encoding, cached until the game changes, or None if
+            known_version is current
+        """
+        version, encoded = self._state
+        if known_version == version:
+            return None
+        if encoded is None:
+            state = dict(self.get_game_state(), version=version)
+            encoded = json.dumps(state, ensure_ascii=False,
+                                 separators=(",", ":")).encode("utf-8")
+            self._state = (version, encoded)
+        return encoded
+
+    def snapshot(self):
+        """
+        Pack the game into a fixed-size SNAPSHOT record
+        Requires an answer_id (see set_word) and guesses from the
+        game's alphabet only.
+        """
+        if self.answer_id is None:
+            raise ValueError("Cannot snapshot a game without an answer_id")
+        if self._other_guesses:
+            raise ValueError("Snapshots only hold guesses from the "
+                             "alphabet")
+        flags = (_GAME_OVER if self.game_over else 0) | \
+            (_WON if self.won else 0)
+        return SNAPSHOT.pack(self.answer_id, self._guessed_mask,
+                             self.lives, flags)
+
+    @classmethod
+    def restore(cls, record, resolve, alphabet=None):
+        """
+        Rebuild a game from a snapshot record
+        Args:
+            record: bytes from snapshot()
+            resolve: callable mapping an answer_id to (answer, level),
+                e.g. DictionaryManager.get_entry_by_id
+            alphabet: Alphabet the game was played with (English by
+                default)
+        """
+        answer_id, guessed_mask, lives, _ = SNAPSHOT.unpack(record)
+        answer, level = resolve(answer_id)
+        game = cls()
+        game.set_word(answer, level, answer_id, alphabet)
+        game._guessed_mask = guessed_mask & \
+            ((1 << len(game.alphabet.letters)) - 1)
+        game._hidden_mask &= ~game._guessed_mask
+        # Timeouts and the outcome follow from the lives and guesses
+        game.lives = lives
+        game._changed()
+        return game
+
     def reset_game(self):
         """Reset game for new round"""
-        self.lives = 6
-        self.guessed_letters = set()
-        self.answer = ""
-        self.display_word = ""
-        self.level = ""
-        self.game_over = False
-        self.won = False
+        self.lives = STARTING_LIVES
+        self._answer = _NO_ANSWER
+        self._guessed_mask = 0
+        self._other_guesses = ()
+        self._hidden_mask = 0
+        self._changed()
@@ -0,0 +1,131 @@
+"""
+Input Reader Module
+
+This module reads console input on one long-lived thread and hands the
+lines over through a queue, so waiting for a guess with a deadline is a
+queue wait instead of a new input() thread per guess.
+"""
+
+import math
+import queue
+import sys
+import threading
+
+_EOF = object()
+
+# Script line that stands for the guess timer running out
+TIMEOUT_EVENT = "<timeout>"
+
+
+class InputReader:
+    """Reads lines from a stream on a single background thread"""
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdin
+        self._lines = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._at_eof = False
+
+    def _ensure_started(self):
+        """Start the reader thread on first use"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._read_lines, name="InputReader", daemon=True)
+                self._thread.start()
+
+    def _read_lines(self):
+        """Reader thread: forward every line until end of input"""
+        try:
+            for line in iter(self.stream.readline, ""):
+                self._lines.put(line.rstrip("\r\n"))
+        except (OSError, ValueError):
+            pass
+        self._lines.put(_EOF)
+
+    def read_line(self, timeout=None):
+        """
+        Wait for the next line of input
+        Args:
+            timeout: seconds to wait, or None to wait forever
+        Returns:
+            The line without its newline, or None if the timeout expired
+        Raises:
+            EOFError when the input is exhausted
+        """
+        if self._at_eof:
+            raise EOFError
+        self._ensure_started()
+        try:
+            line = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if line is _EOF:
+            self._at_eof = True
+            raise EOFError
+        return line
+
+    def read_timed_line(self, remaining, on_tick=None):
+        """
+        Wait for a line until a countdown runs out
+        Args:
+            remaining: callable returning the seconds left
+            on_tick: optional callable given the whole seconds left each
+                time that value changes
+        Returns:
+            The line, or None if the countdown ran out first
+        """
+        while True:
+            seconds = remaining()
+            if seconds <= 0:
+                return None
+            if on_tick is not None:
+                on_tick(math.ceil(seconds))
+            # Wake when input arrives or the whole seconds value changes
+            line = self.read_line(timeout=seconds - (math.ceil(seconds) - 1))
+            if line is not None:
+                return line
+
+    def input(self, prompt=""):
+        """Drop-in replacement for the built-in input()"""
+        if prompt:
+            print(prompt, end="", flush=True)
+        return self.read_line()
+
+
+class ScriptedInput:
+    """
+    Replays input lines from a script with no waiting; a None item or
+    a TIMEOUT_EVENT line stands for the guess timer running out
+    """
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+
+    @classmethod
+    def from_file(cls, path):
+        """Script with one input line per file line"""
+        with open(path, encoding="utf-8") as script:
+            return cls([line.rstrip("\r\n") for line in script])
+
+    def read_line(self, timeout=None):
+        """Next scripted line; None for a timeout event"""
+        del timeout  # Same signature as InputReader; nothing waits
+        line = next(self._lines, _EOF)
+        if line is _EOF:
+            raise EOFError
+        if line is None or line == TIMEOUT_EVENT:
+            return None
+        return line
+
+    def read_timed_line(self, remaining, on_tick=None):
+        """Next scripted line; timeouts happen only when scripted"""
+        del remaining, on_tick  # No clock runs while replaying
+        return self.read_line()
+
+    def input(self, prompt=""):
+        """Drop-in replacement for the built-in input()"""
+        del prompt  # Scripted sessions do not echo prompts
+        line = self.read_line()
+        return "" if line is None else line
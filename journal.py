@@ -0,0 +1,163 @@
+"""
+Game Journal Module
+
+This module records every game as a stream of fixed-size binary events
+in an append-only journal file, and replays a journal through
+HangmanGame to check that every recorded outcome is reproduced.
+
+Events are buffered in memory and written in batches: a batch is
+written when it is full or when the fsync interval has passed since
+the last write, so a slow trickle of events still reaches the file.
+The file is fsynced at most once per fsync interval and when the
+journal closes.
+"""
+
+import os
+import struct
+import time
+from hangman_game import HangmanGame
+
+# event type, game id, timestamp, value
+RECORD = struct.Struct("<BIdq")
+
+START = 1       # value: answer id
+GUESS = 2       # value: code point of the guessed letter
+TIMEOUT = 3     # value: unused
+END_WON = 4     # value: lives left
+END_LOST = 5    # value: lives left
+
+
+class GameJournal:
+    """Append-only, batched writer of game events"""
+
+    def __init__(self, path, batch_size=512, fsync_interval=1.0):
+        self.batch_size = batch_size
+        self.fsync_interval = fsync_interval
+        self._file = open(path, "ab")  # pylint: disable=consider-using-with
+        self._buffer = bytearray()
+        self._next_game_id = 0
+        self._last_fsync = self._last_write = time.monotonic()
+
+    @property
+    def path(self):
+        """Path of the journal file"""
+        return self._file.name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _append(self, event, game_id, value=0):
+        """Buffer one event, writing the batch when it is full or due"""
+        self._buffer += RECORD.pack(event, game_id, time.time(), value)
+        if (len(self._buffer) >= self.batch_size * RECORD.size or
+                time.monotonic() - self._last_write >= self.fsync_interval):
+            self.flush()
+
+    def start_game(self, answer_id):
+        """Record a new game; returns its journal game id"""
+        game_id = self._next_game_id
+        self._next_game_id += 1
+        self._append(START, game_id, answer_id)
+        return game_id
+
+    def record_guess(self, game_id, letter):
+        """Record a guessed letter"""
+        self._append(GUESS, game_id, ord(letter))
+
+    def record_timeout(self, game_id):
+        """Record a guess timeout"""
+        self._append(TIMEOUT, game_id)
+
+    def end_game(self, game_id, game):
+        """Record the outcome of a finished game"""
+        self._append(END_WON if game.won else END_LOST, game_id, game.lives)
+
+    def flush(self, sync=False):
+        """Write buffered events; fsync if asked or the interval passed"""
+        now = time.monotonic()
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._buffer = bytearray()
+        self._last_write = now
+        if sync or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+
+    def close(self):
+        """Write everything and fsync"""
+        if not self._file.closed:
+            self.flush(sync=True)
+            self._file.close()
+
+
+def read_journal(path):
+    """
+    Iterate over (event, game id, timestamp, value) records
+    A partially written record at the end of the file is ignored.
+    """
+    with open(path, "rb") as journal:
+        data = journal.read()
+    usable = len(data) - len(data) % RECORD.size
+    return RECORD.iter_unpack(memoryview(data)[:usable])
+
+
+class ReplayResult:
+    """Outcome of replaying a journal"""
+
+    def __init__(self):
+        self.games = 0
+        self.events = 0
+        self.mismatches = []
+        self.elapsed = 0.0
+
+    @property
+    def games_per_second(self):
+        """Replay throughput"""
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def format_report(self):
+        """Format the result as a short text report"""
+        return (f"Games replayed:   {self.games}\n"
+                f"Events:           {self.events}\n"
+                f"Mismatches:       {len(self.mismatches)}\n"
+                f"Games per second: {self.games_per_second:,.0f}")
+
+
+def replay_journal(path, dictionary):
+    """
+    Feed a journal back through HangmanGame as fast as possible
+    Args:
+        path: journal file
+        dictionary: DictionaryManager whose entry ids the journal uses
+    Returns:
+        ReplayResult; mismatches lists (game id, expected, replayed)
+        outcomes as (won, lives) pairs
+    """
+    result = ReplayResult()
+    games = {}
+    resolve = dictionary.get_entry_by_id
+    start_time = time.perf_counter()
+    for event, game_id, _, value in read_journal(path):
+        result.events += 1
+        if event == GUESS:
+            games[game_id].guess_letter(chr(value))
+        elif event == TIMEOUT:
+            games[game_id].handle_timeout()
+        elif event == START:
+            answer, level = resolve(value)
+            game = games[game_id] = HangmanGame()
+            game.set_word(answer, level, value,
+                          dictionary.get_alphabet(level))
+        else:
+            game = games.pop(game_id)
+            expected = (event == END_WON, value)
+            replayed = (game.won, game.lives)
+            if expected != replayed:
+                result.mismatches.append((game_id, expected, replayed))
+            result.games += 1
+    result.elapsed = time.perf_counter() - start_time
+    return result
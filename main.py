@@ -6,24 +6,50 @@ A console based Hangman game with timer functionality and TDD implementation.
 This module contains the main game controller and entry point.
 """
 
-import threading
+import argparse
+import asyncio
+import functools
+import signal
 import time
 from hangman_game import HangmanGame
 from dictionary import DictionaryManager
 from timer import GameTimer
 from game_interface import GameInterface
+from input_reader import InputReader, ScriptedInput
+from simulation import STRATEGIES, SimulationOptions, run_simulation
+from server import (HangmanServer, serve, run_load_test,
+                    format_load_report)
+from journal import GameJournal, replay_journal
+from stats import GameStats, format_stats_report
+from recorder import GameRecorder
+from tournament import TournamentOptions, run_tournament
+from decision_tree import build_decision_tree
+from game_commands import GameCommandQueue, TIMEOUT
+import metrics
 
 
 class HangmanGameController:
     """Main game controller that organizes all components"""
 
-    def __init__(self):
+    def __init__(self, input_source=None, pace_seconds=1.0,
+                 dictionary=None, renderer=None, recorder=None):
+        """
+        Args:
+            input_source: InputReader (stdin by default) or ScriptedInput
+            pace_seconds: pause after each guess; 0 for scripted runs
+            dictionary: DictionaryManager to draw words from
+            renderer: renderer for the game frame (chosen by TTY default)
+            recorder: GameRecorder for an optional journal and stats
+        """
         self.game = HangmanGame()
-        self.dictionary = DictionaryManager()
-        self.interface = GameInterface()
+        # Guesses and timer timeouts reach the game through this queue
+        self.commands = GameCommandQueue(self.game)
+        self.dictionary = dictionary or DictionaryManager()
+        self.interface = GameInterface(input_source or InputReader(),
+                                       renderer)
         self.timer = GameTimer(timeout_seconds=15)
-        self.input_received = threading.Event()
-        self.current_input = None
+        self.pace_seconds = pace_seconds
+        self.recorder = recorder or GameRecorder()
 
     def run(self):
         """Main game loop"""
@@ -51,118 +77,311 @@ class HangmanGameController:
     def start_new_game(self, level):
         """Initialize a new game with selected level"""
         # Reset game state
+        self.commands.clear()
         self.game.reset_game()
 
-        # Get random word/phrase
-        word = self.dictionary.get_random_word(level)
-        self.game.set_word(word, level)
+        # Get the next word/phrase without repeats
+        word = self.dictionary.next_word(level)
+        self.game.set_word(word, level,
+                           self.dictionary.get_entry_id(word, level),
+                           self.dictionary.get_alphabet(level))
+        self.recorder.start_game(self.game)
 
-        print(f"\nStarting new {level} level game!")
         letter_count = len([c for c in word if c.isalpha()])
-        print(f"Your word/phrase has {letter_count} letters.")
+        self.interface.display_new_game(level, letter_count)
 
     def play_game(self):
         """Main game play loop"""
+        guess_seconds = 0.0
         while not self.game.game_over:
             # Display current game state
             game_state = self.game.get_game_state()
             self.interface.display_game_state(game_state)
 
-            # Get letter guess with timer
+            # Get letter guess with timer; the timer thread only queues
+            # its timeout, so one of guess or timeout wins the turn
+            turn = self.commands.turn
+            self.timer.set_timeout_callback(
+                functools.partial(self.commands.submit_timeout, turn))
+            start_time = time.perf_counter()
             letter = self.get_timed_input()
+            guess_seconds += time.perf_counter() - start_time
 
             if letter is None:
-                # Timeout occurred
-                self.interface.display_timeout_message()
-                self.game.handle_timeout()
+                self.commands.submit_timeout(turn)
             else:
-                # Process the guess
-                result = self.game.guess_letter(letter)
-                self.interface.display_guess_result(result, letter)
+                self.commands.submit_guess(letter, turn)
+            self.apply_commands()
 
             # Small delay for better user experience
-            time.sleep(1)
+            if self.pace_seconds:
+                time.sleep(self.pace_seconds)
+
+        self.recorder.end_game(self.game, guess_seconds)
 
         # Display final game state
         final_state = self.game.get_game_state()
         self.interface.display_game_over(final_state)
 
+    def apply_commands(self):
+        """Apply queued guesses and timeouts and report each one"""
+        for kind, letter, result in self.commands.drain():
+            if kind == TIMEOUT:
+                self.interface.display_timeout_message()
+                self.recorder.record_timeout()
+            else:
+                self.recorder.record_guess(letter)
+                self.interface.display_guess_result(result, letter)
+
     def get_timed_input(self):
         """Get user input with 15-second timer"""
-        self.input_received.clear()
-        self.current_input = None
-
-        # Set up timer callbacks
-        def on_timeout():
-            self.input_received.set()
-
-        self.timer.set_timeout_callback(on_timeout)
-
-        # Start input thread
-        input_thread = threading.Thread(target=self._get_input_thread)
-        input_thread.daemon = True
-        input_thread.start()
-
-        # Start timer
         self.timer.reset()
         self.timer.start()
 
-        # Display timer countdown
-        start_time = time.time()
-        while not self.input_received.is_set():
-            elapsed = time.time() - start_time
-            remaining = max(0, 15 - elapsed)
-
-            if remaining > 0:
-                print(
-                    f"\rTime remaining: {remaining:.1f}s - "
-                    f"Enter a letter: ",
-                    end="",
-                    flush=True,
-                )
-                time.sleep(0.1)
-            else:
-                break
+        self.interface.show_letter_prompt(self.timer.timeout_seconds)
+        try:
+            line = self.interface.input_reader.read_timed_line(
+                self.timer.get_time_remaining, self.interface.display_timer)
+        except EOFError:
+            line = None
 
         # Stop timer
         self.timer.stop()
 
-        # Wait for input thread to complete
-        input_thread.join(timeout=0.5)
-
-        print()  # New line after timer display
-
-        return self.current_input
-
-    def _get_input_thread(self):
-        """Input thread function"""
-        try:
-            letter = input().strip().upper()
-
-            # Validate input
-            if len(letter) == 1 and letter.isalpha():
-                self.current_input = letter
-            else:
-                print("Invalid input! Please enter a single letter.")
-                self.current_input = None
+        if line is None:
+            print()  # End the prompt line
+            return None
+
+        # Validate input against the game's alphabet
+        letter = self.game.alphabet.normalize_guess(line.strip())
+        if letter is not None:
+            return letter
+        self.interface.display_message(
+            "Invalid input! Please enter a single letter.")
+        return None
+
+
+def compile_word_lists(output, word_files, languages=()):
+    """
+    Compile the built-in lists plus word files into one file
+    Args:
+        word_files: (level, path) pairs
+        languages: (level, language) pairs for non-English levels
+    """
+    languages = dict(languages)
+    dictionary = DictionaryManager()
+    for level, path in word_files:
+        with open(path, encoding="utf-8") as words:
+            dictionary.add_words(
+                (line.strip() for line in words if line.strip()), level,
+                languages.get(level))
+    count = dictionary.save_compiled(output)
+    print(f"Compiled {count} entries into {output}")
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Console Hangman game")
+    parser.add_argument(
+        "--script", metavar="FILE",
+        help="play with input lines from FILE ('<timeout>' for a timeout) "
+             "and no pauses")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for word selection")
+    parser.add_argument("--journal", metavar="PATH",
+                        help="append every game to this journal file")
+    parser.add_argument("--stats", metavar="PATH",
+                        help="add every game to this statistics database")
+    parser.add_argument(
+        "--metrics", metavar="PATH",
+        help="measure hot paths and write Prometheus metrics to PATH "
+             "on exit (and on SIGUSR1)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="measure hot paths and serve them at "
+                             "http://127.0.0.1:PORT/metrics")
+    commands = parser.add_subparsers(dest="command")
+
+    simulate = commands.add_parser(
+        "simulate", help="play games headlessly with a guessing strategy")
+    simulate.add_argument("--games", type=int, default=1000)
+    simulate.add_argument("--strategy", choices=sorted(STRATEGIES),
+                          default="frequency")
+    simulate.add_argument("--level", default="basic",
+                          help="level to play (any level of the dictionary)")
+    # Either position works; the global option is the default
+    simulate.add_argument("--seed", type=int, default=argparse.SUPPRESS)
+    simulate.add_argument("--dictionary", metavar="PATH",
+                          help="compiled dictionary file to use")
+
+    tournament = commands.add_parser(
+        "tournament",
+        help="sweep strategies across levels in worker processes")
+    tournament.add_argument("--games", type=int, default=10000,
+                            help="games per strategy and level")
+    tournament.add_argument("--strategies", nargs="+",
+                            choices=sorted(STRATEGIES),
+                            default=sorted(STRATEGIES))
+    tournament.add_argument("--levels", nargs="+",
+                            default=["basic", "intermediate"])
+    tournament.add_argument("--seed", type=int, default=argparse.SUPPRESS,
+                            help="seed of the word orders (default 0)")
+    tournament.add_argument("--workers", type=int, default=None)
+    tournament.add_argument("--shard-size", type=int, default=2000)
+    tournament.add_argument("--dictionary", metavar="PATH",
+                            help="compiled dictionary file to use")
+
+    replay_parser = commands.add_parser(
+        "replay", help="replay a game journal and check its outcomes")
+    replay_parser.add_argument("journal_file")
+    replay_parser.add_argument("--dictionary", metavar="PATH",
+                               help="compiled dictionary the journal used")
+
+    stats_parser = commands.add_parser(
+        "stats", help="show the leaderboard and the hardest words")
+    stats_parser.add_argument("database")
+    stats_parser.add_argument("--limit", type=int, default=10)
+
+    compile_parser = commands.add_parser(
+        "compile-dictionary",
+        help="compile the word lists into a memory-mappable file")
+    compile_parser.add_argument("output")
+    compile_parser.add_argument(
+        "--add", nargs=2, action="append", default=[],
+        metavar=("LEVEL", "FILE"),
+        help="add the words in FILE (one per line) to LEVEL")
+    compile_parser.add_argument(
+        "--language", nargs=2, action="append", default=[],
+        metavar=("LEVEL", "LANGUAGE"),
+        help="language of LEVEL's words (english, french, spanish, "
+             "german)")
+
+    tree_parser = commands.add_parser(
+        "build-tree",
+        help="precompute the best guess for every state of a level")
+    tree_parser.add_argument("output")
+    tree_parser.add_argument("--level", default="basic")
+    tree_parser.add_argument("--dictionary", metavar="PATH",
+                             help="compiled dictionary file to use")
+    tree_parser.add_argument("--workers", type=int, default=None)
+    tree_parser.add_argument(
+        "--width", type=int, default=2,
+        help="letters searched per state (1 is the greedy solver)")
+
+    serve_parser = commands.add_parser(
+        "serve", help="host games for telnet/netcat clients")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8023)
+    serve_parser.add_argument("--level", default="basic",
+                              help="level of new games")
+    serve_parser.add_argument("--dictionary", metavar="PATH",
+                              help="compiled dictionary file to use")
+
+    load_parser = commands.add_parser(
+        "loadtest", help="measure server latency with many local clients")
+    load_parser.add_argument("--clients", type=int, default=1000)
+    load_parser.add_argument("--games", type=int, default=1)
+    load_parser.add_argument("--host", default="127.0.0.1")
+    load_parser.add_argument(
+        "--port", type=int, default=None,
+        help="server to test (default: start one in this process)")
+
+    return parser.parse_args(argv)
+
+
+def load_dictionary(path, level):
+    """Open a dictionary, raising ValueError if it has no such level"""
+    dictionary = DictionaryManager(path)
+    levels = dictionary.get_levels()
+    if level not in levels:
+        dictionary.close()
+        raise ValueError(f"Invalid level: {level}. "
+                         f"Use one of: {', '.join(levels)}")
+    return dictionary
+
+
+def run_command(args, journal=None, stats=None):
+    """Run the command selected on the command line"""
+    if args.command == "simulate":
+        options = SimulationOptions(
+            load_dictionary(args.dictionary, args.level), journal, stats)
+        result = run_simulation(args.games, args.strategy, args.level,
+                                args.seed, options)
+        print(result.format_report())
+    elif args.command == "tournament":
+        options = TournamentOptions(args.seed or 0, args.dictionary,
+                                    args.workers, args.shard_size)
+        result = run_tournament(args.strategies, args.levels, args.games,
+                                options)
+        print(result.format_report())
+    elif args.command == "stats":
+        with GameStats(args.database) as database:
+            print(format_stats_report(database, args.limit))
+    elif args.command == "replay":
+        result = replay_journal(args.journal_file,
+                                DictionaryManager(args.dictionary))
+        print(result.format_report())
+    elif args.command == "compile-dictionary":
+        compile_word_lists(args.output, args.add, args.language)
+    elif args.command == "build-tree":
+        report = build_decision_tree(load_dictionary(args.dictionary,
+                                                     args.level),
+                                     args.level, args.output, args.workers,
+                                     args.width)
+        print(report.format_report())
+    elif args.command == "serve":
+        serve(HangmanServer(load_dictionary(args.dictionary, args.level),
+                            args.level, journal=journal, stats=stats),
+              args.host, args.port)
+    elif args.command == "loadtest":
+        report = asyncio.run(run_load_test(
+            args.clients, args.games, args.host, args.port))
+        print(format_load_report(report))
+    else:
+        dictionary = DictionaryManager()
+        if args.seed is not None:
+            dictionary.seed_selection(args.seed)
+        recorder = GameRecorder(journal, stats)
+        if args.script:
+            controller = HangmanGameController(
+                ScriptedInput.from_file(args.script), pace_seconds=0,
+                dictionary=dictionary, recorder=recorder)
+        else:
+            controller = HangmanGameController(dictionary=dictionary,
+                                               recorder=recorder)
+        controller.run()
 
-        except (EOFError, KeyboardInterrupt):
-            self.current_input = None
 
-        finally:
-            self.input_received.set()
+def start_metrics(path=None, port=None):
+    """Turn on instrumentation and its file and/or HTTP export"""
+    metrics.enable()
+    if port is not None:
+        metrics.REGISTRY.serve(port)
+    if path is not None and hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1,
+                      lambda *_: metrics.REGISTRY.write(path))
 
 
-def main():
+def main(argv=None):
     """Entry point of the application"""
+    args = parse_args(argv)
+    if args.metrics or args.metrics_port is not None:
+        start_metrics(args.metrics, args.metrics_port)
+    journal = GameJournal(args.journal) if args.journal else None
+    stats = GameStats(args.stats) if args.stats else None
     try:
-        controller = HangmanGameController()
-        controller.run()
-    except KeyboardInterrupt:
+        run_command(args, journal, stats)
+    except (KeyboardInterrupt, EOFError):
         print("\n\nGame interrupted. Goodbye!")
     except (ValueError, RuntimeError) as exc:
         print(f"\nA game error occurred: {exc}")
         print("Please restart the game.")
+    finally:
+        if journal is not None:
+            journal.close()
+        if stats is not None:
+            stats.close()
+        if args.metrics:
+            metrics.REGISTRY.write(args.metrics)
 
 
 if __name__ == "__main__":
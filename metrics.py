@@ -0,0 +1,283 @@
+"""
+Metrics Module
+
+This module measures the game's hot paths with fixed-bucket latency
+histograms and counters, and exports them in the Prometheus text
+format to a file or over a small HTTP endpoint.
+
+Measured:
+    hangman_guess_seconds         HangmanGame.guess_letter
+    hangman_word_draw_seconds     DictionaryManager next_word and
+                                  get_random_word
+    hangman_timer_drift_seconds   time a timer fires after its deadline
+    hangman_render_seconds        GameInterface frame and timer drawing
+    hangman_timeouts_total        HangmanGame.handle_timeout calls
+
+Metrics are off until enable() is called. enable() wraps the measured
+methods in place and disable() puts the originals back, so a disabled
+build runs exactly the uninstrumented code.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from hangman_game import HangmanGame
+from dictionary import DictionaryManager
+from timer import TimerScheduler
+from game_interface import GameInterface
+
+FAST_BUCKETS = (1e-7, 2.5e-7, 5e-7, 1e-6, 2.5e-6, 5e-6, 1e-5, 1e-4, 1e-3)
+SLOW_BUCKETS = (1e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 0.01, 0.025, 0.05, 0.1,
+                0.25, 0.5, 1.0)
+
+
+def _format_labels(labels, extra=""):
+    """Prometheus label set, e.g. {method="draw"}"""
+    pairs = [f'{name}="{value}"' for name, value in labels]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter"""
+
+    __slots__ = ("name", "labels", "value")
+
+    def __init__(self, name, labels=()):
+        self.name = name
+        self.labels = labels
+        self.value = 0
+
+    def inc(self, amount=1):
+        """Add to the counter"""
+        self.value += amount
+
+    def samples(self):
+        """Prometheus sample lines"""
+        return [f"{self.name}{_format_labels(self.labels)} {self.value}"]
+
+
+class Histogram:
+    """
+    Histogram over fixed bucket bounds
+    Observing only increments preallocated counts; updates from
+    different threads are not locked, so a count can rarely be lost.
+    """
+
+    __slots__ = ("name", "labels", "bounds", "counts", "sum", "count")
+
+    def __init__(self, name, bounds, labels=()):
+        self.name = name
+        self.labels = labels
+        self.bounds = tuple(bounds)
+        # One count per bound plus the +Inf bucket
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Record one value"""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        """Prometheus sample lines with cumulative buckets"""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + ("+Inf",), self.counts):
+            cumulative += count
+            labels = _format_labels(self.labels, f'le="{bound}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labels)
+        lines.append(f"{self.name}_sum{labels} {self.sum}")
+        lines.append(f"{self.name}_count{labels} {self.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics and their Prometheus text rendering"""
+
+    def __init__(self):
+        # name -> (type, help, [metric per label set])
+        self._families = {}
+
+    def _add(self, kind, metric, help_text):
+        """Register a metric under its family"""
+        family = self._families.setdefault(metric.name,
+                                           (kind, help_text, []))
+        family[2].append(metric)
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        """Create and register a Counter"""
+        return self._add("counter", Counter(name, labels), help_text)
+
+    def histogram(self, name, help_text, bounds, labels=()):
+        """Create and register a Histogram"""
+        return self._add("histogram", Histogram(name, bounds, labels),
+                         help_text)
+
+    def reset(self):
+        """Zero every metric"""
+        for _, _, metrics in self._families.values():
+            for metric in metrics:
+                if isinstance(metric, Counter):
+                    metric.value = 0
+                else:
+                    metric.counts = [0] * len(metric.counts)
+                    metric.sum = 0.0
+                    metric.count = 0
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for name, (kind, help_text, metrics) in self._families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for metric in metrics:
+                lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write the current metrics to a file"""
+        with open(path, "w", encoding="utf-8") as output:
+            output.write(self.render())
+
+    def serve(self, port, host="127.0.0.1"):
+        """
+        Serve the metrics at http://host:port/metrics from a daemon thread
+        Returns:
+            The HTTP server; call shutdown() on it to stop serving
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Answers GET /metrics"""
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Send the metrics text"""
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type",
+                                 "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                """Keep request logs off the game screen"""
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="Metrics",
+                         daemon=True).start()
+        return server
+
+
+REGISTRY = MetricsRegistry()
+
+GUESS_SECONDS = REGISTRY.histogram(
+    "hangman_guess_seconds", "Time spent in HangmanGame.guess_letter",
+    FAST_BUCKETS)
+WORD_DRAW_SECONDS = REGISTRY.histogram(
+    "hangman_word_draw_seconds",
+    "Time spent drawing words (DictionaryManager next_word and "
+    "get_random_word)", FAST_BUCKETS)
+TIMER_DRIFT_SECONDS = REGISTRY.histogram(
+    "hangman_timer_drift_seconds",
+    "How late timer callbacks fire after their deadline", SLOW_BUCKETS)
+RENDER_SECONDS = {
+    method: REGISTRY.histogram(
+        "hangman_render_seconds", "Time spent drawing the game screen",
+        SLOW_BUCKETS, (("method", method),))
+    for method in ("display_game_state", "display_timer")
+}
+TIMEOUTS = REGISTRY.counter("hangman_timeouts_total",
+                            "Guesses lost to the timer")
+
+
+def _timed(function, histogram):
+    """Wrap function to observe its duration in histogram"""
+    clock = time.perf_counter
+    observe = histogram.observe
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start_time = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            observe(clock() - start_time)
+    return wrapper
+
+
+def _counted(function, counter):
+    """Wrap function to count its calls"""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        counter.value += 1
+        return function(*args, **kwargs)
+    return wrapper
+
+
+def _drift_measured(pop_due):
+    """Wrap TimerScheduler._pop_due to observe how late calls fire"""
+    observe = TIMER_DRIFT_SECONDS.observe
+
+    @functools.wraps(pop_due)
+    def wrapper(self, *args):
+        call = pop_due(self, *args)
+        if call is not None:
+            observe(self.clock() - call.deadline)
+        return call
+    return wrapper
+
+
+# (class, method name, wrapper factory)
+_INSTRUMENTS = [
+    (HangmanGame, "guess_letter",
+     functools.partial(_timed, histogram=GUESS_SECONDS)),
+    (HangmanGame, "handle_timeout",
+     functools.partial(_counted, counter=TIMEOUTS)),
+    (DictionaryManager, "get_random_word",
+     functools.partial(_timed, histogram=WORD_DRAW_SECONDS)),
+    (DictionaryManager, "next_word",
+     functools.partial(_timed, histogram=WORD_DRAW_SECONDS)),
+    (TimerScheduler, "_pop_due", _drift_measured),
+] + [
+    (GameInterface, method, functools.partial(_timed, histogram=histogram))
+    for method, histogram in RENDER_SECONDS.items()
+]
+
+_originals = {}
+_lock = threading.Lock()
+
+
+def is_enabled():
+    """Whether the hot paths are currently instrumented"""
+    return bool(_originals)
+
+
+def enable():
+    """Start measuring: wrap every instrumented method"""
+    with _lock:
+        if _originals:
+            return
+        for cls, name, wrap in _INSTRUMENTS:
+            original = cls.__dict__[name]
+            _originals[(cls, name)] = original
+            setattr(cls, name, wrap(original))
+
+
+def disable():
+    """Stop measuring: restore the original methods"""
+    with _lock:
+        for (cls, name), original in _originals.items():
+            setattr(cls, name, original)
+        _originals.clear()
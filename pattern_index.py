@@ -0,0 +1,172 @@
+"""
+Pattern Index Module
+
+This module answers Hangman pattern queries such as "P_TH_N" with the
+letters A, E and Z excluded: every entry whose revealed letters sit
+exactly at the shown positions, whose hidden positions hold none of the
+revealed or excluded letters, and whose spaces and punctuation match
+the pattern the way HangmanGame shows them.
+
+Entries are grouped by shape (length plus the layout of non-letters).
+Each group keeps a matrix of letter bits, one row per entry and one
+column per position, and a positional inverted index: per column, the
+rows sorted by their letter at that position, so the rows with a given
+letter there are one contiguous slice. A query starts from the shortest
+such slice and filters it with vectorized operations.
+"""
+
+import numpy as np
+from difficulty import code_matrix, letter_mask
+from solver import word_shape
+
+
+class _ShapeGroup:
+    """Entries of one shape and their letter bits by position"""
+
+    __slots__ = ("rows", "bits", "_order", "_sorted")
+
+    def __init__(self, rows, bits):
+        self.rows = rows
+        self.bits = bits
+        # Per column: group rows ordered by letter bit, and those bits
+        self._order = np.argsort(bits, axis=0, kind="stable")
+        self._sorted = np.take_along_axis(bits, self._order, axis=0)
+
+    def posting(self, position, bit):
+        """Rows (group-local) holding the letter bit at position"""
+        values = self._sorted[:, position]
+        bit = np.uint64(bit)
+        start = values.searchsorted(bit, "left")
+        end = values.searchsorted(bit, "right")
+        return self._order[start:end, position]
+
+    def match(self, revealed, hidden, forbidden):
+        """
+        Entry indices of the rows that fit a parsed pattern
+        Args:
+            revealed: (position, letter bit) of every shown letter
+            hidden: positions of the hidden letters
+            forbidden: bits of the letters hidden positions cannot hold
+        """
+        if revealed:
+            postings = [self.posting(position, bit)
+                        for position, bit in revealed]
+            selected = min(postings, key=len)
+            for position, bit in revealed:
+                if len(selected):
+                    selected = selected[self.bits[selected, position]
+                                        == np.uint64(bit)]
+        else:
+            selected = np.arange(len(self.rows))
+        if hidden and forbidden and len(selected):
+            hidden_bits = np.bitwise_or.reduce(
+                self.bits[np.ix_(selected, hidden)], axis=1)
+            selected = selected[(hidden_bits & np.uint64(forbidden)) == 0]
+        return np.sort(self.rows[selected])
+
+
+class PatternIndex:
+    """Shape groups of one level, for match queries"""
+
+    def __init__(self, entries, alphabet):
+        """
+        Args:
+            entries: the level's entries (normalized, upper case)
+            alphabet: Alphabet of the level, which maps characters
+                (including accented forms) to letter bits
+        """
+        self.entries = entries
+        self.alphabet = alphabet
+        # Letters outside the alphabet get bits above the alphabet's
+        self._extra_bits = {}
+        self._groups = {}
+        self._build(list(entries))
+
+    def _bit_of(self, char):
+        """Letter bit of a character (0 for characters that are not)"""
+        match = self.alphabet.table.get(char)
+        if match is not None:
+            return match[1]
+        if not char.isalpha():
+            return 0
+        bit = self._extra_bits.get(char)
+        if bit is None:
+            shift = len(self.alphabet.letters) + len(self._extra_bits)
+            # Past 64 letters, the rarest share the last bit
+            bit = self._extra_bits[char] = 1 << min(shift, 63)
+        return bit
+
+    def _build(self, entries):
+        """Group entries by shape and fill each group's bit matrix"""
+        lengths = np.fromiter(map(len, entries), dtype=np.int64,
+                              count=len(entries))
+        by_length = np.argsort(lengths, kind="stable")
+        sizes, starts = np.unique(lengths[by_length], return_index=True)
+        for size, start, end in zip(sizes, starts,
+                                    list(starts[1:]) + [len(entries)]):
+            rows = by_length[start:end]
+            codes = code_matrix([entries[row] for row in rows])
+            if size and codes.shape[1] == size:
+                self._add_length(entries, rows, codes)
+
+    def _letter_bits(self, codes, is_letter):
+        """Letter bit of every cell of a code matrix (0 if not a letter)"""
+        present = np.unique(codes)
+        lookup = np.zeros(int(present[-1]) + 1, dtype=np.uint64)
+        for code in present:
+            lookup[code] = self._bit_of(chr(code))
+        return np.where(is_letter, lookup[codes], np.uint64(0))
+
+    def _add_length(self, entries, rows, codes):
+        """Add the shape groups of the entries of one length"""
+        is_letter = letter_mask(codes)
+        bits = self._letter_bits(codes, is_letter)
+
+        # Split the length bucket by the layout of its non-letters
+        layout = np.where(is_letter, 0, codes).astype(np.uint64)
+        layout_hash = np.zeros(len(rows), dtype=np.uint64)
+        for column in layout.T:
+            layout_hash = layout_hash * np.uint64(0x100000001B3) + column
+        _, shape_of = np.unique(layout_hash, return_inverse=True)
+        by_shape = np.argsort(shape_of, kind="stable")
+        bounds = np.flatnonzero(np.diff(shape_of[by_shape])) + 1
+        for members in np.split(by_shape, bounds):
+            shape = word_shape(entries[rows[members[0]]])
+            self._groups[shape] = _ShapeGroup(rows[members], bits[members])
+
+    def _letter_bit(self, char):
+        """Bit of a typed letter, or None if no entry uses it"""
+        letter = self.alphabet.normalize_guess(char)
+        if letter is None:
+            return None
+        match = self.alphabet.table.get(letter)
+        if match is not None:
+            return match[1]
+        return self._extra_bits.get(letter)
+
+    def match_rows(self, pattern, excluded=""):
+        """Entry indices matching a pattern (see DictionaryManager.match)"""
+        group = self._groups.get(word_shape(pattern))
+        if group is None:
+            return np.zeros(0, dtype=np.int64)
+
+        revealed = []
+        forbidden = 0
+        for position, char in enumerate(pattern):
+            if char == "_" or not char.isalpha():
+                continue
+            bit = self._letter_bit(char)
+            if bit is None:
+                return np.zeros(0, dtype=np.int64)
+            revealed.append((position, bit))
+            forbidden |= bit
+        for char in excluded:
+            forbidden |= self._letter_bit(char) or 0
+        hidden = [position for position, char in enumerate(pattern)
+                  if char == "_"]
+        return group.match(revealed, hidden, forbidden)
+
+    def match(self, pattern, excluded=""):
+        """Entries matching a pattern, in level order"""
+        entries = self.entries
+        return [entries[row] for row in self.match_rows(pattern, excluded)]
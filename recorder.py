@@ -0,0 +1,45 @@
+"""
+Game Recorder Module
+
+This module sends the events of one player's games to an optional
+GameJournal and an optional GameStats, so game loops record a game
+with one call per event whether either store is configured or not.
+"""
+
+
+class GameRecorder:
+    """Records one game at a time for a player"""
+
+    def __init__(self, journal=None, stats=None, player="local"):
+        """
+        Args:
+            journal: optional GameJournal that records every game
+            stats: optional GameStats that aggregates every game
+            player: name the games count towards in stats
+        """
+        self.journal = journal
+        self.stats = stats
+        self.player = player
+        self._game_id = None
+
+    def start_game(self, game):
+        """Record the start of a game that has its answer set"""
+        if self.journal is not None:
+            self._game_id = self.journal.start_game(game.answer_id)
+
+    def record_guess(self, letter):
+        """Record a guess of the current game"""
+        if self.journal is not None:
+            self.journal.record_guess(self._game_id, letter)
+
+    def record_timeout(self):
+        """Record a timeout of the current game"""
+        if self.journal is not None:
+            self.journal.record_timeout(self._game_id)
+
+    def end_game(self, game, seconds=0.0):
+        """Record the outcome of the current game"""
+        if self.journal is not None:
+            self.journal.end_game(self._game_id, game)
+        if self.stats is not None:
+            self.stats.record_game(game, self.player, seconds)
@@ -0,0 +1,163 @@
+"""
+Renderer Module
+
+This module draws the in-game frame. On a terminal it keeps the last
+frame and rewrites only the regions that changed with ANSI cursor
+moves, flushing once per update; elsewhere it falls back to plain
+printed text without any cursor control.
+"""
+
+import sys
+
+RULE = "=" * 50
+
+_CLEAR_SCREEN = "\x1b[2J\x1b[H"
+_CLEAR_LINE = "\x1b[K"
+_SAVE_CURSOR = "\x1b7"
+_RESTORE_CURSOR = "\x1b8"
+
+
+def format_regions(game_state, timer_time=None):
+    """Text of each frame region for a game state"""
+    lives = game_state['lives']
+    guessed = ', '.join(game_state['guessed_letters'])
+    return {
+        'display_word': f"Word/Phrase: {game_state['display_word']}",
+        'lives': f"Lives remaining: {'❤️ ' * lives}({lives})",
+        'guessed': f"Guessed letters: {guessed}" if guessed else "",
+        'timer': (f"Time remaining: {timer_time:.1f} seconds"
+                  if timer_time is not None else ""),
+    }
+
+
+class PlainRenderer:
+    """Prints each frame as plain text; used when output is not a TTY"""
+
+    def __init__(self, stream=None):
+        self._stream = stream
+
+    @property
+    def stream(self):
+        """Output stream (sys.stdout unless one was given)"""
+        return self._stream or sys.stdout
+
+    def _write(self, text):
+        """Write text and flush once"""
+        self.stream.write(text)
+        self.stream.flush()
+
+    def clear_screen(self):
+        """Separate screens with a blank line"""
+        self._write("\n")
+
+    def start_frame(self):
+        """Begin a new game frame"""
+
+    def end_frame(self):
+        """Leave the game frame so normal output can follow"""
+
+    def draw_state(self, game_state, timer_time=None):
+        """Draw the game state"""
+        regions = format_regions(game_state, timer_time)
+        lines = ["", RULE, regions['display_word'], regions['lives']]
+        lines += [regions[name] for name in ('guessed', 'timer')
+                  if regions[name]]
+        lines.append(RULE)
+        self._write("\n".join(lines) + "\n")
+
+    def show_message(self, text):
+        """Show a one-line message"""
+        self._write(text + "\n")
+
+    def show_prompt(self, text):
+        """Show an input prompt, leaving the cursor after it"""
+        self._write(text)
+
+    def update_timer(self, seconds):
+        """Countdowns are not redrawn in plain text"""
+
+
+class TerminalRenderer(PlainRenderer):
+    """Redraws only changed regions of a fixed frame using ANSI codes"""
+
+    ROWS = {
+        'display_word': 2,
+        'lives': 3,
+        'guessed': 4,
+        'timer': 5,
+        'message': 7,
+        'prompt': 8,
+    }
+    _BOTTOM_RULE_ROW = 6
+    _BELOW_FRAME_ROW = 9
+
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._last = None
+
+    @staticmethod
+    def _line(row, text):
+        """Move to a row, write text and clear the rest of the line"""
+        return f"\x1b[{row};1H{text}{_CLEAR_LINE}"
+
+    def clear_screen(self):
+        self._last = None
+        self._write(_CLEAR_SCREEN)
+
+    def start_frame(self):
+        self._last = {}
+        self._write(_CLEAR_SCREEN + self._line(1, RULE) +
+                    self._line(self._BOTTOM_RULE_ROW, RULE))
+
+    def end_frame(self):
+        if self._last is not None:
+            self._last = None
+            self._write(f"\x1b[{self._BELOW_FRAME_ROW};1H")
+
+    def _update(self, regions, keep_cursor=False):
+        """Write the regions whose text changed since the last frame"""
+        if self._last is None:
+            self.start_frame()
+        parts = [self._line(self.ROWS[name], text)
+                 for name, text in regions.items()
+                 if self._last.get(name) != text]
+        if not parts:
+            return
+        self._last.update(regions)
+        if keep_cursor:
+            parts = [_SAVE_CURSOR] + parts + [_RESTORE_CURSOR]
+        self._write("".join(parts))
+
+    def draw_state(self, game_state, timer_time=None):
+        regions = format_regions(game_state, timer_time)
+        if timer_time is None:
+            del regions['timer']
+        self._update(regions)
+
+    def show_message(self, text):
+        if self._last is None:
+            super().show_message(text)
+            return
+        self._update({'message': text})
+
+    def show_prompt(self, text):
+        if self._last is None:
+            super().show_prompt(text)
+            return
+        # Always redraw: the typed answer is echoed on the prompt row
+        self._last.pop('prompt', None)
+        self._update({'prompt': text})
+
+    def update_timer(self, seconds):
+        if self._last is not None:
+            self._update({'timer': f"Time remaining: {seconds}s"},
+                         keep_cursor=True)
+
+
+def create_renderer(stream=None):
+    """TerminalRenderer for a TTY, PlainRenderer otherwise"""
+    target = stream or sys.stdout
+    isatty = getattr(target, "isatty", None)
+    if isatty is not None and isatty():
+        return TerminalRenderer(stream)
+    return PlainRenderer(stream)
@@ -0,0 +1,251 @@
+"""
+Game Server Module
+
+This module hosts many independent Hangman sessions in one process with
+asyncio, using a line protocol that telnet or netcat can speak, and
+includes a local load generator that measures response latency.
+
+Protocol (one command or reply per line):
+    client: a single letter      guess it
+    client: NEW [level]          start a new game
+    client: QUIT                 close the connection
+    server: HELLO hangman
+    server: GAME <level> <letter count>
+    server: STATE <lives> <guessed letters or -> <display word>
+    server: CORRECT <letter> | WRONG <letter> | REPEAT <letter>
+    server: INVALID <reason> | TIMEOUT
+    server: WON <answer> | LOST <answer>
+    server: BYE
+"""
+
+import asyncio
+import time
+from hangman_game import HangmanGame
+from dictionary import DictionaryManager
+from recorder import GameRecorder
+from simulation import ENGLISH_FREQUENCY_ORDER
+
+_RESULT_REPLIES = {True: "CORRECT", False: "WRONG", None: "REPEAT"}
+
+
+class HangmanServer:
+    """asyncio server with one HangmanGame per connection"""
+
+    def __init__(self, dictionary=None, level="basic", timeout_seconds=15,
+                 journal=None, stats=None):
+        self.dictionary = dictionary or DictionaryManager()
+        self.journal = journal
+        self.stats = stats
+        self.level = level
+        self.timeout_seconds = timeout_seconds
+        self.sessions = 0
+        self.games_played = 0
+
+    async def start(self, host="127.0.0.1", port=8023):
+        """Start listening; returns the asyncio.Server"""
+        return await asyncio.start_server(self.handle_client, host, port,
+                                          backlog=4096)
+
+    @staticmethod
+    def _format_state(game):
+        """STATE line for a game"""
+        state = game.get_game_state()
+        guessed = "".join(state['guessed_letters']) or "-"
+        return f"STATE {state['lives']} {guessed} {state['display_word']}\n"
+
+    async def handle_client(self, reader, writer):
+        """Serve one connection until it quits or disconnects"""
+        self.sessions += 1
+        try:
+            writer.write(b"HELLO hangman\n")
+            peer = writer.get_extra_info("peername")
+            recorder = GameRecorder(self.journal, self.stats,
+                                    str(peer[0]) if peer else "remote")
+            level = self.level
+            while level is not None:
+                level = await self._play(reader, writer, level, recorder)
+            writer.write(b"BYE\n")
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    def _new_game(self, level):
+        """HangmanGame with the next answer of a level"""
+        game = HangmanGame()
+        word = self.dictionary.next_word(level)
+        game.set_word(word, level, self.dictionary.get_entry_id(word, level),
+                      self.dictionary.get_alphabet(level))
+        return game
+
+    async def _play(self, reader, writer, level, recorder):
+        """
+        Play one game on a connection
+        Args:
+            recorder: GameRecorder of the connection's player
+        Returns:
+            Level of the next game, or None to close the connection
+        """
+        game = self._new_game(level)
+        recorder.start_game(game)
+        writer.write(f"GAME {level} "
+                     f"{sum(char.isalpha() for char in game.answer)}\n"
+                     .encode())
+        writer.write(self._format_state(game).encode())
+        await writer.drain()
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.timeout_seconds
+        while not game.game_over:
+            try:
+                line = await asyncio.wait_for(reader.readline(),
+                                              deadline - loop.time())
+            except asyncio.TimeoutError:
+                game.handle_timeout()
+                recorder.record_timeout()
+                writer.write(b"TIMEOUT\n")
+                deadline = loop.time() + self.timeout_seconds
+            else:
+                if not line:
+                    return None
+                text = line.decode("utf-8", "replace").strip()
+                command = text.upper()
+                if command == "QUIT":
+                    return None
+                if command.startswith("NEW"):
+                    return self._parse_level(command) or level
+                letter = game.alphabet.normalize_guess(text)
+                if letter is None:
+                    writer.write(b"INVALID enter a single letter\n")
+                    await writer.drain()
+                    continue
+                result = game.guess_letter(letter)
+                recorder.record_guess(letter)
+                writer.write(f"{_RESULT_REPLIES[result]} {letter}\n"
+                             .encode())
+                deadline = loop.time() + self.timeout_seconds
+
+            if not game.game_over:
+                writer.write(self._format_state(game).encode())
+            await writer.drain()
+
+        self.games_played += 1
+        recorder.end_game(game, loop.time() - started)
+        writer.write(f"{'WON' if game.won else 'LOST'} {game.answer}\n"
+                     .encode())
+        await writer.drain()
+        return await self._wait_for_next_game(reader, level)
+
+    async def _wait_for_next_game(self, reader, level):
+        """After a game, wait for NEW or QUIT"""
+        while True:
+            line = await reader.readline()
+            command = line.decode("utf-8", "replace").strip().upper()
+            if not line or command == "QUIT":
+                return None
+            if command.startswith("NEW"):
+                return self._parse_level(command) or level
+
+    def _parse_level(self, command):
+        """Level named in a NEW command, if it is a known level"""
+        parts = command.lower().split()
+        if len(parts) > 1 and parts[1] in self.dictionary.get_levels():
+            return parts[1]
+        return None
+
+
+def serve(server, host="127.0.0.1", port=8023):
+    """Run a HangmanServer until interrupted"""
+    async def run():
+        listener = await server.start(host, port)
+        print(f"Hangman server listening on {host}:{port}")
+        async with listener:
+            await listener.serve_forever()
+
+    asyncio.run(run())
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1,
+                max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def _load_client(host, port, games, latencies):
+    """Play games over one connection, recording reply latencies"""
+    reader, writer = await asyncio.open_connection(host, port)
+    await reader.readline()  # HELLO
+    for game_number in range(games):
+        if game_number:
+            writer.write(b"NEW\n")
+        await reader.readline()  # GAME
+        await reader.readline()  # STATE
+        for letter in ENGLISH_FREQUENCY_ORDER:
+            start_time = time.perf_counter()
+            writer.write(f"{letter}\n".encode())
+            await reader.readline()  # CORRECT / WRONG
+            reply = await reader.readline()  # STATE, WON or LOST
+            latencies.append(time.perf_counter() - start_time)
+            if not reply.startswith(b"STATE"):
+                break
+    writer.write(b"QUIT\n")
+    await reader.readline()  # BYE
+    writer.close()
+
+
+async def run_load_test(clients, games=1, host=None, port=None,
+                        level="basic"):
+    """
+    Connect many clients at once and measure per-guess latency
+    Args:
+        clients: number of concurrent connections
+        games: games played per connection
+        host, port: server to test; an in-process server when omitted
+    Returns:
+        Dictionary with request count, elapsed time and latency
+        percentiles in seconds
+    """
+    listener = None
+    if port is None:
+        listener = await HangmanServer(level=level).start("127.0.0.1", 0)
+        host, port = listener.sockets[0].getsockname()[:2]
+
+    latencies = []
+    start_time = time.perf_counter()
+    try:
+        await asyncio.gather(*(_load_client(host, port, games, latencies)
+                               for _ in range(clients)))
+    finally:
+        if listener is not None:
+            listener.close()
+            await listener.wait_closed()
+    elapsed = time.perf_counter() - start_time
+
+    latencies.sort()
+    return {
+        'clients': clients,
+        'requests': len(latencies),
+        'elapsed': elapsed,
+        'p50': percentile(latencies, 0.50),
+        'p90': percentile(latencies, 0.90),
+        'p99': percentile(latencies, 0.99),
+        'max': latencies[-1] if latencies else 0.0,
+    }
+
+
+def format_load_report(report):
+    """Format a run_load_test result as text"""
+    rate = report['requests'] / report['elapsed'] if report['elapsed'] else 0
+    return (f"Clients:          {report['clients']}\n"
+            f"Guesses:          {report['requests']}\n"
+            f"Guesses per sec:  {rate:,.0f}\n"
+            f"Latency p50:      {report['p50'] * 1000:.2f} ms\n"
+            f"Latency p90:      {report['p90'] * 1000:.2f} ms\n"
+            f"Latency p99:      {report['p99'] * 1000:.2f} ms\n"
+            f"Latency max:      {report['max'] * 1000:.2f} ms")
@@ -0,0 +1,250 @@
+"""
+Simulation Module
+
+This module plays Hangman games headlessly with pluggable guessing
+strategies and reports win rate, wrong guesses and throughput.
+"""
+
+import random
+import time
+from collections import Counter
+from hangman_game import HangmanGame, STARTING_LIVES
+from dictionary import DictionaryManager
+from solver import Solver
+from recorder import GameRecorder
+
+# English letter frequency order, used when a level has no entries
+ENGLISH_FREQUENCY_ORDER = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+
+
+class GuessStrategy:
+    """Base class for headless guessing strategies"""
+
+    name = ""
+
+    def __init__(self, dictionary, level, rng):
+        self.dictionary = dictionary
+        self.level = level
+        self.rng = rng
+
+    def start_game(self, display_word):
+        """Called once before the first guess of every game"""
+
+    def next_guess(self, game_state):
+        """Return the next letter to guess for the given game state"""
+        raise NotImplementedError
+
+
+class RandomStrategy(GuessStrategy):
+    """Guesses the level's alphabet in a random order"""
+
+    name = "random"
+
+    def __init__(self, dictionary, level, rng):
+        super().__init__(dictionary, level, rng)
+        self._order = list(dictionary.get_alphabet(level).letters)
+        self._next = 0
+
+    def start_game(self, display_word):
+        self.rng.shuffle(self._order)
+        self._next = 0
+
+    def next_guess(self, game_state):
+        letter = self._order[self._next]
+        self._next += 1
+        return letter
+
+
+class FrequencyStrategy(GuessStrategy):
+    """Guesses letters by how often they appear in the level's entries"""
+
+    name = "frequency"
+
+    def __init__(self, dictionary, level, rng):
+        super().__init__(dictionary, level, rng)
+        alphabet = dictionary.get_alphabet(level)
+        table = alphabet.table
+        # Count accented characters as the letter they fold to
+        counts = Counter()
+        for entry in dictionary.get_entries(level):
+            counts.update(table[char][0] if char in table else char
+                          for char in entry if char.isalpha())
+        ranked = [letter for letter, _ in counts.most_common()]
+        unseen = [letter for letter in ENGLISH_FREQUENCY_ORDER
+                  if letter in alphabet.bits] + list(alphabet.letters)
+        self._order = list(dict.fromkeys(ranked + unseen))
+        self._next = 0
+
+    def start_game(self, display_word):
+        self._next = 0
+
+    def next_guess(self, game_state):
+        guessed = game_state['guessed_letters']
+        while self._order[self._next] in guessed:
+            self._next += 1
+        letter = self._order[self._next]
+        self._next += 1
+        return letter
+
+
+class SolverStrategy(FrequencyStrategy):
+    """Guesses the letter with the highest expected information gain"""
+
+    name = "solver"
+
+    def __init__(self, dictionary, level, rng):
+        super().__init__(dictionary, level, rng)
+        self._solver = Solver(dictionary, level)
+
+    def start_game(self, display_word):
+        super().start_game(display_word)
+        self._solver.reset(display_word)
+
+    def next_guess(self, game_state):
+        letter = self._solver.best_letter(game_state)
+        if letter is not None:
+            return letter
+        # Answer is not in the dictionary: fall back to letter frequency
+        return super().next_guess(game_state)
+
+
+STRATEGIES = {
+    RandomStrategy.name: RandomStrategy,
+    FrequencyStrategy.name: FrequencyStrategy,
+    SolverStrategy.name: SolverStrategy,
+}
+
+
+def get_strategy(name, dictionary, level, rng):
+    """Create a registered strategy by name"""
+    try:
+        strategy_class = STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy: {name}. "
+                         f"Use one of: {', '.join(sorted(STRATEGIES))}"
+                         ) from None
+    return strategy_class(dictionary, level, rng)
+
+
+class SimulationResult:
+    """Aggregated outcome of a batch of simulated games"""
+
+    def __init__(self, games=0, wins=0, wrong_guesses=0, elapsed=0.0):
+        self.games = games
+        self.wins = wins
+        self.wrong_guesses = wrong_guesses
+        self.elapsed = elapsed
+
+    @property
+    def win_rate(self):
+        """Fraction of games won"""
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def average_wrong_guesses(self):
+        """Average number of wrong guesses per game"""
+        return self.wrong_guesses / self.games if self.games else 0.0
+
+    @property
+    def games_per_second(self):
+        """Simulation throughput"""
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def format_report(self):
+        """Format the result as a short text report"""
+        return (f"Games played:          {self.games}\n"
+                f"Win rate:              {self.win_rate:.2%}\n"
+                f"Average wrong guesses: {self.average_wrong_guesses:.3f}\n"
+                f"Games per second:      {self.games_per_second:,.0f}")
+
+
+def play_headless_game(game, strategy, recorder=None):
+    """
+    Play a game that has its answer set to completion
+    Args:
+        game: HangmanGame, e.g. fresh from reset_game and set_word
+        strategy: GuessStrategy that makes every guess
+        recorder: optional GameRecorder that records the game
+    """
+    start_time = time.perf_counter()
+    strategy.start_game(game.display_word)
+    if recorder is not None:
+        recorder.start_game(game)
+
+    while not game.game_over:
+        letter = strategy.next_guess(game.get_game_state())
+        if game.guess_letter(letter) is None:
+            raise RuntimeError(f"Strategy '{strategy.name}' "
+                               f"repeated guess '{letter}'")
+        if recorder is not None:
+            recorder.record_guess(letter)
+
+    if recorder is not None:
+        recorder.end_game(game, time.perf_counter() - start_time)
+    return game
+
+
+class SimulationOptions:
+    """Where run_simulation draws its words and records its games"""
+
+    def __init__(self, dictionary=None, journal=None, stats=None):
+        """
+        Args:
+            dictionary: DictionaryManager to use (a new one by default)
+            journal: optional GameJournal that records every game
+            stats: optional GameStats; games count towards the strategy
+                name
+        """
+        self.dictionary = dictionary
+        self.journal = journal
+        self.stats = stats
+
+    def get_dictionary(self):
+        """The dictionary, creating the built-in one if none was given"""
+        if self.dictionary is None:
+            self.dictionary = DictionaryManager()
+        return self.dictionary
+
+    def create_recorder(self, player):
+        """GameRecorder for the journal and stats, or None without them"""
+        if self.journal is None and self.stats is None:
+            return None
+        return GameRecorder(self.journal, self.stats, player)
+
+
+def run_simulation(games, strategy="frequency", level="basic", seed=None,
+                   options=None):
+    """
+    Play games headlessly and aggregate the results
+    Args:
+        games: number of games to play
+        strategy: registered strategy name
+        level: dictionary level to draw words from
+        seed: optional seed for word selection and the strategy
+        options: optional SimulationOptions
+    Returns:
+        SimulationResult
+    """
+    options = options or SimulationOptions()
+    dictionary = options.get_dictionary()
+    if seed is not None:
+        dictionary.seed_selection(seed)
+    player = get_strategy(strategy, dictionary, level, random.Random(seed))
+    recorder = options.create_recorder(strategy)
+    game = HangmanGame()
+    alphabet = dictionary.get_alphabet(level)
+    result = SimulationResult()
+
+    start_time = time.perf_counter()
+    for _ in range(games):
+        word = dictionary.next_word(level)
+        game.reset_game()
+        game.set_word(word, level,
+                      dictionary.get_entry_id(word, level)
+                      if recorder is not None else None, alphabet)
+        play_headless_game(game, player, recorder)
+        result.games += 1
+        result.wins += game.won
+        result.wrong_guesses += STARTING_LIVES - game.lives
+    result.elapsed = time.perf_counter() - start_time
+    return result
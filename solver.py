@@ -0,0 +1,140 @@
+"""
+Solver Module
+
+This module narrows a level's words or phrases to the candidates that
+are consistent with a game state and ranks the next letter to guess by
+expected information gain.
+"""
+
+import math
+from collections import defaultdict
+
+
+def word_shape(entry):
+    """Display word of an entry before any guess (letters hidden)"""
+    return "".join("_" if char.isalpha() else char for char in entry)
+
+
+def _rank_outcomes(outcomes, total):
+    """
+    Rank letters by the information gain of their outcomes
+    Args:
+        outcomes: letter -> positions mask -> number of candidates
+        total: number of candidates
+    Returns:
+        List of (letter, gain in bits), best first
+    """
+    ranks = []
+    for letter, counts in outcomes.items():
+        present = sum(counts.values())
+        absent = total - present
+        sizes = list(counts.values()) + ([absent] if absent else [])
+        gain = -sum(size / total * math.log2(size / total)
+                    for size in sizes)
+        ranks.append((letter, gain, present))
+    # Equal gains go to the letter most likely to be in the answer
+    ranks.sort(key=lambda rank: (-rank[1], -rank[2], rank[0]))
+    return [(letter, gain) for letter, gain, _ in ranks]
+
+
+class Solver:
+    """Candidate-filtering solver for one level of a DictionaryManager"""
+
+    def __init__(self, dictionary, level):
+        self._table = dictionary.get_alphabet(level).table
+        self._by_shape = defaultdict(list)
+        # entry -> entry spelled in alphabet letters, where they differ
+        # (e.g. CAFÉ -> CAFE in French)
+        self._folded = {}
+        for entry in dictionary.get_entries(level):
+            self._by_shape[word_shape(entry)].append(entry)
+            folded = self._fold(entry)
+            if folded != entry:
+                self._folded[entry] = folded
+        self._opening_ranks = {}
+        self.candidates = []
+        self._shape = None
+        self._seen = set()
+
+    def _fold(self, text):
+        """Text with every character replaced by its alphabet letter"""
+        table = self._table
+        return "".join(table[char][0] if char in table else char
+                       for char in text)
+
+    def reset(self, display_word):
+        """Start a new game with the given initial display word"""
+        self._shape = word_shape(display_word)
+        self.candidates = self._by_shape.get(self._shape, [])
+        self._seen = set()
+
+    def update(self, game_state):
+        """
+        Narrow the candidates with guesses made since the last update
+        Args:
+            game_state: dictionary from HangmanGame.get_game_state()
+        Returns:
+            Remaining candidate list
+        """
+        display_word = game_state['display_word']
+        if self._shape is None or word_shape(display_word) != self._shape:
+            self.reset(display_word)
+
+        for letter in game_state['guessed_letters']:
+            if letter in self._seen:
+                continue
+            self._seen.add(letter)
+            positions = [i for i, char in enumerate(self._fold(display_word))
+                         if char == letter]
+            self.candidates = self._filter(self.candidates, letter, positions)
+        return self.candidates
+
+    def _filter(self, candidates, letter, positions):
+        """Keep candidates with the letter exactly at the given positions"""
+        folded = self._folded
+        if not positions:
+            return [word for word in candidates
+                    if letter not in folded.get(word, word)]
+        count = len(positions)
+        kept = []
+        for word in candidates:
+            spelled = folded.get(word, word)
+            if spelled.count(letter) == count and \
+                    all(spelled[i] == letter for i in positions):
+                kept.append(word)
+        return kept
+
+    def rank_letters(self, game_state=None):
+        """
+        Rank unguessed letters by expected information gain
+        Returns:
+            List of (letter, gain in bits), best first
+        """
+        if game_state is not None:
+            self.update(game_state)
+
+        opening = not self._seen
+        if opening and self._shape in self._opening_ranks:
+            return self._opening_ranks[self._shape]
+
+        ranks = _rank_outcomes(self._outcomes(), len(self.candidates))
+        if opening:
+            self._opening_ranks[self._shape] = ranks
+        return ranks
+
+    def _outcomes(self):
+        """Unguessed letter -> positions mask -> number of candidates"""
+        outcomes = defaultdict(lambda: defaultdict(int))
+        for word in self.candidates:
+            masks = {}
+            for i, char in enumerate(self._folded.get(word, word)):
+                if char.isalpha() and char not in self._seen:
+                    masks[char] = masks.get(char, 0) | 1 << i
+            for letter, mask in masks.items():
+                outcomes[letter][mask] += 1
+        return outcomes
+
+    def best_letter(self, game_state=None):
+        """Best next letter, or None when no candidate is left"""
+        ranks = self.rank_letters(game_state)
+        return ranks[0][0] if ranks else None
@@ -0,0 +1,193 @@
+"""
+Game Statistics Module
+
+This module keeps per-word and per-player statistics (win rate, wrong
+guesses, time per guess, timeout rate) as running aggregates in memory
+and adds them to a local SQLite database in batched transactions.
+
+Only the aggregate tables are stored, so leaderboard and hardest-word
+queries read one row per player or word instead of one row per game.
+"""
+
+import sqlite3
+from alphabet import normalize_entry
+
+_COLUMNS = ("games", "wins", "wrong_guesses", "timeouts", "turns",
+            "seconds")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS word_stats (
+    level TEXT NOT NULL,
+    word TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    wrong_guesses INTEGER NOT NULL,
+    timeouts INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (level, word)
+);
+CREATE TABLE IF NOT EXISTS player_stats (
+    player TEXT PRIMARY KEY,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    wrong_guesses INTEGER NOT NULL,
+    timeouts INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS word_difficulty
+    ON word_stats (CAST(wins AS REAL) / games);
+CREATE INDEX IF NOT EXISTS player_ranking
+    ON player_stats (CAST(wins AS REAL) / games);
+"""
+
+_ADD = ", ".join(f"{column} = {column} + excluded.{column}"
+                 for column in _COLUMNS)
+
+_UPSERT_WORD = (
+    "INSERT INTO word_stats (level, word, games, wins, wrong_guesses, "
+    "timeouts, turns, seconds) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+    f"ON CONFLICT (level, word) DO UPDATE SET {_ADD}")
+
+_UPSERT_PLAYER = (
+    "INSERT INTO player_stats (player, games, wins, wrong_guesses, "
+    "timeouts, turns, seconds) VALUES (?, ?, ?, ?, ?, ?, ?) "
+    f"ON CONFLICT (player) DO UPDATE SET {_ADD}")
+
+
+def _summarize(row):
+    """Turn one aggregate row into a statistics dictionary"""
+    name, games, wins, wrong_guesses, timeouts, turns, seconds = row
+    return {
+        'name': name,
+        'games': games,
+        'win_rate': wins / games,
+        'average_wrong_guesses': wrong_guesses / games,
+        'seconds_per_guess': seconds / turns if turns else 0.0,
+        'timeout_rate': timeouts / turns if turns else 0.0,
+    }
+
+
+class GameStats:
+    """Running game aggregates backed by a SQLite database"""
+
+    def __init__(self, path, batch_size=1000):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a throwaway one)
+            batch_size: finished games to buffer before a flush
+        """
+        self.batch_size = batch_size
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+        # key -> [games, wins, wrong guesses, timeouts, turns, seconds]
+        self._words = {}
+        self._players = {}
+        self._pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record_game(self, game, player="local", seconds=0.0):
+        """
+        Add a finished game to the running aggregates
+        Args:
+            game: finished HangmanGame
+            player: name the game counts towards
+            seconds: time the player spent on their guesses
+        """
+        # Matched through the game's alphabet, so E is right in CAFÉ
+        wrong = len(game.wrong_letters)
+        timeouts = game.timeouts
+        values = (1, int(game.won), wrong, timeouts,
+                  len(game.guessed_letters) + timeouts, seconds)
+        for totals, key in ((self._words, (game.level, game.answer)),
+                            (self._players, player)):
+            current = totals.get(key)
+            if current is None:
+                totals[key] = list(values)
+            else:
+                for i, value in enumerate(values):
+                    current[i] += value
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Add the buffered aggregates to the database in one transaction"""
+        if not self._pending:
+            return
+        with self._connection:
+            self._connection.executemany(
+                _UPSERT_WORD, [(*key, *totals)
+                               for key, totals in self._words.items()])
+            self._connection.executemany(
+                _UPSERT_PLAYER, [(key, *totals)
+                                 for key, totals in self._players.items()])
+        self._words = {}
+        self._players = {}
+        self._pending = 0
+
+    def get_player_stats(self, player):
+        """Statistics of one player, or None if they have no games"""
+        self.flush()
+        row = self._connection.execute(
+            "SELECT player, games, wins, wrong_guesses, timeouts, turns, "
+            "seconds FROM player_stats WHERE player = ?", (player,)
+        ).fetchone()
+        return _summarize(row) if row else None
+
+    def get_word_stats(self, word, level):
+        """Statistics of one word, or None if it has not been played"""
+        self.flush()
+        row = self._connection.execute(
+            "SELECT word, games, wins, wrong_guesses, timeouts, turns, "
+            "seconds FROM word_stats WHERE level = ? AND word = ?",
+            (level, normalize_entry(word))).fetchone()
+        return _summarize(row) if row else None
+
+    def leaderboard(self, limit=10, min_games=1):
+        """Players with the highest win rates"""
+        self.flush()
+        rows = self._connection.execute(
+            "SELECT player, games, wins, wrong_guesses, timeouts, turns, "
+            "seconds FROM player_stats WHERE games >= ? "
+            "ORDER BY CAST(wins AS REAL) / games DESC, games DESC "
+            "LIMIT ?", (min_games, limit))
+        return [_summarize(row) for row in rows]
+
+    def hardest_words(self, level=None, limit=10, min_games=1):
+        """Words with the lowest win rates, optionally in one level"""
+        self.flush()
+        rows = self._connection.execute(
+            "SELECT word, games, wins, wrong_guesses, timeouts, turns, "
+            "seconds FROM word_stats WHERE games >= ? "
+            "AND (? IS NULL OR level = ?) "
+            "ORDER BY CAST(wins AS REAL) / games, "
+            "CAST(wrong_guesses AS REAL) / games DESC LIMIT ?",
+            (min_games, level, level, limit))
+        return [_summarize(row) for row in rows]
+
+    def close(self):
+        """Flush the aggregates and close the database"""
+        if self._connection is not None:
+            self.flush()
+            self._connection.close()
+            self._connection = None
+
+
+def format_stats_report(stats, limit=10):
+    """Format the leaderboard and hardest words as text"""
+    lines = ["Leaderboard:"]
+    for row in stats.leaderboard(limit):
+        lines.append(f"  {row['name']:<20} {row['win_rate']:7.1%} "
+                     f"of {row['games']} games")
+    lines.append("Hardest words:")
+    for row in stats.hardest_words(limit=limit):
+        lines.append(f"  {row['name']:<30} {row['win_rate']:7.1%} won, "
+                     f"{row['average_wrong_guesses']:.2f} wrong guesses")
+    return "\n".join(lines)
@@ -5,13 +5,68 @@ This module contains comprehensive unit tests for all components
 of the Hangman game using Test-Driven Development principles.
 """
 
+# One test module for the whole game, as the project has always kept it
+# pylint: disable=too-many-lines
+
+import asyncio
+import contextlib
+import io
+import os
+import random
+import sqlite3
+import tempfile
+import time
 import unittest
+import urllib.request
 from unittest.mock import patch
 import threading
-from hangman_game import HangmanGame
-from dictionary import DictionaryManager
-from timer import GameTimer
+from hangman_game import HangmanGame, SNAPSHOT
+from dictionary import DictionaryManager, publish_shared
+from timer import GameTimer, TimerScheduler, VirtualClock
 from game_interface import GameInterface
+from hangman_batch import (HangmanBatch, ALREADY_GUESSED, CORRECT,
+                           INACTIVE)
+from simulation import (GuessStrategy, STRATEGIES, SimulationOptions,
+                        get_strategy, play_headless_game, run_simulation)
+from solver import Solver
+from server import HangmanServer, run_load_test
+from input_reader import InputReader, ScriptedInput, TIMEOUT_EVENT
+from main import HangmanGameController, load_dictionary, parse_args
+from game_commands import GameCommandQueue
+import game_commands
+from stats import GameStats
+from recorder import GameRecorder
+from tournament import TournamentOptions, run_tournament, play_shard
+from decision_tree import DecisionTree, build_decision_tree
+from compiled_dictionary import DIFFICULTY_MAGIC
+import metrics
+import difficulty
+from difficulty import DifficultyFeatures, DifficultyIndex
+from journal import (GameJournal, read_journal, replay_journal, RECORD,
+                     TIMEOUT, END_WON, END_LOST)
+from renderer import PlainRenderer, TerminalRenderer, create_renderer
+
+
+def _temp_path(test, suffix):
+    """Path of a temporary file that is removed after the test"""
+    handle, path = tempfile.mkstemp(suffix=suffix)
+    os.close(handle)
+    test.addCleanup(os.remove, path)
+    return path
+
+
+def _compile(test, dictionary):
+    """Compile a dictionary to a temporary file; returns its path"""
+    path = _temp_path(test, ".dict")
+    dictionary.save_compiled(path)
+    return path
+
+
+def _open_compiled(test, dictionary):
+    """Compile a dictionary and open the compiled file"""
+    compiled = DictionaryManager(_compile(test, dictionary))
+    test.addCleanup(compiled.close)
+    return compiled
 
 
 class TestHangmanGame(unittest.TestCase):
@@ -94,6 +149,208 @@ class TestHangmanGame(unittest.TestCase):
         self.game.handle_timeout()
         self.assertEqual(self.game.lives, initial_lives - 1)
 
+    def test_guess_reveals_all_positions_in_phrase(self):
+        """Test a guess reveals every position of the letter"""
+        self.game.set_word("HELLO WORLD", "intermediate")
+        self.assertTrue(self.game.guess_letter("l"))
+        self.assertEqual(self.game.display_word, "__LL_ ___L_")
+        self.game.guess_letter("O")
+        self.assertEqual(self.game.display_word, "__LLO _O_L_")
+
+    def test_win_condition_with_punctuation(self):
+        """Test punctuation is shown and not required to win"""
+        self.game.set_word("C-3PO", "basic")
+        self.assertEqual(self.game.display_word, "_-3__")
+        for letter in "CPO":
+            self.game.guess_letter(letter)
+        self.assertTrue(self.game.won)
+        self.assertEqual(self.game.display_word, "C-3PO")
+
+    def test_non_letter_guesses_are_rejected(self):
+        """Test empty, digit and multi-letter guesses cost no life"""
+        self.game.set_word("C-3PO", "basic")
+        for guess in ("", "3", "-", "CP"):
+            with self.assertRaises(ValueError):
+                self.game.guess_letter(guess)
+        self.assertEqual(self.game.lives, 6)
+        self.assertFalse(self.game.guessed_letters)
+        self.assertFalse(self.game.guess_letter("Ω"))
+        self.assertEqual(self.game.lives, 5)
+
+    def test_get_game_state(self):
+        """Test game state dictionary contents"""
+        self.game.set_word("CAT", "basic")
+        self.game.guess_letter("T")
+        self.game.guess_letter("B")
+        self.assertEqual(self.game.get_game_state(), {
+            'display_word': '__T',
+            'lives': 5,
+            'guessed_letters': ['B', 'T'],
+            'game_over': False,
+            'won': False,
+            'answer': None
+        })
+
+    def test_state_json_is_cached_per_version(self):
+        """Test the encoded state is rebuilt only after the game changes"""
+        self.game.set_word("CAT", "basic")
+        state = self.game.get_game_state()
+        encoded = self.game.get_state_json()
+        version = self.game.version
+        self.assertIs(self.game.get_state_json(), encoded)
+        self.assertTrue(self.game.guess_letter("A"))
+        # A repeated guess changes nothing
+        self.assertIsNone(self.game.guess_letter("A"))
+        guessed = self.game.version
+        self.assertNotEqual(guessed, version)
+        self.assertEqual(self.game.version, guessed)
+        self.game.handle_timeout()
+        self.assertNotIn(self.game.version, (version, guessed))
+        new_state = self.game.get_game_state()
+        self.assertIsNot(self.game.get_state_json(), encoded)
+        self.assertEqual(state['guessed_letters'], [])
+        self.assertEqual(new_state['lives'], 5)
+
+    def test_guesses_are_kept_sorted(self):
+        """Test guessed letters stay in alphabet order as they arrive"""
+        self.game.set_word("PYTHON", "basic")
+        for letter in "ZOAN":
+            self.game.guess_letter(letter)
+        self.assertEqual(self.game.get_game_state()['guessed_letters'],
+                         ["A", "N", "O", "Z"])
+
+    def test_state_json(self):
+        """Test the JSON form carries the version and can be skipped"""
+        self.game.set_word("CAT", "basic")
+        self.game.guess_letter("T")
+        encoded = self.game.get_state_json()
+        self.assertIs(self.game.get_state_json(), encoded)
+        self.assertEqual(encoded, (
+            '{"display_word":"__T","lives":6,"guessed_letters":["T"],'
+            '"game_over":false,"won":false,"answer":null,'
+            f'"version":{self.game.version}}}').encode())
+        self.assertIsNone(self.game.get_state_json(self.game.version))
+        known = self.game.version
+        self.game.guess_letter("C")
+        self.assertIn(b'"C_T"', self.game.get_state_json(known))
+
+    def test_restored_game_never_reuses_a_version(self):
+        """Test a version held for one state never matches another"""
+        dictionary = DictionaryManager()
+        self.game.set_word("LOOP", "basic",
+                           dictionary.get_entry_id("LOOP", "basic"))
+        self.game.guess_letter("L")
+        record = self.game.snapshot()
+        held = self.game.version
+        self.game.guess_letter("O")
+        held_after = self.game.version
+        restored = HangmanGame.restore(record, dictionary.get_entry_by_id)
+        restored.guess_letter("P")
+        for version in (held, held_after):
+            self.assertIsNotNone(restored.get_state_json(version))
+
+
+class TestGameSnapshot(unittest.TestCase):
+    """Test cases for compact game state snapshots"""
+
+    def setUp(self):
+        self.dictionary = DictionaryManager()
+        self.game = HangmanGame()
+        answer_id = self.dictionary.get_entry_id("hello world",
+                                                 "intermediate")
+        self.game.set_word("HELLO WORLD", "intermediate", answer_id)
+
+    def test_game_has_no_instance_dict(self):
+        """Test game state lives in __slots__"""
+        self.assertFalse(hasattr(self.game, "__dict__"))
+
+    def test_snapshot_round_trip(self):
+        """Test a restored game continues exactly where it stopped"""
+        for letter in "LOZ":
+            self.game.guess_letter(letter)
+        self.game.handle_timeout()
+        record = self.game.snapshot()
+        self.assertEqual(len(record), SNAPSHOT.size)
+
+        restored = HangmanGame.restore(record,
+                                       self.dictionary.get_entry_by_id)
+        self.assertEqual(restored.get_game_state(),
+                         self.game.get_game_state())
+        self.assertEqual(restored.level, "intermediate")
+        self.assertEqual(restored.timeouts, 1)
+        self.assertIsNone(restored.guess_letter("L"))
+        for letter in "HEWRD":
+            restored.guess_letter(letter)
+        self.assertTrue(restored.won)
+
+    def test_snapshot_requires_answer_id(self):
+        """Test games without an answer id cannot be snapshotted"""
+        game = HangmanGame()
+        game.set_word("PYTHON", "basic")
+        with self.assertRaises(ValueError):
+            game.snapshot()
+
+    def test_entry_ids_round_trip(self):
+        """Test entry ids resolve back to their entry and level"""
+        entry_id = self.dictionary.get_entry_id("Python", "basic")
+        self.assertEqual(self.dictionary.get_entry_by_id(entry_id),
+                         ("PYTHON", "basic"))
+        with self.assertRaises(ValueError):
+            self.dictionary.get_entry_id("PYTHONS", "basic")
+
+
+class TestHangmanBatch(unittest.TestCase):
+    """Test cases for HangmanBatch class"""
+
+    def test_batch_matches_single_games(self):
+        """Test batch games follow the same rules as HangmanGame"""
+        answers = ["PYTHON", "HELLO WORLD", "CAT", "C-3PO"]
+        guesses = ["OLTAXYZ", "LLOWQHE", "XYZQWRA", "CPPOAB"]
+        games = []
+        for answer in answers:
+            game = HangmanGame()
+            game.set_word(answer, "basic")
+            games.append(game)
+        batch = HangmanBatch(answers)
+
+        for step in range(max(len(g) for g in guesses)):
+            letters = [g[step] if step < len(g) else "" for g in guesses]
+            results = batch.guess(letters)
+            for i, letter in enumerate(letters):
+                if not letter or games[i].game_over:
+                    self.assertEqual(results[i], INACTIVE)
+                    continue
+                expected = games[i].guess_letter(letter)
+                if expected is None:
+                    self.assertEqual(results[i], ALREADY_GUESSED)
+                else:
+                    self.assertEqual(bool(results[i]), expected)
+
+        for i, game in enumerate(games):
+            self.assertEqual(batch.get_game_state(i), game.get_game_state())
+
+    def test_batch_timeout(self):
+        """Test timeouts deduct lives and end games at zero"""
+        batch = HangmanBatch(["CAT", "DOG"], lives=1)
+        batch.handle_timeout(mask=[True, False])
+        self.assertEqual(list(batch.lives), [0, 1])
+        self.assertEqual(list(batch.game_over), [True, False])
+
+    def test_batch_rejects_non_letters(self):
+        """Test guesses outside A-Z raise ValueError"""
+        batch = HangmanBatch(["CAT"])
+        with self.assertRaises(ValueError):
+            batch.guess(["1"])
+
+    def test_batch_rejects_multiple_letters(self):
+        """Test a multi-letter guess is rejected, not cut to one letter"""
+        batch = HangmanBatch(["CAT", "DOG"])
+        with self.assertRaises(ValueError):
+            batch.guess(["AB", "D"])
+        with self.assertRaises(ValueError):
+            batch.guess([b"C", b"XY"])
+        self.assertEqual(list(batch.guess(["A", ""])), [CORRECT, INACTIVE])
+
 
 class TestDictionaryManager(unittest.TestCase):
     """Test cases for DictionaryManager class"""
@@ -119,12 +376,66 @@ class TestDictionaryManager(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.dict_manager.get_random_word("invalid")
 
+    def test_add_words_deduplicates(self):
+        """Test bulk add skips duplicates and creates new levels"""
+        added = self.dict_manager.add_words(
+            ["apple", "APPLE", "banana", "python"], "fruit")
+        self.assertEqual(added, 3)
+        self.assertEqual(self.dict_manager.get_word_count("fruit"), 3)
+        self.assertEqual(self.dict_manager.add_words(["Apple"], "fruit"), 0)
+        self.assertTrue(self.dict_manager.contains("banana", "fruit"))
+        self.assertFalse(self.dict_manager.contains("banana", "basic"))
+        self.assertIn("fruit", self.dict_manager.get_levels())
+
+    def test_random_word_by_length_and_word_count(self):
+        """Test random picks and counts filtered by size"""
+        word = self.dict_manager.get_random_word("basic", length=4)
+        self.assertEqual(len(word), 4)
+        phrase = self.dict_manager.get_random_word("intermediate",
+                                                   word_count=3)
+        self.assertEqual(len(phrase.split()), 3)
+        self.dict_manager.add_word("ZEBRA CROSSING SIGN", "intermediate")
+        self.assertIn("ZEBRA CROSSING SIGN", self.dict_manager.get_entries(
+            "intermediate", length=19, word_count=3))
+        self.assertEqual(
+            self.dict_manager.get_word_count("basic", length=99), 0)
+        with self.assertRaises(ValueError):
+            self.dict_manager.get_random_word("basic", length=99)
+
+    def test_next_word_does_not_repeat(self):
+        """Test next_word draws every entry once before repeating"""
+        count = self.dict_manager.get_word_count("basic")
+        self.dict_manager.seed_selection(42)
+        drawn = [self.dict_manager.next_word("basic") for _ in range(count)]
+        self.assertEqual(sorted(drawn), sorted(self.dict_manager.words))
+
+    def test_next_word_is_reproducible_and_resumable(self):
+        """Test seeded selection repeats and continues from saved state"""
+        self.dict_manager.seed_selection(7)
+        first = [self.dict_manager.next_word("intermediate")
+                 for _ in range(10)]
+        state = self.dict_manager.selection.get_state()
+        rest = [self.dict_manager.next_word("intermediate")
+                for _ in range(5)]
+
+        other = DictionaryManager()
+        other.seed_selection(7)
+        self.assertEqual([other.next_word("intermediate")
+                          for _ in range(10)], first)
+        resumed = DictionaryManager()
+        resumed.selection.set_state(state)
+        self.assertEqual([resumed.next_word("intermediate")
+                          for _ in range(5)], rest)
+
 
 class TestGameTimer(unittest.TestCase):
     """Test cases for GameTimer class"""
 
     def setUp(self):
-        self.timer = GameTimer(timeout_seconds=1)  # Short timeout for testing
+        self.clock = VirtualClock()
+        # Short timeout for testing
+        self.timer = GameTimer(timeout_seconds=1,
+                               scheduler=self.clock.scheduler)
 
     def test_timer_initialization(self):
         """Test timer initializes correctly"""
@@ -149,10 +460,64 @@ class TestGameTimer(unittest.TestCase):
         self.timer.timeout_callback = timeout_callback
         self.timer.start()
 
-        # Wait for timeout
-        callback_called.wait(timeout=2)
+        self.clock.advance(0.999)
+        self.assertFalse(callback_called.is_set())
+        self.assertAlmostEqual(self.timer.time_remaining, 0.001)
+        self.clock.advance(0.001)
         self.assertTrue(callback_called.is_set())
         self.assertTrue(self.timer.timed_out)
+        self.assertEqual(self.timer.time_remaining, 0)
+
+    def test_pause_and_resume_keep_remaining_time(self):
+        """Test a paused timer neither counts down nor fires"""
+        fired = []
+        self.timer.set_timeout_callback(lambda: fired.append(self.clock()))
+        self.timer.start()
+        self.clock.advance(0.25)
+        self.timer.pause()
+        self.assertTrue(self.timer.is_paused)
+        self.clock.advance(5)
+        self.assertEqual(fired, [])
+        self.assertEqual(self.timer.time_remaining, 0.75)
+        self.timer.resume()
+        self.clock.advance(0.75)
+        self.assertEqual(fired, [6])
+        self.assertFalse(self.timer.is_paused)
+
+    def test_reset_cancels_pending_timeout(self):
+        """Test a reset timer does not fire its old deadline"""
+        fired = threading.Event()
+        self.timer.set_timeout_callback(fired.set)
+        self.timer.start()
+        self.timer.reset()
+        self.clock.advance(2)
+        self.assertFalse(fired.is_set())
+        self.assertFalse(self.timer.timed_out)
+        self.assertEqual(self.clock.scheduler.pending(), 0)
+
+    def test_shared_scheduler_fires_in_deadline_order(self):
+        """Test many timers share one scheduler and fire once each"""
+        fired = []
+        timers = []
+        for delay in (0.09, 0.03, 0.06):
+            timer = GameTimer(timeout_seconds=delay,
+                              scheduler=self.clock.scheduler)
+            timer.set_timeout_callback(
+                lambda delay=delay: fired.append((delay, self.clock())))
+            timer.start()
+            timers.append(timer)
+        self.clock.advance(1)
+        self.assertEqual(fired, [(0.03, 0.03), (0.06, 0.06), (0.09, 0.09)])
+        self.assertTrue(all(timer.timed_out for timer in timers))
+
+    def test_background_thread_fires_on_time(self):
+        """Test the real-time scheduler thread fires a short timer"""
+        fired = threading.Event()
+        timer = GameTimer(timeout_seconds=0.01, scheduler=TimerScheduler())
+        timer.set_timeout_callback(fired.set)
+        timer.start()
+        self.assertTrue(fired.wait(2))
+        self.assertTrue(timer.timed_out)
 
 
 class TestGameInterface(unittest.TestCase):
@@ -186,5 +551,1171 @@ class TestGameInterface(unittest.TestCase):
         self.assertEqual(letter, 'A')
 
 
+class TestInputReader(unittest.TestCase):
+    """Test cases for InputReader class"""
+
+    def test_reads_lines_then_eof(self):
+        """Test lines arrive in order and end of input raises EOFError"""
+        reader = InputReader(io.StringIO("a\nbc\n"))
+        self.assertEqual(reader.read_line(timeout=1), "a")
+        self.assertEqual(reader.read_line(timeout=1), "bc")
+        with self.assertRaises(EOFError):
+            reader.read_line(timeout=1)
+        with self.assertRaises(EOFError):
+            reader.read_line(timeout=1)
+
+    def test_timeout_returns_none_without_new_threads(self):
+        """Test repeated timed waits reuse the single reader thread"""
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(read_fd) as stream, os.fdopen(write_fd, "w") as pipe:
+            reader = InputReader(stream)
+            self.assertIsNone(reader.read_line(timeout=0.01))
+            threads = threading.active_count()
+            for _ in range(5):
+                self.assertIsNone(reader.read_line(timeout=0.01))
+            self.assertEqual(threading.active_count(), threads)
+            pipe.write("x\n")
+            pipe.flush()
+            self.assertEqual(reader.read_line(timeout=1), "x")
+
+    def test_interface_reads_through_reader(self):
+        """Test GameInterface prompts use the shared reader"""
+        interface = GameInterface(InputReader(io.StringIO("2\n")))
+        with patch('builtins.print'):
+            self.assertEqual(interface.get_level_selection(), "intermediate")
+
+
+class TestRenderer(unittest.TestCase):
+    """Test cases for terminal and plain renderers"""
+
+    STATE = {'display_word': 'P_____', 'lives': 6, 'guessed_letters': ['P'],
+             'game_over': False, 'won': False, 'answer': None}
+
+    def setUp(self):
+        self.output = io.StringIO()
+        self.renderer = TerminalRenderer(self.output)
+
+    def take_output(self):
+        """Return and clear what was written so far"""
+        text = self.output.getvalue()
+        self.output.seek(0)
+        self.output.truncate()
+        return text
+
+    def test_only_changed_regions_are_redrawn(self):
+        """Test a second frame rewrites just the changed region"""
+        self.renderer.draw_state(self.STATE)
+        self.assertIn("Word/Phrase: P_____", self.take_output())
+
+        state = dict(self.STATE, lives=5, guessed_letters=['P', 'Z'])
+        self.renderer.draw_state(state)
+        update = self.take_output()
+        self.assertNotIn("Word/Phrase", update)
+        self.assertIn("\x1b[3;1H", update)
+        self.assertIn("Guessed letters: P, Z", update)
+
+        self.renderer.draw_state(state)
+        self.assertEqual(self.take_output(), "")
+
+    def test_timer_redrawn_only_when_value_changes(self):
+        """Test the countdown writes once per shown value"""
+        self.renderer.start_frame()
+        self.take_output()
+        self.renderer.update_timer(15)
+        self.assertIn("Time remaining: 15s", self.take_output())
+        self.renderer.update_timer(15)
+        self.assertEqual(self.take_output(), "")
+
+    def test_plain_renderer_for_non_tty(self):
+        """Test plain output without escape codes when not a TTY"""
+        renderer = create_renderer(self.output)
+        self.assertIsInstance(renderer, PlainRenderer)
+        self.assertNotIsInstance(renderer, TerminalRenderer)
+        renderer.draw_state(self.STATE)
+        renderer.update_timer(10)
+        self.assertNotIn("\x1b", self.output.getvalue())
+        self.assertIn("Word/Phrase: P_____", self.output.getvalue())
+
+    @patch('os.system')
+    def test_clear_screen_does_not_spawn_shell(self, system):
+        """Test clearing the screen writes ANSI instead of running clear"""
+        GameInterface(renderer=self.renderer).clear_screen()
+        system.assert_not_called()
+        self.assertEqual(self.take_output(), "\x1b[2J\x1b[H")
+
+
+class TestScriptedController(unittest.TestCase):
+    """Test cases for running the controller from a script"""
+
+    def play_scripted(self, seed, extra_lines=()):
+        """Play one basic game whose guesses spell out the answer"""
+        dictionary = DictionaryManager()
+        dictionary.seed_selection(seed)
+        twin = DictionaryManager()
+        twin.seed_selection(seed)
+        answer = twin.next_word("basic")
+
+        script = ["1", *extra_lines, *dict.fromkeys(answer), "n"]
+        output = io.StringIO()
+        controller = HangmanGameController(
+            ScriptedInput(script), pace_seconds=0, dictionary=dictionary,
+            renderer=PlainRenderer(output))
+        with contextlib.redirect_stdout(output):
+            controller.run()
+        return controller.game, answer
+
+    def test_scripted_game_with_wrong_guess_and_timeout(self):
+        """Test scripted guesses and timeout events drive the game"""
+        game, answer = self.play_scripted(5, ["1", TIMEOUT_EVENT])
+        self.assertTrue(game.won)
+        self.assertEqual(game.answer, answer)
+        # The invalid "1" and the scripted timeout each cost a life
+        self.assertEqual(game.lives, 4)
+
+    def test_scripted_runs_without_waiting(self):
+        """Test a 1,000-game scripted session never sleeps"""
+        dictionary = DictionaryManager()
+        dictionary.seed_selection(11)
+        twin = DictionaryManager()
+        twin.seed_selection(11)
+        script = []
+        answers = []
+        for _ in range(1000):
+            answer = twin.next_word("basic")
+            answers.append(answer)
+            wrong = next(letter for letter in "QZXJVKWYBF"
+                         if letter not in answer)
+            script += ["1", wrong, *dict.fromkeys(answer), "y"]
+        script[-1] = "n"
+
+        stats = GameStats(":memory:")
+        controller = HangmanGameController(
+            ScriptedInput(script), pace_seconds=0, dictionary=dictionary,
+            renderer=PlainRenderer(io.StringIO()),
+            recorder=GameRecorder(stats=stats))
+        with patch("time.sleep") as sleep, \
+                contextlib.redirect_stdout(io.StringIO()):
+            controller.run()
+        sleep.assert_not_called()
+
+        self.assertEqual(controller.game.answer, answers[-1])
+        summary = stats.get_player_stats("local")
+        stats.close()
+        self.assertEqual(summary['games'], 1000)
+        self.assertEqual(summary['win_rate'], 1.0)
+        self.assertEqual(summary['average_wrong_guesses'], 1.0)
+
+    def test_seed_option_in_either_position(self):
+        """Test a subcommand does not reset the global --seed"""
+        self.assertEqual(parse_args(["--seed", "7", "simulate"]).seed, 7)
+        self.assertEqual(parse_args(["simulate", "--seed", "8"]).seed, 8)
+        self.assertIsNone(parse_args(["simulate"]).seed)
+        self.assertEqual(parse_args(["--seed", "9", "tournament"]).seed, 9)
+
+    def test_level_options_accept_dictionary_levels(self):
+        """Test --level is checked against the loaded dictionary"""
+        for command in ("simulate", "serve"):
+            self.assertEqual(
+                parse_args([command, "--level", "mots"]).level, "mots")
+        self.assertEqual(load_dictionary(None, "intermediate").get_levels(),
+                         ["basic", "intermediate"])
+        with self.assertRaises(ValueError):
+            load_dictionary(None, "mots")
+
+
+class TestGameCommands(unittest.TestCase):
+    """Test cases for the single-writer game command queue"""
+
+    def setUp(self):
+        self.game = HangmanGame()
+        self.game.set_word("CAT", "basic")
+        self.commands = GameCommandQueue(self.game)
+
+    def test_one_command_wins_a_turn(self):
+        """Test a timeout and a late guess for one turn apply once"""
+        turn = self.commands.turn
+        self.commands.submit_timeout(turn)
+        self.commands.submit_guess("C", turn)
+        self.commands.submit_timeout(turn)
+        self.assertEqual(self.commands.drain(),
+                         [(game_commands.TIMEOUT, None, False)])
+        self.assertEqual(self.game.lives, 5)
+        self.assertEqual(self.commands.dropped, 2)
+        self.assertEqual(self.game.display_word, "___")
+
+    def test_commands_apply_in_order(self):
+        """Test untagged commands apply in order, in limited batches"""
+        for letter in "CXA":
+            self.commands.submit_guess(letter)
+        self.assertEqual(self.commands.drain(limit=2),
+                         [(game_commands.GUESS, "C", True),
+                          (game_commands.GUESS, "X", False)])
+        self.assertEqual(len(self.commands), 1)
+        self.assertEqual(self.commands.drain(),
+                         [(game_commands.GUESS, "A", True)])
+
+    def test_no_timeout_after_game_over(self):
+        """Test a timeout queued after the win is dropped"""
+        for letter in "CAT":
+            self.commands.submit_guess(letter)
+        self.commands.submit_timeout()
+        self.assertEqual(len(self.commands.drain()), 3)
+        self.assertTrue(self.game.won)
+        self.assertEqual(self.game.lives, 6)
+        self.assertEqual(self.commands.dropped, 1)
+
+    def test_timer_thread_only_queues(self):
+        """Test a timer callback waits for the owner to drain"""
+        clock = VirtualClock()
+        timer = GameTimer(timeout_seconds=5, scheduler=clock.scheduler)
+        timer.set_timeout_callback(lambda: self.commands.submit_timeout(
+            self.commands.turn))
+        timer.start()
+        clock.advance(5)
+        self.assertEqual(self.game.lives, 6)
+        self.assertEqual(self.commands.drain(),
+                         [(game_commands.TIMEOUT, None, False)])
+        self.assertEqual(self.game.lives, 5)
+
+    def test_submissions_from_many_threads(self):
+        """Test no command is lost when threads submit concurrently"""
+        game = HangmanGame()
+        game.set_word("A" * 10, "basic")
+        commands = GameCommandQueue(game)
+
+        def submit():
+            for _ in range(1000):
+                commands.submit_guess("A")
+
+        threads = [threading.Thread(target=submit) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(commands), 4000)
+        self.assertEqual(len(commands.drain()), 1)
+        self.assertEqual(commands.dropped, 3999)
+
+
+class TestGameJournal(unittest.TestCase):
+    """Test cases for the game journal and replay"""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".journal")
+        os.close(handle)
+        self.dictionary = DictionaryManager()
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_simulation_journal_replays_identically(self):
+        """Test replaying a simulation journal reproduces every outcome"""
+        with GameJournal(self.path, batch_size=16) as journal:
+            result = run_simulation(
+                40, "frequency", "intermediate", seed=4,
+                options=SimulationOptions(self.dictionary, journal))
+        replay = replay_journal(self.path, self.dictionary)
+        self.assertEqual(replay.games, 40)
+        self.assertEqual(replay.mismatches, [])
+        ends = [event for event, *_ in read_journal(self.path)
+                if event in (END_WON, END_LOST)]
+        self.assertEqual(ends.count(END_WON), result.wins)
+
+    def test_controller_records_timeouts(self):
+        """Test timeouts from the controller are journaled and replayed"""
+        self.dictionary.seed_selection(3)
+        twin = DictionaryManager()
+        twin.seed_selection(3)
+        answer = twin.next_word("basic")
+        script = ["1", TIMEOUT_EVENT, *dict.fromkeys(answer), "n"]
+        with GameJournal(self.path) as journal:
+            controller = HangmanGameController(
+                ScriptedInput(script), pace_seconds=0,
+                dictionary=self.dictionary,
+                renderer=PlainRenderer(io.StringIO()),
+                recorder=GameRecorder(journal))
+            with contextlib.redirect_stdout(io.StringIO()):
+                controller.run()
+        events = [event for event, *_ in read_journal(self.path)]
+        self.assertEqual(events.count(TIMEOUT), 1)
+        replay = replay_journal(self.path, self.dictionary)
+        self.assertEqual((replay.games, replay.mismatches), (1, []))
+
+    def test_tampered_outcome_is_reported(self):
+        """Test replay flags a recorded outcome it cannot reproduce"""
+        with GameJournal(self.path) as journal:
+            game_id = journal.start_game(
+                self.dictionary.get_entry_id("LOOP", "basic"))
+            journal.record_guess(game_id, "Z")
+            # Record an untouched game: 6 lives instead of the replayed 5
+            journal.end_game(game_id, HangmanGame())
+        replay = replay_journal(self.path, self.dictionary)
+        self.assertEqual(len(replay.mismatches), 1)
+
+    def test_slow_events_are_written_within_the_interval(self):
+        """Test a trickle of events reaches the file before the batch fills"""
+        with GameJournal(self.path, fsync_interval=0.01) as journal:
+            for _ in range(5):
+                journal.start_game(0)
+                time.sleep(0.02)
+            # Every event but the first came after the interval passed
+            self.assertGreaterEqual(os.path.getsize(self.path),
+                                    4 * RECORD.size)
+        self.assertEqual(os.path.getsize(self.path), 5 * RECORD.size)
+
+    def test_partial_record_is_ignored(self):
+        """Test a torn final record does not break reading"""
+        with GameJournal(self.path) as journal:
+            journal.start_game(0)
+        with open(self.path, "ab") as output:
+            output.write(b"\x02\x00")
+        self.assertEqual(len(list(read_journal(self.path))), 1)
+        self.assertEqual(os.path.getsize(self.path), RECORD.size + 2)
+
+
+class TestGameStats(unittest.TestCase):
+    """Test cases for the SQLite game statistics"""
+
+    def setUp(self):
+        self.stats = GameStats(":memory:", batch_size=3)
+
+    def tearDown(self):
+        self.stats.close()
+
+    @staticmethod
+    def finished_game(word, letters, timeouts=0):
+        """A game of word after the given timeouts and guesses"""
+        game = HangmanGame()
+        game.set_word(word, "basic")
+        for _ in range(timeouts):
+            game.handle_timeout()
+        for letter in letters:
+            game.guess_letter(letter)
+        return game
+
+    def test_word_and_player_aggregates(self):
+        """Test wrong guesses, timeouts and time per guess add up"""
+        self.stats.record_game(self.finished_game("LOOP", "XLOP", 1),
+                               "ann", 5.0)
+        self.stats.record_game(self.finished_game("LOOP", "ABCDEF"),
+                               "bob", 6.0)
+        word = self.stats.get_word_stats("loop", "basic")
+        self.assertEqual(word['games'], 2)
+        self.assertEqual(word['win_rate'], 0.5)
+        self.assertEqual(word['average_wrong_guesses'], 3.5)
+        ann = self.stats.get_player_stats("ann")
+        self.assertEqual(ann['timeout_rate'], 0.2)
+        self.assertEqual(ann['seconds_per_guess'], 1.0)
+        self.assertIsNone(self.stats.get_player_stats("carol"))
+
+    def test_folded_letters_are_not_wrong_guesses(self):
+        """Test accented answers count guesses through their alphabet"""
+        dictionary = DictionaryManager()
+        dictionary.add_words(["café"], "french", language="french")
+        dictionary.add_words(["straße"], "german", language="german")
+        for word, level, letters in (("CAFÉ", "french", "CAFE"),
+                                     ("STRAßE", "german", "STRAßE")):
+            game = HangmanGame()
+            game.set_word(word, level,
+                          alphabet=dictionary.get_alphabet(level))
+            for letter in letters:
+                game.guess_letter(letter)
+            self.assertTrue(game.won)
+            self.stats.record_game(game, "ann")
+        self.stats.flush()
+        ann = self.stats.get_player_stats("ann")
+        self.assertEqual(ann['average_wrong_guesses'], 0.0)
+        self.assertEqual(ann['timeout_rate'], 0.0)
+        self.assertEqual(
+            self.stats.get_word_stats("straße", "german")['games'], 1)
+
+    def test_timeouts_are_counted(self):
+        """Test timeouts are counted, not derived from lost lives"""
+        self.stats.record_game(self.finished_game("LOOP", "ZLOP", 2))
+        self.stats.flush()
+        player = self.stats.get_player_stats("local")
+        self.assertEqual(player['average_wrong_guesses'], 1.0)
+        self.assertEqual(player['timeout_rate'], 2 / 6)
+
+    def test_games_are_written_in_batches(self):
+        """Test the database only changes once a batch is full"""
+        path = _temp_path(self, ".db")
+        with GameStats(path, batch_size=3) as stats:
+            reader = sqlite3.connect(path)
+            self.addCleanup(reader.close)
+            query = "SELECT SUM(games) FROM player_stats"
+            for _ in range(2):
+                stats.record_game(self.finished_game("LOOP", "LOP"))
+            self.assertIsNone(reader.execute(query).fetchone()[0])
+            stats.record_game(self.finished_game("LOOP", "LOP"))
+            self.assertEqual(reader.execute(query).fetchone()[0], 3)
+
+    def test_leaderboard_and_hardest_words(self):
+        """Test rankings come out in win rate order"""
+        for player, letters in (("ann", "LOP"), ("bob", "ABCDEF"),
+                                ("ann", "LOP")):
+            self.stats.record_game(self.finished_game("LOOP", letters),
+                                   player)
+        self.stats.record_game(self.finished_game("ARRAY", "ZQXJKV"), "bob")
+        self.assertEqual([row['name'] for row in self.stats.leaderboard()],
+                         ["ann", "bob"])
+        self.assertEqual(
+            [row['name'] for row in self.stats.hardest_words("basic")],
+            ["ARRAY", "LOOP"])
+
+    def test_recorder_counts_games_for_its_player(self):
+        """Test a GameRecorder sends finished games to its stats"""
+        GameRecorder().end_game(self.finished_game("LOOP", "LOP"))
+        recorder = GameRecorder(stats=self.stats, player="dora")
+        game = self.finished_game("LOOP", "XLOP")
+        recorder.start_game(game)
+        recorder.record_guess("X")
+        recorder.end_game(game, 2.0)
+        self.stats.flush()
+        self.assertEqual(self.stats.get_player_stats("dora")['games'], 1)
+        self.assertIsNone(self.stats.get_player_stats("local"))
+
+    def test_simulation_records_strategy_stats(self):
+        """Test headless games count towards the strategy name"""
+        result = run_simulation(50, "frequency", seed=2,
+                                options=SimulationOptions(stats=self.stats))
+        player = self.stats.get_player_stats("frequency")
+        self.assertEqual(player['games'], 50)
+        self.assertAlmostEqual(player['win_rate'], result.win_rate)
+
+
+class TestSimulation(unittest.TestCase):
+    """Test cases for headless simulation"""
+
+    def test_run_simulation(self):
+        """Test simulation plays every game to completion"""
+        result = run_simulation(50, "frequency", "basic", seed=1)
+        self.assertEqual(result.games, 50)
+        again = run_simulation(50, "frequency", "basic", seed=1)
+        self.assertEqual(again.wins, result.wins)
+        self.assertLessEqual(result.wins, 50)
+        self.assertLessEqual(result.average_wrong_guesses, 6)
+        self.assertIn("Win rate", result.format_report())
+
+    def test_random_strategy_on_phrases(self):
+        """Test random strategy finishes phrase games"""
+        result = run_simulation(20, "random", "intermediate", seed=2)
+        self.assertEqual(result.games, 20)
+
+    def test_strategies_guess_through_the_alphabet(self):
+        """Test accented levels never repeat a folded letter"""
+        dictionary = DictionaryManager()
+        dictionary.add_words(["café", "élève", "fenêtre", "été", "forêt"],
+                             "mots", "french")
+        dictionary.add_words(["straße", "mädchen", "brücke", "öl"],
+                             "wörter", "german")
+        options = SimulationOptions(dictionary)
+        for strategy in STRATEGIES:
+            for level in ("mots", "wörter"):
+                result = run_simulation(30, strategy, level, seed=3,
+                                        options=options)
+                self.assertEqual(result.games, 30)
+        # Random play covers every German letter, ß included
+        player = get_strategy("random", dictionary, "wörter",
+                              random.Random(4))
+        player.start_game("____")
+        state = {'guessed_letters': []}
+        letters = dictionary.get_alphabet("wörter").letters
+        self.assertEqual({player.next_guess(state) for _ in letters},
+                         set(letters))
+
+    def test_unknown_strategy(self):
+        """Test unknown strategy name raises ValueError"""
+        with self.assertRaises(ValueError):
+            run_simulation(1, "psychic")
+
+    def test_repeated_guess_is_rejected(self):
+        """Test a strategy that repeats a guess raises RuntimeError"""
+        class Stubborn(GuessStrategy):
+            """Always guesses the same letter"""
+            name = "stubborn"
+
+            def next_guess(self, game_state):
+                return "E"
+
+        with self.assertRaises(RuntimeError):
+            game = HangmanGame()
+            game.set_word("PYTHON", "basic")
+            play_headless_game(game, Stubborn(None, "basic", None))
+
+
+class TestCompiledDictionary(unittest.TestCase):
+    """Test cases for compiled, memory-mapped dictionaries"""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".dict")
+        os.close(handle)
+        source = DictionaryManager()
+        source.add_words(["kiwi", "fig", "apple pie"], "fruit")
+        source.save_compiled(self.path)
+        self.source = source
+        self.compiled = DictionaryManager(self.path)
+
+    def tearDown(self):
+        self.compiled.close()
+        os.remove(self.path)
+
+    def test_compiled_levels_match_source(self):
+        """Test every level round-trips through the compiled file"""
+        self.assertEqual(self.compiled.get_levels(),
+                         self.source.get_levels())
+        for level in self.source.get_levels():
+            self.assertEqual(sorted(self.compiled.get_entries(level)),
+                             sorted(self.source.get_entries(level)))
+
+    def test_compiled_lookups(self):
+        """Test membership, size buckets and random picks"""
+        self.assertTrue(self.compiled.contains("python", "basic"))
+        self.assertFalse(self.compiled.contains("pythons", "basic"))
+        self.assertEqual(list(self.compiled.get_entries("fruit", length=4)),
+                         ["KIWI"])
+        self.assertEqual(
+            self.compiled.get_word_count("fruit", word_count=2), 1)
+        word = self.compiled.get_random_word("basic", length=6)
+        self.assertEqual(len(word), 6)
+
+    def test_compiled_entry_ids(self):
+        """Test compiled entries resolve by id"""
+        entry_id = self.compiled.get_entry_id("apple pie", "fruit")
+        self.assertEqual(self.compiled.get_entry_by_id(entry_id),
+                         ("APPLE PIE", "fruit"))
+
+    def test_add_word_to_compiled_level(self):
+        """Test adding to a compiled level copies it into memory"""
+        self.compiled.add_word("plum", "fruit")
+        self.assertEqual(self.compiled.get_word_count("fruit"), 4)
+        self.assertTrue(self.compiled.contains("fig", "fruit"))
+
+    def test_invalid_file(self):
+        """Test a file without the header raises ValueError"""
+        with open(self.path, "wb") as output:
+            output.write(b"not a dictionary" * 4)
+        with self.assertRaises(ValueError):
+            DictionaryManager(self.path)
+
+    def test_truncated_file(self):
+        """Test a file cut short raises ValueError or drops difficulty"""
+        with open(self.path, "rb") as source:
+            data = source.read()
+        # Zero padding separates the entries from the difficulty section
+        entries_end = len(data[:data.index(DIFFICULTY_MAGIC)].rstrip(b"\0"))
+        for cut in range(len(data)):
+            with open(self.path, "wb") as output:
+                output.write(data[:cut])
+            if cut < entries_end:
+                with self.assertRaises(ValueError):
+                    DictionaryManager(self.path)
+                continue
+            dictionary = DictionaryManager(self.path)
+            self.assertEqual(sorted(dictionary.get_entries("fruit")),
+                             sorted(self.source.get_entries("fruit")))
+            dictionary.close()
+
+
+class TestSharedDictionary(unittest.TestCase):
+    """Test cases for dictionaries published in shared memory"""
+
+    def setUp(self):
+        self.dictionary = DictionaryManager()
+        self.dictionary.add_words(["café", "thé"], "boissons",
+                                  language="french")
+
+    def publish(self, dictionary):
+        """Publish a dictionary and unlink it after the test"""
+        block = publish_shared(dictionary)
+        self.addCleanup(block.unlink)
+        self.addCleanup(block.close)
+        return block
+
+    def attach(self, block):
+        """Attach a DictionaryManager to a published block"""
+        attached = DictionaryManager(shared=block.name)
+        self.addCleanup(attached.close)
+        return attached
+
+    def test_attached_dictionary_reads_every_level(self):
+        """Test entries, languages and difficulty survive publishing"""
+        attached = self.attach(self.publish(self.dictionary))
+        for level in self.dictionary.get_levels():
+            self.assertEqual(sorted(attached.get_entries(level)),
+                             sorted(self.dictionary.get_entries(level)))
+        self.assertEqual(attached.get_alphabet("boissons").name, "french")
+        self.assertTrue(attached.contains("CAFE\u0301", "boissons"))
+        self.assertIn(attached.get_random_word("basic", difficulty="easy"),
+                      attached.get_entries("basic"))
+        self.assertEqual(attached.match("TH_"), ["THÉ"])
+
+    def test_compiled_image_is_copied_as_is(self):
+        """Test a file-backed dictionary publishes its image unchanged"""
+        path = _compile(self, self.dictionary)
+        compiled = DictionaryManager(path)
+        self.addCleanup(compiled.close)
+        block = self.publish(compiled)
+        with open(path, "rb") as dictionary_file:
+            image = dictionary_file.read()
+        self.assertEqual(bytes(block.buf[:len(image)]), image)
+        compiled.add_word("tea", "boissons")
+        self.assertIsNone(compiled.image)
+        self.assertTrue(self.attach(self.publish(compiled)).contains(
+            "tea", "boissons"))
+
+    def test_path_or_shared(self):
+        """Test a dictionary is either mapped from a file or attached"""
+        with self.assertRaises(ValueError):
+            DictionaryManager("words.dict", shared="words")
+
+    def test_tournament_workers_attach(self):
+        """Test tournament workers play from the published dictionary"""
+        path = _compile(self, self.dictionary)
+
+        def counts(dictionary_path=None, dictionary=None):
+            result = run_tournament(
+                ["frequency"], ["basic", "boissons"], 60,
+                TournamentOptions(2, dictionary_path, 2, 25), dictionary)
+            return {key: (entry.games, entry.wins, entry.wrong_guesses)
+                    for key, entry in result.results.items()}
+
+        self.assertEqual(counts(dictionary=self.dictionary),
+                         counts(dictionary_path=path))
+
+
+class TestAlphabets(unittest.TestCase):
+    """Test cases for multilingual dictionaries and alphabets"""
+
+    def setUp(self):
+        self.dictionary = DictionaryManager()
+        self.dictionary.add_words(["café crème", "cafe\u0301 noir"],
+                                  "french", language="french")
+        self.dictionary.add_words(["niño", "año"], "spanish",
+                                  language="spanish")
+
+    def play(self, word, level, letters):
+        """A game of word after guessing letters"""
+        game = HangmanGame()
+        game.set_word(word, level,
+                      alphabet=self.dictionary.get_alphabet(level))
+        results = [game.guess_letter(letter) for letter in letters]
+        return game, results
+
+    def test_entries_are_normalized_once(self):
+        """Test entries are stored in NFC upper case"""
+        self.assertIn("CAFÉ NOIR", self.dictionary.get_entries("french"))
+        self.assertTrue(self.dictionary.contains("Cafe\u0301 noir",
+                                                 "french"))
+        self.assertEqual(self.dictionary.get_alphabet("basic").name,
+                         "english")
+
+    def test_accent_insensitive_matching(self):
+        """Test a French E reveals every accented E"""
+        game, results = self.play("CAFÉ CRÈME", "french", "eÈ")
+        self.assertEqual(results, [True, None])
+        self.assertEqual(game.display_word, "___É __È_E")
+        self.assertEqual(game.get_game_state()['guessed_letters'], ["E"])
+
+    def test_separate_letters_stay_separate(self):
+        """Test Spanish N and Ñ are different letters"""
+        game, results = self.play("NIÑO", "spanish", "n")
+        self.assertEqual(results, [True])
+        self.assertEqual(game.display_word, "N___")
+        game.guess_letter("ñ")
+        self.assertEqual(game.display_word, "N_Ñ_")
+        self.assertEqual(game.get_game_state()['guessed_letters'],
+                         ["N", "Ñ"])
+
+    def test_letter_input_uses_the_alphabet(self):
+        """Test typed accented letters are validated by table lookup"""
+        interface = GameInterface(ScriptedInput(["12", "ñ"]),
+                                  PlainRenderer(io.StringIO()))
+        with contextlib.redirect_stdout(io.StringIO()):
+            letter = interface.get_letter_input(
+                self.dictionary.get_alphabet("spanish"))
+        self.assertEqual(letter, "Ñ")
+
+    def test_compiled_dictionary_keeps_languages(self):
+        """Test level languages survive compilation"""
+        compiled = _open_compiled(self, self.dictionary)
+        self.assertEqual(compiled.get_alphabet("french").name, "french")
+        self.assertEqual(compiled.get_alphabet("basic").name, "english")
+        self.assertTrue(compiled.contains("niño", "spanish"))
+
+
+class TestWordDifficulty(unittest.TestCase):
+    """Test cases for difficulty scores and bands"""
+
+    def setUp(self):
+        self.dictionary = DictionaryManager()
+
+    def test_scores_follow_word_features(self):
+        """Test short words with few, repeated letters score harder"""
+        self.assertGreater(self.dictionary.get_difficulty("loop", "basic"),
+                           self.dictionary.get_difficulty("encryption",
+                                                          "basic"))
+        with self.assertRaises(ValueError):
+            self.dictionary.get_difficulty("pythons", "basic")
+
+    def test_bands_split_the_level(self):
+        """Test random picks come from the requested band only"""
+        drawn = {band: {self.dictionary.get_random_word(
+                            "basic", difficulty=band) for _ in range(300)}
+                 for band in ("easy", "medium", "hard")}
+        self.assertFalse(drawn["easy"] & drawn["hard"])
+        easiest = max(self.dictionary.get_difficulty(word, "basic")
+                      for word in drawn["easy"])
+        self.assertLess(easiest, 1 / 3)
+        self.assertTrue(all(
+            self.dictionary.get_difficulty(word, "basic") >= 2 / 3
+            for word in drawn["hard"]))
+        with self.assertRaises(ValueError):
+            self.dictionary.get_random_word("basic", difficulty="extreme")
+        with self.assertRaises(ValueError):
+            self.dictionary.get_random_word("basic", length=4,
+                                            difficulty="easy")
+
+    def test_added_words_are_rescored(self):
+        """Test adding words refreshes the difficulty index"""
+        self.dictionary.get_difficulty("loop", "basic")
+        self.dictionary.add_words(["jazz"], "basic")
+        self.assertGreater(self.dictionary.get_difficulty("jazz", "basic"),
+                           0.5)
+
+    def test_incremental_scores_match_a_full_build(self):
+        """Test featurizing in batches scores like one full build"""
+        entries = list(self.dictionary.words) + ["JAZZ", "A-B C", "ÉTÉ"]
+        features = DifficultyFeatures(entries[:10])
+        features.extend(entries[10:25])
+        features.extend(entries[25:])
+        built = DifficultyIndex.build(entries)
+        scored = features.index()
+        self.assertEqual(scored.order.tolist(), built.order.tolist())
+        self.assertEqual(scored.scores.tolist(), built.scores.tolist())
+
+    def test_added_words_are_featurized_once(self):
+        """Test add_words featurizes only the new words of a scored level"""
+        self.dictionary.get_difficulty("loop", "basic")
+        with patch("difficulty.code_matrix",
+                   wraps=difficulty.code_matrix) as featurize:
+            self.dictionary.add_words(["jazz", "fizz", "loop"], "basic")
+            self.dictionary.get_difficulty("jazz", "basic")
+        self.assertEqual(featurize.call_count, 1)
+        self.assertEqual(len(featurize.call_args.args[0]), 2)
+        fresh = DictionaryManager()
+        fresh.add_words(["jazz", "fizz"], "basic")
+        for word in ("jazz", "loop", "encryption"):
+            self.assertEqual(self.dictionary.get_difficulty(word, "basic"),
+                             fresh.get_difficulty(word, "basic"))
+
+    def test_compiled_file_stores_scores(self):
+        """Test compiled dictionaries carry their difficulty index"""
+        compiled = _open_compiled(self, self.dictionary)
+        expected = {word: self.dictionary.get_difficulty(word, "basic")
+                    for word in ("LOOP", "ENCRYPTION", "PYTHON")}
+        with patch("difficulty.DifficultyIndex.build") as build:
+            for word, score in expected.items():
+                # Equal scores may rank in a different order
+                self.assertAlmostEqual(
+                    compiled.get_difficulty(word, "basic"), score,
+                    delta=0.1)
+            self.assertIn(compiled.get_random_word("intermediate",
+                                                   difficulty=(0.5, 1.0)),
+                          self.dictionary.phrases)
+        build.assert_not_called()
+
+
+class TestPatternIndex(unittest.TestCase):
+    """Test cases for DictionaryManager.match pattern queries"""
+
+    def setUp(self):
+        self.dictionary = DictionaryManager()
+        self.dictionary.add_words(["python", "pithon", "patron", "button",
+                                   "hello world", "hello-world",
+                                   "yellow world"], "custom")
+
+    def test_revealed_and_excluded_letters(self):
+        """Test revealed positions and excluded letters filter entries"""
+        self.assertEqual(self.dictionary.match("P_TH_N", level="custom"),
+                         ["PYTHON", "PITHON"])
+        self.assertEqual(self.dictionary.match("p_th_n", "y",
+                                               level="custom"), ["PITHON"])
+        self.assertEqual(self.dictionary.match("P_T__N", "H",
+                                               level="custom"), ["PATRON"])
+
+    def test_hidden_positions_skip_revealed_letters(self):
+        """Test a revealed letter cannot also sit in a hidden position"""
+        # BUTTON has a second T, which would have been revealed
+        self.assertNotIn("BUTTON",
+                         self.dictionary.match("__T_ON", level="custom"))
+        self.assertEqual(self.dictionary.match("__TTON", level="custom"),
+                         ["BUTTON"])
+
+    def test_phrase_layout(self):
+        """Test spaces and punctuation must match the entry's layout"""
+        self.assertEqual(self.dictionary.match("H____ W____",
+                                               level="custom"),
+                         ["HELLO WORLD"])
+        self.assertEqual(self.dictionary.match("_____-_____",
+                                               level="custom"),
+                         ["HELLO-WORLD"])
+        self.assertEqual(self.dictionary.match("______ _____", "H",
+                                               level="custom"),
+                         ["YELLOW WORLD"])
+
+    def test_documented_examples(self):
+        """Test the match examples from the README and docstring"""
+        dictionary = DictionaryManager()
+        self.assertEqual(dictionary.match("H____ W____"), ["HELLO WORLD"])
+        # L and O are revealed, so WORLD's hidden O and L cannot match
+        self.assertEqual(dictionary.match("HELLO W____"), [])
+        self.assertEqual(dictionary.match("P_TH_N", excluded="AEZ"),
+                         ["PYTHON"])
+
+    def test_all_levels_and_hidden_pattern(self):
+        """Test an unrevealed pattern searches every level by default"""
+        matches = self.dictionary.match("______")
+        self.assertIn("PYTHON", matches)
+        self.assertIn("BUTTON", matches)
+        self.assertTrue(all(len(entry) == 6 for entry in matches))
+        self.assertEqual(self.dictionary.match("Q_____", level="custom"),
+                         [])
+
+    def test_folded_letters(self):
+        """Test a French E matches every accented E"""
+        self.dictionary.add_words(["café", "cafe"], "french",
+                                  language="french")
+        self.assertEqual(self.dictionary.match("___E", level="french"),
+                         ["CAFÉ", "CAFE"])
+        self.assertEqual(self.dictionary.match("____", "é",
+                                               level="french"), [])
+
+    def test_index_follows_added_words(self):
+        """Test words added after a query are found by the next one"""
+        self.assertEqual(self.dictionary.match("M____", level="custom"), [])
+        self.dictionary.add_words(["mango"], "custom")
+        self.assertEqual(self.dictionary.match("M____", level="custom"),
+                         ["MANGO"])
+
+    def test_compiled_dictionary(self):
+        """Test match works on a memory-mapped compiled dictionary"""
+        compiled = _open_compiled(self, self.dictionary)
+        self.assertEqual(compiled.match("P_TH_N", "I", level="custom"),
+                         ["PYTHON"])
+
+
+class TestSolver(unittest.TestCase):
+    """Test cases for Solver class"""
+
+    def setUp(self):
+        self.dictionary = DictionaryManager()
+        self.solver = Solver(self.dictionary, "basic")
+        self.game = HangmanGame()
+
+    def test_candidates_match_word_length(self):
+        """Test initial candidates have the answer's length"""
+        self.game.set_word("PYTHON", "basic")
+        candidates = self.solver.update(self.game.get_game_state())
+        self.assertIn("PYTHON", candidates)
+        self.assertTrue(all(len(word) == 6 for word in candidates))
+
+    def test_candidates_narrow_with_guesses(self):
+        """Test candidates stay consistent with revealed letters"""
+        self.game.set_word("PYTHON", "basic")
+        self.game.guess_letter("O")
+        self.game.guess_letter("S")
+        candidates = self.solver.update(self.game.get_game_state())
+        self.assertIn("PYTHON", candidates)
+        for word in candidates:
+            self.assertEqual(word[4], "O")
+            self.assertNotIn("S", word)
+
+    def test_rank_letters_skips_guessed(self):
+        """Test ranked letters exclude guesses and are best first"""
+        self.game.set_word("HELLO WORLD", "intermediate")
+        self.game.guess_letter("L")
+        solver = Solver(self.dictionary, "intermediate")
+        ranks = solver.rank_letters(self.game.get_game_state())
+        self.assertNotIn("L", [letter for letter, _ in ranks])
+        gains = [gain for _, gain in ranks]
+        self.assertEqual(gains, sorted(gains, reverse=True))
+
+    def test_accented_entries_fold_to_letters(self):
+        """Test a guessed E matches the É it revealed"""
+        self.dictionary.add_words(["café", "naïf", "sofa", "thé"], "mots",
+                                  language="french")
+        alphabet = self.dictionary.get_alphabet("mots")
+        solver = Solver(self.dictionary, "mots")
+        game = HangmanGame()
+        game.set_word("CAFÉ", "mots", alphabet=alphabet)
+        ranks = [letter for letter, _ in
+                 solver.rank_letters(game.get_game_state())]
+        self.assertIn("E", ranks)
+        self.assertNotIn("É", ranks)
+        game.guess_letter("E")
+        self.assertEqual(solver.update(game.get_game_state()), ["CAFÉ"])
+
+        game = HangmanGame()
+        game.set_word("NAÏF", "mots", alphabet=alphabet)
+        solver.reset(game.display_word)
+        game.guess_letter("I")
+        self.assertEqual(solver.update(game.get_game_state()), ["NAÏF"])
+
+    def test_solver_strategy_wins(self):
+        """Test solver strategy wins games from its dictionary"""
+        result = run_simulation(30, "solver", "intermediate", seed=3)
+        self.assertEqual(result.wins, 30)
+
+
+class TestDecisionTree(unittest.TestCase):
+    """Test cases for the precomputed guessing decision tree"""
+
+    def setUp(self):
+        self.dictionary = DictionaryManager()
+        self.path = _temp_path(self, ".tree")
+
+    def open_tree(self):
+        """Memory-map the built tree"""
+        tree = DecisionTree.open(self.path)
+        self.addCleanup(tree.close)
+        return tree
+
+    def play(self, tree, word, level):
+        """Play one game with the tree's letters"""
+        game = HangmanGame()
+        game.set_word(word, level,
+                      alphabet=self.dictionary.get_alphabet(level))
+        while not game.game_over:
+            letter = tree.best_letter(game.get_game_state())
+            self.assertIsNotNone(letter)
+            self.assertIsNotNone(game.guess_letter(letter))
+        return game
+
+    def test_tree_plays_every_entry(self):
+        """Test every game follows the tree within the worst case"""
+        report = build_decision_tree(self.dictionary, "basic", self.path,
+                                     workers=1)
+        tree = self.open_tree()
+        self.assertEqual(tree.report.entries, report.entries)
+        self.assertEqual(tree.report.worst_case_wrong_guesses,
+                         report.worst_case_wrong_guesses)
+        worst = 0
+        for word in self.dictionary.get_entries("basic"):
+            game = self.play(tree, word, "basic")
+            self.assertTrue(game.won)
+            worst = max(worst, 6 - game.lives)
+        self.assertEqual(worst, report.worst_case_wrong_guesses)
+
+    def test_truncated_file_is_rejected(self):
+        """Test a cut-short tree file raises ValueError"""
+        build_decision_tree(self.dictionary, "basic", self.path, workers=1)
+        with open(self.path, "rb") as tree_file:
+            data = tree_file.read()
+        with open(self.path, "wb") as tree_file:
+            tree_file.write(data[:-4])
+        with self.assertRaises(ValueError):
+            DecisionTree.open(self.path)
+
+    def test_wider_search_is_never_worse(self):
+        """Test searching more letters per state keeps or lowers the
+        worst case"""
+        greedy = build_decision_tree(self.dictionary, "basic", self.path,
+                                     workers=1, width=1)
+        wide = build_decision_tree(self.dictionary, "basic", self.path,
+                                   workers=1, width=3)
+        self.assertLessEqual(wide.worst_case_wrong_guesses,
+                             greedy.worst_case_wrong_guesses)
+
+    def test_worker_processes_build_the_same_file(self):
+        """Test the tree does not depend on the number of workers"""
+        build_decision_tree(self.dictionary, "intermediate", self.path,
+                            workers=1)
+        with open(self.path, "rb") as tree_file:
+            single = tree_file.read()
+        build_decision_tree(self.dictionary, "intermediate", self.path,
+                            workers=2)
+        with open(self.path, "rb") as tree_file:
+            self.assertEqual(tree_file.read(), single)
+
+    def test_lost_games_and_off_tree_states(self):
+        """Test the report counts lost entries and unknown states miss"""
+        self.dictionary.add_words(["bill", "dill", "fill", "gill", "hill",
+                                   "kill", "mill", "pill", "sill", "till",
+                                   "will"], "ills")
+        report = build_decision_tree(self.dictionary, "ills", self.path,
+                                     workers=1)
+        self.assertEqual(report.worst_case_wrong_guesses, 10)
+        self.assertEqual(report.lost, 5)
+        tree = self.open_tree()
+        # Only first letters split the entries; ties go alphabetically
+        self.assertEqual(tree.lookup("____", []), "B")
+        self.assertEqual(tree.lookup("____", ["B"]), "D")
+        self.assertIsNone(tree.lookup("_ILL", ["I", "L"]))
+        self.assertIsNone(tree.lookup("______", []))
+
+    def test_folded_letters(self):
+        """Test accented answers are looked up by alphabet letter"""
+        self.dictionary.add_words(["café", "cafe", "cake"], "french",
+                                  language="french")
+        build_decision_tree(self.dictionary, "french", self.path,
+                            workers=1)
+        tree = self.open_tree()
+        self.assertEqual(tree.alphabet.name, "french")
+        self.assertTrue(self.play(tree, "CAFÉ", "french").won)
+        self.assertTrue(self.play(tree, "CAKE", "french").won)
+
+    def test_not_a_tree(self):
+        """Test opening another file is rejected"""
+        with open(self.path, "wb") as tree_file:
+            tree_file.write(b"HANGDIC1" + bytes(64))
+        with self.assertRaises(ValueError):
+            DecisionTree.open(self.path)
+
+
+class TestHangmanServer(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the asyncio game server"""
+
+    async def asyncSetUp(self):
+        self.server = HangmanServer(timeout_seconds=0.1)
+        self.listener = await self.server.start("127.0.0.1", 0)
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.listener.close()
+        await self.listener.wait_closed()
+
+    async def test_guess_and_timeout(self):
+        """Test a session replies to guesses and times out idle turns"""
+        reader, writer = await asyncio.open_connection("127.0.0.1",
+                                                       self.port)
+        self.assertEqual(await reader.readline(), b"HELLO hangman\n")
+        self.assertTrue((await reader.readline()).startswith(b"GAME basic"))
+        self.assertTrue((await reader.readline()).startswith(b"STATE 6 -"))
+
+        writer.write(b"1\n")
+        self.assertTrue((await reader.readline()).startswith(b"INVALID"))
+        self.assertEqual(await reader.readline(), b"TIMEOUT\n")
+        self.assertTrue((await reader.readline()).startswith(b"STATE 5"))
+
+        writer.write(b"QUIT\n")
+        self.assertEqual(await reader.readline(), b"BYE\n")
+        writer.close()
+
+    async def test_load_test(self):
+        """Test the load generator plays games against a server"""
+        report = await run_load_test(5, games=2)
+        self.assertEqual(report['clients'], 5)
+        self.assertGreater(report['requests'], 10)
+        self.assertLessEqual(report['p50'], report['max'])
+
+
+class TestTournament(unittest.TestCase):
+    """Test cases for the multi-process tournament runner"""
+
+    def test_results_do_not_depend_on_workers(self):
+        """Test one and two workers produce identical aggregates"""
+        def counts(workers):
+            result = run_tournament(["frequency", "random"],
+                                    ["basic", "intermediate"], 300,
+                                    TournamentOptions(5, workers=workers,
+                                                      shard_size=70))
+            return {key: (entry.games, entry.wins, entry.wrong_guesses)
+                    for key, entry in result.results.items()}
+
+        single = counts(1)
+        self.assertEqual(len(single), 4)
+        self.assertEqual(single[("random", "basic")][0], 300)
+        self.assertEqual(single, counts(2))
+
+    def test_shards_continue_the_simulation_word_order(self):
+        """Test shards replay run_simulation's games piece by piece"""
+        expected = run_simulation(120, "frequency", "basic", seed=3)
+        wins = wrong = 0
+        for start in range(0, 120, 50):
+            _, _, _, shard_wins, shard_wrong, _ = play_shard(
+                "frequency", "basic", start, min(50, 120 - start),
+                TournamentOptions(3))
+            wins += shard_wins
+            wrong += shard_wrong
+        self.assertEqual((wins, wrong),
+                         (expected.wins, expected.wrong_guesses))
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for hot-path metrics"""
+
+    def setUp(self):
+        metrics.REGISTRY.reset()
+        metrics.enable()
+        self.addCleanup(metrics.disable)
+        self.addCleanup(metrics.REGISTRY.reset)
+
+    def test_disable_restores_original_methods(self):
+        """Test disabled metrics leave the plain methods in place"""
+        wrapped = HangmanGame.guess_letter
+        metrics.disable()
+        self.assertFalse(metrics.is_enabled())
+        self.assertIsNot(HangmanGame.guess_letter, wrapped)
+        self.assertIs(HangmanGame.guess_letter,
+                      getattr(wrapped, "__wrapped__"))
+        game = HangmanGame()
+        game.set_word("LOOP", "basic")
+        game.guess_letter("L")
+        self.assertEqual(metrics.GUESS_SECONDS.count, 0)
+
+    def test_guesses_and_timeouts_are_measured(self):
+        """Test guess latency and timeouts are recorded"""
+        game = HangmanGame()
+        game.set_word("LOOP", "basic")
+        for letter in "LXO":
+            game.guess_letter(letter)
+        game.handle_timeout()
+        self.assertEqual(metrics.GUESS_SECONDS.count, 3)
+        self.assertEqual(sum(metrics.GUESS_SECONDS.counts), 3)
+        self.assertEqual(metrics.TIMEOUTS.value, 1)
+
+    def test_word_draws_are_measured(self):
+        """Test draws through next_word, as games make them, count"""
+        dictionary = DictionaryManager()
+        for _ in range(3):
+            dictionary.next_word("basic")
+        dictionary.get_random_word("basic")
+        self.assertEqual(metrics.WORD_DRAW_SECONDS.count, 4)
+        run_simulation(5, "frequency", seed=1,
+                       options=SimulationOptions(dictionary))
+        self.assertEqual(metrics.WORD_DRAW_SECONDS.count, 9)
+
+    def test_timer_drift_is_measured(self):
+        """Test a fired timer records how late it was"""
+        fired = threading.Event()
+        TimerScheduler().schedule(0.01, fired.set)
+        self.assertTrue(fired.wait(2))
+        self.assertEqual(metrics.TIMER_DRIFT_SECONDS.count, 1)
+        self.assertGreaterEqual(metrics.TIMER_DRIFT_SECONDS.sum, 0)
+
+    def test_prometheus_text_over_http(self):
+        """Test cumulative buckets are served at /metrics"""
+        histogram = metrics.Histogram("test_seconds", (0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5):
+            histogram.observe(value)
+        self.assertEqual(histogram.samples()[:3], [
+            'test_seconds_bucket{le="0.1"} 1',
+            'test_seconds_bucket{le="1.0"} 3',
+            'test_seconds_bucket{le="+Inf"} 4'])
+
+        metrics.TIMEOUTS.inc(2)
+        server = metrics.REGISTRY.serve(0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            text = response.read().decode()
+        self.assertIn("# TYPE hangman_guess_seconds histogram", text)
+        self.assertIn("hangman_timeouts_total 2", text)
+        self.assertIn('hangman_render_seconds_count{method="display_timer"}',
+                      text)
+
+
 if __name__ == '__main__':
     unittest.main()
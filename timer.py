@@ -3,69 +3,310 @@ Timer Module
 
 This module provides timing functionality for the Hangman game,
 including countdown timers and timeout handling.
+
+All GameTimer instances share one TimerScheduler: a heap of deadlines
+served by a single background thread, so thousands of running timers
+cost one sleeping thread instead of one polling thread each.
+
+Deadlines come from the scheduler's clock, time.monotonic by default.
+A VirtualClock replaces it with time that only moves when advanced,
+firing due timers synchronously, so timing can be tested without sleeps.
 """
 
+import heapq
+import itertools
 import threading
 import time
+import traceback
+
+
+class _ScheduledCall:
+    """A deadline in the scheduler heap"""
+
+    __slots__ = ("deadline", "sequence", "callback", "cancelled")
+
+    def __init__(self, deadline, sequence, callback):
+        self.deadline = deadline
+        self.sequence = sequence
+        self.callback = callback
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.deadline, self.sequence) < \
+            (other.deadline, other.sequence)
+
+    def cancel(self):
+        """Mark the call cancelled; returns whether it was still pending"""
+        pending = not self.cancelled
+        self.cancelled = True
+        return pending
+
+    def run(self):
+        """Run the callback, reporting rather than raising its errors"""
+        try:
+            self.callback()
+        except Exception:  # pylint: disable=broad-except
+            traceback.print_exc()
+
+
+class TimerScheduler:
+    """Fires callbacks at their deadlines from one background thread"""
+
+    def __init__(self, clock=None):
+        """
+        Args:
+            clock: time source in seconds (time.monotonic by default).
+                A scheduler with its own clock starts no thread; its due
+                calls run when run_due() is called, e.g. by VirtualClock.
+        """
+        self.clock = clock or time.monotonic
+        self.threaded = clock is None
+        self._heap = []
+        self._cancelled = 0
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def schedule(self, delay, callback):
+        """
+        Call callback once, delay seconds from now
+        Returns:
+            Handle that can be passed to cancel()
+        """
+        call = _ScheduledCall(self.clock() + delay,
+                              next(self._sequence), callback)
+        with self._condition:
+            heapq.heappush(self._heap, call)
+            if self._thread is None and self.threaded:
+                self._thread = threading.Thread(
+                    target=self._run, name="TimerScheduler", daemon=True)
+                self._thread.start()
+            # Wake the thread only if this is the new earliest deadline
+            if self._heap[0] is call:
+                self._condition.notify()
+        return call
+
+    def cancel(self, call):
+        """Cancel a scheduled call in O(1); it is dropped lazily"""
+        with self._condition:
+            if not call.cancel():
+                return
+            self._cancelled += 1
+            # Compact when cancelled calls dominate the heap
+            if self._cancelled > 64 and \
+                    self._cancelled * 2 > len(self._heap):
+                self._heap = [entry for entry in self._heap
+                              if not entry.cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+    def pending(self):
+        """Number of scheduled calls that have not fired or been cancelled"""
+        with self._condition:
+            return len(self._heap) - self._cancelled
+
+    def _drop_cancelled(self):
+        """Pop cancelled calls off the top of the heap"""
+        while self._heap and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+
+    def next_deadline(self):
+        """Deadline of the earliest pending call, or None"""
+        with self._condition:
+            self._drop_cancelled()
+            return self._heap[0].deadline if self._heap else None
+
+    def _pop_due(self, block=True):
+        """
+        Pop the next due call (holding the condition)
+        Waits for it when block is set; otherwise returns None if no
+        call is due yet.
+        """
+        while True:
+            self._drop_cancelled()
+            if not self._heap:
+                if not block:
+                    return None
+                self._condition.wait()
+                continue
+            remaining = self._heap[0].deadline - self.clock()
+            if remaining > 0:
+                if not block:
+                    return None
+                self._condition.wait(remaining)
+                continue
+            call = heapq.heappop(self._heap)
+            # A fired call can no longer be cancelled
+            call.cancel()
+            return call
+
+    def _run(self):
+        """Scheduler thread loop"""
+        while True:
+            with self._condition:
+                call = self._pop_due()
+            call.run()
+
+    def run_due(self):
+        """Run every call that is due now in this thread; returns the count"""
+        count = 0
+        while True:
+            with self._condition:
+                call = self._pop_due(block=False)
+            if call is None:
+                return count
+            call.run()
+            count += 1
+
+
+class VirtualClock:
+    """
+    Time source that only moves when advanced
+    Use its scheduler for GameTimer; advance() fires due timers in
+    deadline order from the calling thread.
+    """
+
+    def __init__(self, start=0.0):
+        self.now = start
+        self.scheduler = TimerScheduler(clock=self)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        """Move time forward, firing every timer due on the way"""
+        target = self.now + seconds
+        while True:
+            deadline = self.scheduler.next_deadline()
+            if deadline is None or deadline > target:
+                break
+            self.now = max(self.now, deadline)
+            self.scheduler.run_due()
+        self.now = target
+
+
+# Its thread starts with the first scheduled call
+_DEFAULT_SCHEDULER = TimerScheduler()
+
+
+# GameTimer states
+_STOPPED = "stopped"
+_RUNNING = "running"
+_PAUSED = "paused"
+_TIMED_OUT = "timed out"
+
+
+def get_default_scheduler():
+    """Get the process-wide scheduler shared by GameTimer instances"""
+    return _DEFAULT_SCHEDULER
 
 
 class GameTimer:
     """Handles timing functionality for the Hangman game"""
 
-    def __init__(self, timeout_seconds=15):
+    def __init__(self, timeout_seconds=15, scheduler=None):
+        """
+        Args:
+            timeout_seconds: length of one countdown
+            scheduler: TimerScheduler to use (the shared one by default);
+                the timer reads time from its clock
+        """
         self.timeout_seconds = timeout_seconds
-        self.is_running = False
-        self.timed_out = False
-        self.time_remaining = timeout_seconds
-        self.timer_thread = None
-        self.stop_event = threading.Event()
         self.timeout_callback = None
+        self.scheduler = scheduler or get_default_scheduler()
+        self._state = _STOPPED
+        self._remaining = timeout_seconds
+        # Scheduled call of the running countdown; holds its deadline
+        self._call = None
+        self._lock = threading.Lock()
+
+    @property
+    def clock(self):
+        """Clock the timer reads time from"""
+        return self.scheduler.clock
+
+    @property
+    def is_running(self):
+        """Whether the countdown is running"""
+        return self._state == _RUNNING
+
+    @property
+    def is_paused(self):
+        """Whether the countdown is paused"""
+        return self._state == _PAUSED
+
+    @property
+    def timed_out(self):
+        """Whether the last countdown reached its deadline"""
+        return self._state == _TIMED_OUT
+
+    @property
+    def time_remaining(self):
+        """Remaining time in seconds"""
+        call = self._call
+        if call is not None:
+            return max(0, call.deadline - self.clock())
+        return self._remaining
 
     def start(self):
         """Start the timer"""
-        if self.is_running:
-            return
+        self._run_for(self.timeout_seconds)
 
-        self.is_running = True
-        self.timed_out = False
-        self.time_remaining = self.timeout_seconds
-        self.stop_event.clear()
+    def _run_for(self, seconds):
+        """Start counting down from seconds unless already running"""
+        with self._lock:
+            if self._state == _RUNNING:
+                return
 
-        self.timer_thread = threading.Thread(target=self._run_timer)
-        self.timer_thread.daemon = True
-        self.timer_thread.start()
+            self._state = _RUNNING
+            self._call = self.scheduler.schedule(seconds, self._on_deadline)
 
     def stop(self):
         """Stop the timer"""
-        self.is_running = False
-        self.stop_event.set()
-        if self.timer_thread and self.timer_thread.is_alive():
-            self.timer_thread.join(timeout=1)
+        self._halt(_STOPPED)
+
+    def pause(self):
+        """Freeze the countdown; resume() continues from the same point"""
+        self._halt(_PAUSED)
+
+    def resume(self):
+        """Continue a paused countdown"""
+        if self.is_paused:
+            self._run_for(self._remaining)
+
+    def _halt(self, state):
+        """Stop counting down, keeping the remaining time"""
+        with self._lock:
+            call, self._call = self._call, None
+            if call is not None:
+                self._remaining = max(0, call.deadline - self.clock())
+                self._state = state
+            elif self._state == _PAUSED:
+                # Stopping a paused countdown discards it
+                self._state = state
+        if call is not None:
+            self.scheduler.cancel(call)
 
     def reset(self):
         """Reset the timer"""
         self.stop()
-        self.time_remaining = self.timeout_seconds
-        self.timed_out = False
-
-    def _run_timer(self):
-        """Internal timer loop"""
-        start_time = time.time()
-
-        while self.is_running and not self.stop_event.is_set():
-            elapsed = time.time() - start_time
-            self.time_remaining = max(0, self.timeout_seconds - elapsed)
-
-            # Check if time is up
-            if self.time_remaining <= 0:
-                self.timed_out = True
-                self.is_running = False
-                if self.timeout_callback:
-                    self.timeout_callback()
-                break
+        with self._lock:
+            self._state = _STOPPED
+            self._remaining = self.timeout_seconds
 
-            # Sleep for a short interval to update display
-            time.sleep(0.1)
+    def _on_deadline(self):
+        """Called by the scheduler when the deadline is reached"""
+        with self._lock:
+            call = self._call
+            # Ignore deadlines of runs that were stopped or restarted
+            if call is None or self.clock() < call.deadline:
+                return
+            self._state = _TIMED_OUT
+            self._remaining = 0
+            self._call = None
+        if self.timeout_callback:
+            self.timeout_callback()
 
     def set_timeout_callback(self, callback):
         """Set callback function to call when timer expires"""
@@ -0,0 +1,204 @@
+"""
+Tournament Module
+
+This module sweeps guessing strategies across dictionary levels by
+splitting the games into fixed-size shards and playing them in a pool
+of worker processes. Workers only play games headlessly and send back
+a few counters per shard, which the parent adds up.
+
+Shards are cut from the game numbers, not from the number of workers,
+and every shard derives its word order and strategy seed from the
+tournament seed, so a tournament gives the same results with any
+number of workers.
+
+Words come from the same ShuffleCursor order that run_simulation
+draws from. The cursor state of game number n is just (epoch n // size,
+position n % size), so a shard starts at its first game without
+replaying the draws before it.
+
+A dictionary that only exists in memory is published once into shared
+memory, and every worker attaches to that one copy.
+"""
+
+import atexit
+import copy
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from hangman_game import HangmanGame, STARTING_LIVES
+from dictionary import DictionaryManager, publish_shared
+from simulation import SimulationResult, get_strategy, play_headless_game
+
+# Dictionaries opened by this worker process, by path
+_DICTIONARIES = {}
+
+
+def _get_dictionary(path, shared_name=None):
+    """Open a dictionary once per process"""
+    dictionary = _DICTIONARIES.get((path, shared_name))
+    if dictionary is None:
+        dictionary = _DICTIONARIES[(path, shared_name)] = \
+            DictionaryManager(path, shared_name)
+        # Release mapped or shared memory before the worker shuts down
+        atexit.register(dictionary.close)
+    return dictionary
+
+
+class TournamentOptions:
+    """Settings of a tournament, sent to the workers with every shard"""
+
+    def __init__(self, seed=0, dictionary_path=None, workers=None,
+                 shard_size=2000):
+        """
+        Args:
+            seed: tournament seed; results depend only on it, not on
+                workers
+            dictionary_path: compiled dictionary file (built-in lists if
+                None)
+            workers: number of processes (one per CPU by default)
+            shard_size: games per job sent to a worker
+        """
+        self.seed = seed
+        self.dictionary_path = dictionary_path
+        self.workers = workers
+        self.shard_size = shard_size
+        # Shared memory dictionary to attach to instead of dictionary_path
+        self.shared_name = None
+
+    def worker_count(self):
+        """Number of worker processes to start"""
+        return self.workers or os.cpu_count() or 1
+
+    def open_dictionary(self):
+        """The tournament's dictionary, opened once per process"""
+        return _get_dictionary(self.dictionary_path, self.shared_name)
+
+
+def play_shard(strategy, level, start, games, options):
+    """
+    Play games number start .. start + games - 1 of a tournament entry
+    Words are drawn from the same non-repeating order that
+    run_simulation uses with the tournament seed, starting at game
+    number start.
+    Args:
+        options: TournamentOptions of the tournament
+    Returns:
+        (strategy, level, games, wins, wrong guesses, elapsed seconds)
+    """
+    seed = options.seed
+    dictionary = options.open_dictionary()
+    size = len(dictionary.get_entries(level))
+    if not size:
+        raise ValueError(f"No entries in level '{level}'")
+    dictionary.selection.set_state({
+        "seed": seed,
+        "cursors": [[level, None, None, size, start // size, start % size]],
+    })
+    player = get_strategy(strategy, dictionary, level,
+                          random.Random(f"{seed}:{strategy}:{level}:{start}"))
+    game = HangmanGame()
+    alphabet = dictionary.get_alphabet(level)
+    wins = 0
+    wrong_guesses = 0
+
+    start_time = time.perf_counter()
+    for _ in range(games):
+        game.reset_game()
+        game.set_word(dictionary.next_word(level), level, alphabet=alphabet)
+        play_headless_game(game, player)
+        wins += game.won
+        wrong_guesses += STARTING_LIVES - game.lives
+    return (strategy, level, games, wins, wrong_guesses,
+            time.perf_counter() - start_time)
+
+
+class TournamentResult:
+    """Merged results of a tournament, one SimulationResult per entry"""
+
+    def __init__(self, workers):
+        self.workers = workers
+        # (strategy, level) -> SimulationResult; elapsed is worker time
+        self.results = {}
+        self.elapsed = 0.0
+
+    @property
+    def games(self):
+        """Games played across all entries"""
+        return sum(result.games for result in self.results.values())
+
+    @property
+    def games_per_second(self):
+        """Tournament throughput over wall-clock time"""
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def add_shard(self, shard):
+        """Merge the counters returned by play_shard"""
+        strategy, level, games, wins, wrong_guesses, elapsed = shard
+        result = self.results.get((strategy, level))
+        if result is None:
+            result = self.results[(strategy, level)] = SimulationResult()
+        result.games += games
+        result.wins += wins
+        result.wrong_guesses += wrong_guesses
+        result.elapsed += elapsed
+
+    def format_report(self):
+        """Format the result as a text table"""
+        lines = [f"{'Strategy':<12}{'Level':<14}{'Games':>9}"
+                 f"{'Win rate':>10}{'Avg wrong':>11}"]
+        for (strategy, level), result in sorted(self.results.items()):
+            lines.append(f"{strategy:<12}{level:<14}{result.games:>9}"
+                         f"{result.win_rate:>10.2%}"
+                         f"{result.average_wrong_guesses:>11.3f}")
+        lines.append(f"Workers: {self.workers}, "
+                     f"games per second: {self.games_per_second:,.0f}")
+        return "\n".join(lines)
+
+
+def plan_shards(strategies, levels, games, options):
+    """List the play_shard arguments of every shard of a tournament"""
+    size = options.shard_size
+    return [(strategy, level, start, min(size, games - start), options)
+            for strategy in strategies
+            for level in levels
+            for start in range(0, games, size)]
+
+
+def run_tournament(strategies, levels, games, options=None,
+                   dictionary=None):
+    """
+    Play every strategy on every level in worker processes
+    Args:
+        strategies: registered strategy names
+        levels: dictionary levels
+        games: games per (strategy, level) entry
+        options: optional TournamentOptions
+        dictionary: DictionaryManager to publish into shared memory for
+            the workers, instead of options.dictionary_path; words follow
+            its compiled order, as if it was saved and passed by path
+    Returns:
+        TournamentResult
+    """
+    options = copy.copy(options or TournamentOptions())
+    if games < 1 or options.shard_size < 1:
+        raise ValueError("games and shard_size must be positive")
+    if dictionary is not None and options.dictionary_path is not None:
+        raise ValueError("Give either dictionary_path or dictionary")
+    workers = options.worker_count()
+    block = publish_shared(dictionary) if dictionary is not None else None
+    if block is not None:
+        options.shared_name = block.name
+    shards = plan_shards(strategies, levels, games, options)
+    result = TournamentResult(workers)
+    start_time = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            for shard in pool.map(play_shard, *zip(*shards)):
+                result.add_shard(shard)
+    finally:
+        if block is not None:
+            block.close()
+            block.unlink()
+    result.elapsed = time.perf_counter() - start_time
+    return result
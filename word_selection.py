@@ -0,0 +1,114 @@
+"""
+Word Selection Module
+
+This module draws entries without replacement in O(1) per draw using a
+seeded Feistel permutation, so no list is copied or shuffled and the
+whole position in the shuffle is a few integers.
+"""
+
+import random
+
+_ROUNDS = 4
+_MASK32 = 0xFFFFFFFF
+
+
+def _mix(value, key):
+    """32-bit integer hash used as the Feistel round function"""
+    value = (value * 0x9E3779B1 + key) & _MASK32
+    value ^= value >> 16
+    value = (value * 0x85EBCA6B) & _MASK32
+    value ^= value >> 13
+    return value
+
+
+class ShuffleCursor:
+    """Walks a pseudo-random permutation of range(size) one index at a time"""
+
+    def __init__(self, size, seed, epoch=0, position=0):
+        self.size = size
+        self.seed = seed
+        self.epoch = epoch
+        self.position = position
+        bits = max(2, (size - 1).bit_length())
+        self._half = (bits + 1) // 2
+        self._half_mask = (1 << self._half) - 1
+        self._keys = self._round_keys()
+
+    def _round_keys(self):
+        """Round keys for the current seed and epoch"""
+        rng = random.Random(f"{self.seed}:{self.epoch}")
+        return [rng.getrandbits(32) for _ in range(_ROUNDS)]
+
+    def _permute(self, index):
+        """Feistel permutation of the 2 * half bit domain"""
+        half = self._half
+        mask = self._half_mask
+        left = index >> half
+        right = index & mask
+        for key in self._keys:
+            left, right = right, left ^ (_mix(right, key) & mask)
+        return left << half | right
+
+    def next_index(self):
+        """Next index of the permutation; starts a new one when exhausted"""
+        if self.position >= self.size:
+            self.epoch += 1
+            self.position = 0
+            self._keys = self._round_keys()
+        index = self._permute(self.position)
+        # Cycle-walk until the index falls inside range(size)
+        while index >= self.size:
+            index = self._permute(index)
+        self.position += 1
+        return index
+
+    def get_state(self):
+        """Cursor state as (size, epoch, position)"""
+        return self.size, self.epoch, self.position
+
+
+class WordSelection:
+    """Seed and per-bucket cursors of a dictionary's non-repeating draws"""
+
+    def __init__(self, seed=None):
+        self.seed = None
+        # (level, length, word count) -> ShuffleCursor
+        self._cursors = {}
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        """
+        Restart every bucket's order from a seed
+        Args:
+            seed: integer seed; None picks a fresh random seed
+        """
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self._cursors = {}
+
+    def draw(self, key, bucket):
+        """Next entry of a bucket; key names the bucket, e.g. its level"""
+        cursor = self._cursors.get(key)
+        if cursor is None or cursor.size != len(bucket):
+            # New bucket, or entries were added: start a fresh shuffle
+            epoch = cursor.epoch + 1 if cursor is not None else 0
+            cursor = self._cursors[key] = ShuffleCursor(len(bucket),
+                                                        self.seed, epoch)
+        return bucket[cursor.next_index()]
+
+    def get_state(self):
+        """Seed and cursor positions, as plain data"""
+        return {
+            "seed": self.seed,
+            "cursors": [[*key, *cursor.get_state()]
+                        for key, cursor in self._cursors.items()],
+        }
+
+    def set_state(self, state):
+        """Continue from a state saved by get_state"""
+        self.seed = state["seed"]
+        self._cursors = {}
+        for *key, size, epoch, position in state["cursors"]:
+            self._cursors[tuple(key)] = ShuffleCursor(size, self.seed,
+                                                      epoch, position)